@@ -97,13 +97,13 @@ class UncertainSampleResponse(BaseModel):
 
 
 @router.post("/sessions", response_model=TrainingSessionResponse)
-async def create_training_session(
+def create_training_session(
     request: CreateTrainingSessionRequest,
     db: Session = Depends(get_db)
 ):
     """Create a new active learning training session"""
     try:
-        session = await pipeline.create_training_session(
+        session = pipeline.create_training_session(
             db=db,
             name=request.name,
             dataset_id=request.dataset_id,
@@ -120,14 +120,14 @@ async def create_training_session(
 
 
 @router.get("/sessions", response_model=List[TrainingSessionResponse])
-async def get_training_sessions(db: Session = Depends(get_db)):
+def get_training_sessions(db: Session = Depends(get_db)):
     """Get all training sessions"""
     sessions = db.query(TrainingSession).order_by(TrainingSession.created_at.desc()).all()
     return sessions
 
 
 @router.get("/sessions/{session_id}", response_model=TrainingSessionResponse)
-async def get_training_session(session_id: int, db: Session = Depends(get_db)):
+def get_training_session(session_id: int, db: Session = Depends(get_db)):
     """Get specific training session"""
     session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
     if not session:
@@ -136,7 +136,7 @@ async def get_training_session(session_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/sessions/{session_id}/iterations", response_model=TrainingIterationResponse)
-async def start_training_iteration(
+def start_training_iteration(
     session_id: int,
     request: StartIterationRequest,
     background_tasks: BackgroundTasks,
@@ -144,18 +144,22 @@ async def start_training_iteration(
 ):
     """Start a new training iteration"""
     try:
-        iteration = await pipeline.start_training_iteration(
+        iteration = pipeline.start_training_iteration(
             db=db,
             session_id=session_id,
             newly_labeled_images=request.newly_labeled_images
         )
+        # Training runs after the response, with its own database session
+        background_tasks.add_task(
+            pipeline.train_iteration, session_id, iteration.id, request.newly_labeled_images
+        )
         return iteration
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/sessions/{session_id}/iterations", response_model=List[TrainingIterationResponse])
-async def get_training_iterations(session_id: int, db: Session = Depends(get_db)):
+def get_training_iterations(session_id: int, db: Session = Depends(get_db)):
     """Get all iterations for a training session"""
     iterations = db.query(TrainingIteration).filter(
         TrainingIteration.session_id == session_id
@@ -164,24 +168,24 @@ async def get_training_iterations(session_id: int, db: Session = Depends(get_db)
 
 
 @router.get("/sessions/{session_id}/progress")
-async def get_training_progress(session_id: int, db: Session = Depends(get_db)):
+def get_training_progress(session_id: int, db: Session = Depends(get_db)):
     """Get detailed training progress and metrics"""
     try:
-        progress = await pipeline.get_training_progress(db, session_id)
+        progress = pipeline.get_training_progress(db, session_id)
         return progress
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/sessions/{session_id}/uncertain-samples", response_model=List[UncertainSampleResponse])
-async def get_uncertain_samples(
+def get_uncertain_samples(
     session_id: int,
     iteration_number: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """Get uncertain samples for review"""
     try:
-        samples = await pipeline.get_uncertain_samples(
+        samples = pipeline.get_uncertain_samples(
             db=db,
             session_id=session_id,
             iteration_number=iteration_number
@@ -192,14 +196,14 @@ async def get_uncertain_samples(
 
 
 @router.put("/uncertain-samples/{sample_id}/review")
-async def review_uncertain_sample(
+def review_uncertain_sample(
     sample_id: int,
     request: ReviewSampleRequest,
     db: Session = Depends(get_db)
 ):
     """Review and update uncertain sample"""
     try:
-        await pipeline.review_uncertain_sample(
+        pipeline.review_uncertain_sample(
             db=db,
             sample_id=sample_id,
             accepted=request.accepted,
@@ -211,7 +215,7 @@ async def review_uncertain_sample(
 
 
 @router.delete("/sessions/{session_id}")
-async def delete_training_session(session_id: int, db: Session = Depends(get_db)):
+def delete_training_session(session_id: int, db: Session = Depends(get_db)):
     """Delete a training session and all related data"""
     session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
     if not session:
@@ -232,7 +236,7 @@ async def delete_training_session(session_id: int, db: Session = Depends(get_db)
 
 
 @router.get("/sessions/{session_id}/export-model")
-async def export_trained_model(session_id: int, iteration_number: Optional[int] = None, db: Session = Depends(get_db)):
+def export_trained_model(session_id: int, iteration_number: Optional[int] = None, db: Session = Depends(get_db)):
     """Export trained model for use in auto-labeling"""
     try:
         session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
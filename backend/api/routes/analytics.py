@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
 
 @router.get("/dataset/{dataset_id}/class-distribution")
-async def get_class_distribution(
+def get_class_distribution(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
@@ -59,7 +59,7 @@ async def get_class_distribution(
 
 
 @router.get("/dataset/{dataset_id}/split-analysis")
-async def get_split_analysis(
+def get_split_analysis(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
@@ -108,17 +108,17 @@ async def get_split_analysis(
 
 
 @router.get("/dataset/{dataset_id}/imbalance-report")
-async def get_imbalance_report(
+def get_imbalance_report(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
     """Get comprehensive imbalance report with recommendations"""
     try:
         # Get class distribution
-        class_analysis = await get_class_distribution(dataset_id, db)
+        class_analysis = get_class_distribution(dataset_id, db)
         
         # Get split analysis
-        split_analysis = await get_split_analysis(dataset_id, db)
+        split_analysis = get_split_analysis(dataset_id, db)
         
         # Generate comprehensive recommendations
         recommendations = []
@@ -190,7 +190,7 @@ async def get_imbalance_report(
 
 
 @router.get("/dataset/{dataset_id}/labeling-progress")
-async def get_labeling_progress(
+def get_labeling_progress(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
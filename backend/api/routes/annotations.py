@@ -3,11 +3,11 @@ API routes for annotation management
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 from pydantic import BaseModel
 
-from database.database import get_db
+from database.database import get_async_db
 from database import operations as crud
 from database.models import Annotation
 
@@ -55,10 +55,10 @@ class AnnotationData(BaseModel):
     annotations: List[Dict[str, Any]]
 
 @router.get("/{image_id}/annotations")
-async def get_image_annotations(image_id: str, db: Session = Depends(get_db)):
+async def get_image_annotations(image_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get all annotations for a specific image"""
     try:
-        annotations = crud.AnnotationOperations.get_annotations_by_image(db, image_id)
+        annotations = await db.run_sync(crud.AnnotationOperations.get_annotations_by_image, image_id)
         
         # Convert to frontend format (x, y, width, height)
         annotation_list = []
@@ -80,51 +80,36 @@ async def get_image_annotations(image_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error retrieving annotations: {str(e)}")
 
 @router.post("/{image_id}/annotations")
-async def save_image_annotations(image_id: str, data: AnnotationData, db: Session = Depends(get_db)):
+async def save_image_annotations(image_id: str, data: AnnotationData, db: AsyncSession = Depends(get_async_db)):
     """Save annotations for a specific image"""
     try:
         annotations = data.annotations
         
-        # First, delete existing annotations for this image
-        crud.AnnotationOperations.delete_annotations_by_image(db, image_id)
-        
-        # Create new annotations
-        saved_annotations = []
+        # Convert from x, y, width, height to x_min, y_min, x_max, y_max
+        new_annotations = []
         for ann in annotations:
-            # Convert from x, y, width, height to x_min, y_min, x_max, y_max
             x = float(ann.get("x", 0))
             y = float(ann.get("y", 0))
             width = float(ann.get("width", 0))
             height = float(ann.get("height", 0))
             
-            x_min = x
-            y_min = y
-            x_max = x + width
-            y_max = y + height
-            
-            # Create annotation in database
-            new_annotation = crud.AnnotationOperations.create_annotation(
-                db=db,
-                image_id=image_id,
-                class_name=ann.get("class_name", "unknown"),
-                class_id=ann.get("class_id", 0),
-                x_min=x_min,
-                y_min=y_min,
-                x_max=x_max,
-                y_max=y_max,
-                confidence=float(ann.get("confidence", 1.0)),
-                segmentation=ann.get("segmentation")
-            )
-            
-            if new_annotation:
-                saved_annotations.append(new_annotation)
+            new_annotations.append({
+                "class_name": ann.get("class_name", "unknown"),
+                "class_id": ann.get("class_id", 0),
+                "x_min": x,
+                "y_min": y,
+                "x_max": x + width,
+                "y_max": y + height,
+                "confidence": float(ann.get("confidence", 1.0)),
+                "segmentation": ann.get("segmentation")
+            })
         
-        # Update image status to labeled if annotations exist
-        if saved_annotations:
-            crud.ImageOperations.update_image_status(db, image_id, is_labeled=True)
-        else:
-            # If no annotations, mark as unlabeled
-            crud.ImageOperations.update_image_status(db, image_id, is_labeled=False)
+        # Replace existing annotations and update image status in one transaction
+        saved_annotations = await db.run_sync(
+            crud.AnnotationOperations.bulk_create_annotations,
+            {image_id: new_annotations},
+            replace_existing=True
+        )
         
         return {
             "message": "Annotations saved successfully",
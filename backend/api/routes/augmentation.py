@@ -87,7 +87,7 @@ async def get_default_augmentation_config():
 
 
 @router.post("/create")
-async def create_augmentation_job(
+def create_augmentation_job(
     request: AugmentationConfigRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -131,7 +131,7 @@ async def create_augmentation_job(
 
 
 @router.get("/jobs/{dataset_id}")
-async def get_augmentation_jobs(
+def get_augmentation_jobs(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
@@ -167,7 +167,7 @@ async def get_augmentation_jobs(
 
 
 @router.get("/job/{job_id}/status")
-async def get_augmentation_job_status(
+def get_augmentation_job_status(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -195,7 +195,7 @@ async def get_augmentation_job_status(
 
 
 @router.delete("/job/{job_id}")
-async def delete_augmentation_job(
+def delete_augmentation_job(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -218,7 +218,7 @@ async def delete_augmentation_job(
 
 
 @router.post("/preview")
-async def preview_augmentation(
+def preview_augmentation(
     request: AugmentationConfigRequest,
     db: Session = Depends(get_db)
 ):
@@ -49,7 +49,7 @@ class ImageFilterRequest(BaseModel):
 
 
 @router.post("/split")
-async def create_dataset_split(
+def create_dataset_split(
     request: SplitConfigRequest,
     db: Session = Depends(get_db)
 ):
@@ -133,7 +133,7 @@ async def create_dataset_split(
 
 
 @router.get("/split/{dataset_id}")
-async def get_dataset_split(
+def get_dataset_split(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
@@ -148,13 +148,7 @@ async def get_dataset_split(
         split_config = crud.get_dataset_split_by_dataset(db, dataset_id)
         
         # Get current image counts by split
-        images = crud.get_images_by_dataset(db, dataset_id)
-        split_counts = {
-            "train": len([img for img in images if img.split_type == "train"]),
-            "val": len([img for img in images if img.split_type == "val"]),
-            "test": len([img for img in images if img.split_type == "test"]),
-            "unassigned": len([img for img in images if img.split_type == "unassigned"])
-        }
+        split_counts = crud.count_images_by_split(db, dataset_id)
         
         # Calculate actual percentages
         total_images = sum(split_counts.values())
@@ -190,7 +184,7 @@ async def get_dataset_split(
 
 
 @router.post("/assign-images")
-async def assign_images_to_split(
+def assign_images_to_split(
     request: BulkImageAssignment,
     db: Session = Depends(get_db)
 ):
@@ -219,7 +213,7 @@ async def assign_images_to_split(
 
 
 @router.post("/filter-images")
-async def filter_images(
+def filter_images(
     request: ImageFilterRequest,
     db: Session = Depends(get_db)
 ):
@@ -311,7 +305,7 @@ async def filter_images(
 
 
 @router.post("/move-images")
-async def move_images_to_reserved(
+def move_images_to_reserved(
     image_ids: List[str],
     target_location: str = "reserved",
     db: Session = Depends(get_db)
@@ -340,7 +334,7 @@ async def move_images_to_reserved(
 
 
 @router.get("/image-details/{image_id}")
-async def get_image_details(
+def get_image_details(
     image_id: str,
     db: Session = Depends(get_db)
 ):
@@ -405,7 +399,7 @@ async def get_image_details(
 
 
 @router.get("/dataset-summary/{dataset_id}")
-async def get_dataset_summary(
+def get_dataset_summary(
     dataset_id: str,
     db: Session = Depends(get_db)
 ):
@@ -5,16 +5,19 @@ Handle image datasets, uploads, and auto-labeling
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Form, BackgroundTasks
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
-from database.database import get_db
+from database.database import get_db, get_async_db
 from database.operations import (
     DatasetOperations, ProjectOperations, ImageOperations, 
     AutoLabelJobOperations
 )
+from core.config import settings
 from core.file_handler import file_handler
 from core.auto_labeler import auto_labeler
+from core.job_progress import job_progress, PROCESS_ID
 from models.model_manager import model_manager
 
 router = APIRouter()
@@ -43,10 +46,14 @@ class AutoLabelRequest(BaseModel):
     confidence_threshold: float = 0.5
     iou_threshold: float = 0.45
     overwrite_existing: bool = False
+    batch_size: Optional[int] = None  # Uses settings.AUTO_LABEL_BATCH_SIZE if None
+    num_workers: Optional[int] = None  # Uses settings.AUTO_LABEL_WORKERS if None
+    tile_size: Optional[int] = None  # Tiled inference for high-resolution images when set
+    tile_overlap: Optional[float] = None  # Uses settings.AUTO_LABEL_TILE_OVERLAP if None
 
 
 @router.get("/", response_model=List[Dict[str, Any]])
-async def get_datasets(
+def get_datasets(
     project_id: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
@@ -91,7 +98,7 @@ async def get_datasets(
 
 
 @router.post("/", response_model=Dict[str, Any])
-async def create_dataset(
+def create_dataset(
     request: DatasetCreateRequest,
     db: Session = Depends(get_db)
 ):
@@ -145,49 +152,12 @@ async def upload_dataset(
     project_id: Optional[str] = Form(None),
     files: List[UploadFile] = File(...),
     auto_label: bool = Form(True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new dataset and upload files to it"""
     try:
-        # If no project_id provided, create a new project with next number
-        if not project_id:
-            # Get existing projects to determine next project number
-            existing_projects = ProjectOperations.get_projects(db)
-            
-            # Find the highest project number
-            max_project_num = 0
-            for project in existing_projects:
-                if project.name.startswith("Project "):
-                    try:
-                        num = int(project.name.split("Project ")[1])
-                        max_project_num = max(max_project_num, num)
-                    except (ValueError, IndexError):
-                        continue
-            
-            # Create new project with next number
-            next_project_num = max_project_num + 1
-            new_project = ProjectOperations.create_project(
-                db=db,
-                name=f"Project {next_project_num}",
-                description=f"Auto-created project {next_project_num}"
-            )
-            project_id = new_project.id
-            project_name = new_project.name
-        else:
-            # Verify project exists
-            project = ProjectOperations.get_project(db, project_id)
-            if not project:
-                raise HTTPException(status_code=404, detail="Project not found")
-            project_name = project.name
-        
-        # Create dataset
-        dataset = DatasetOperations.create_dataset(
-            db=db,
-            name=name,
-            project_id=project_id,
-            description=description,
-            auto_label_enabled=auto_label,
-            model_id=None  # Will be set during auto-labeling if enabled
+        dataset, project_name = await db.run_sync(
+            _create_upload_dataset, name, description, project_id, auto_label
         )
         
         # Upload files to the dataset
@@ -212,17 +182,69 @@ async def upload_dataset(
         raise HTTPException(status_code=500, detail=f"Failed to upload dataset: {str(e)}")
 
 
+def _create_upload_dataset(
+    db: Session,
+    name: str,
+    description: str,
+    project_id: Optional[str],
+    auto_label: bool
+):
+    """Dataset for an upload, in the given project or a new numbered one; returns (dataset, project name)"""
+    # If no project_id provided, create a new project with next number
+    if not project_id:
+        # Get existing projects to determine next project number
+        existing_projects = ProjectOperations.get_projects(db)
+        
+        # Find the highest project number
+        max_project_num = 0
+        for project in existing_projects:
+            if project.name.startswith("Project "):
+                try:
+                    num = int(project.name.split("Project ")[1])
+                    max_project_num = max(max_project_num, num)
+                except (ValueError, IndexError):
+                    continue
+        
+        # Create new project with next number
+        next_project_num = max_project_num + 1
+        new_project = ProjectOperations.create_project(
+            db=db,
+            name=f"Project {next_project_num}",
+            description=f"Auto-created project {next_project_num}"
+        )
+        project_id = new_project.id
+        project_name = new_project.name
+    else:
+        # Verify project exists
+        project = ProjectOperations.get_project(db, project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        project_name = project.name
+    
+    # Create dataset
+    dataset = DatasetOperations.create_dataset(
+        db=db,
+        name=name,
+        project_id=project_id,
+        description=description,
+        auto_label_enabled=auto_label,
+        model_id=None  # Will be set during auto-labeling if enabled
+    )
+    
+    return dataset, project_name
+
+
 @router.get("/{dataset_id}", response_model=Dict[str, Any])
-async def get_dataset(dataset_id: str, db: Session = Depends(get_db)):
+async def get_dataset(dataset_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a specific dataset with detailed information"""
     try:
-        dataset = DatasetOperations.get_dataset(db, dataset_id)
+        dataset = await db.run_sync(DatasetOperations.get_dataset, dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
         
         # Get recent images
-        recent_images = ImageOperations.get_images_by_dataset(
-            db, dataset_id, skip=0, limit=10
+        recent_images = await db.run_sync(
+            ImageOperations.get_images_by_dataset, dataset_id, skip=0, limit=10
         )
         
         image_list = []
@@ -267,12 +289,12 @@ async def upload_images(
     dataset_id: str,
     files: List[UploadFile] = File(...),
     auto_label: bool = Form(True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload images to a dataset"""
     try:
         # Verify dataset exists
-        dataset = DatasetOperations.get_dataset(db, dataset_id)
+        dataset = await db.run_sync(DatasetOperations.get_dataset, dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
         
@@ -290,7 +312,7 @@ async def upload_images(
 
 
 @router.post("/{dataset_id}/auto-label")
-async def start_auto_labeling(
+def start_auto_labeling(
     dataset_id: str,
     request: AutoLabelRequest,
     background_tasks: BackgroundTasks,
@@ -315,7 +337,9 @@ async def start_auto_labeling(
             model_id=request.model_id,
             confidence_threshold=request.confidence_threshold,
             iou_threshold=request.iou_threshold,
-            overwrite_existing=request.overwrite_existing
+            overwrite_existing=request.overwrite_existing,
+            tile_size=request.tile_size,
+            tile_overlap=request.tile_overlap if request.tile_overlap is not None else settings.AUTO_LABEL_TILE_OVERLAP
         )
         
         # Start auto-labeling in background
@@ -326,7 +350,11 @@ async def start_auto_labeling(
             confidence_threshold=request.confidence_threshold,
             iou_threshold=request.iou_threshold,
             overwrite_existing=request.overwrite_existing,
-            job_id=job.id
+            job_id=job.id,
+            batch_size=request.batch_size,
+            num_workers=request.num_workers,
+            tile_size=request.tile_size,
+            tile_overlap=job.tile_overlap
         )
         
         return {
@@ -349,18 +377,19 @@ async def get_dataset_images(
     skip: int = 0,
     limit: int = 50,
     labeled_only: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get images in a dataset"""
     try:
         # Verify dataset exists
-        dataset = DatasetOperations.get_dataset(db, dataset_id)
+        dataset = await db.run_sync(DatasetOperations.get_dataset, dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
         
         # Get images
-        images = ImageOperations.get_images_by_dataset(
-            db, dataset_id, skip=skip, limit=limit, labeled_only=labeled_only
+        images = await db.run_sync(
+            ImageOperations.get_images_by_dataset,
+            dataset_id, skip=skip, limit=limit, labeled_only=labeled_only
         )
         
         image_list = []
@@ -376,7 +405,7 @@ async def get_dataset_images(
                 "is_auto_labeled": image.is_auto_labeled,
                 "is_verified": image.is_verified,
                 "created_at": image.created_at,
-                "url": file_handler.get_image_url(image.id)
+                "url": file_handler.image_url(image.file_path)
             }
             image_list.append(image_data)
         
@@ -394,16 +423,83 @@ async def get_dataset_images(
         raise HTTPException(status_code=500, detail=f"Failed to get dataset images: {str(e)}")
 
 
+@router.get("/auto-label/jobs/{job_id}")
+async def get_auto_label_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get auto-labeling job status, using live in-memory counters while it runs"""
+    try:
+        live = job_progress.get(job_id)
+        if live:
+            return {**live, "live": True}
+        
+        job = await db.run_sync(AutoLabelJobOperations.get_job, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        return {
+            "job_id": job.id,
+            "dataset_id": job.dataset_id,
+            "model_id": job.model_id,
+            "status": job.status,
+            "progress": job.progress,
+            "total_images": job.total_images,
+            "processed_images": job.processed_images,
+            "successful_images": job.successful_images,
+            "failed_images": job.failed_images,
+            "total_annotations_created": job.total_annotations_created,
+            "error_message": job.error_message,
+            "started_at": job.started_at,
+            "completed_at": job.completed_at,
+            "live": False
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get auto-label job: {str(e)}")
+
+
+@router.post("/auto-label/jobs/{job_id}/resume")
+async def resume_auto_label_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Resume an interrupted or failed auto-labeling job from its checkpoint"""
+    try:
+        job = await db.run_sync(AutoLabelJobOperations.get_job, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job.status == "completed":
+            raise HTTPException(status_code=400, detail="Job is already completed")
+        if job_progress.get(job_id):
+            raise HTTPException(status_code=409, detail="Job is already running")
+        
+        # Only jobs without a live owner can be taken over
+        claimed = await db.run_sync(lambda session: AutoLabelJobOperations.claim_job_for_resume(
+            session, job_id, PROCESS_ID, dead_owner_ids=auto_labeler.dead_owner_ids(session)
+        ))
+        if not claimed:
+            raise HTTPException(status_code=409, detail="Job is running in another process")
+        
+        background_tasks.add_task(auto_labeler.resume_job, job_id)
+        return {"job_id": job_id, "message": "Auto-labeling job resumed", "status": "queued"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to resume auto-label job: {str(e)}")
+
+
 # Add individual image endpoint for the annotation interface
 @router.get("/images/{image_id}")
 async def get_image_by_id(
     image_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get individual image information by ID"""
     try:
         # Get image
-        image = ImageOperations.get_image(db, image_id)
+        image = await db.run_sync(ImageOperations.get_image, image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Image not found")
         
@@ -419,7 +515,7 @@ async def get_image_by_id(
             "is_auto_labeled": image.is_auto_labeled,
             "is_verified": image.is_verified,
             "created_at": image.created_at,
-            "file_path": file_handler.get_image_url(image.id),
+            "file_path": file_handler.image_url(image.file_path),
             "dataset_id": image.dataset_id
         }
         
@@ -430,7 +526,7 @@ async def get_image_by_id(
 
 
 @router.put("/{dataset_id}", response_model=Dict[str, Any])
-async def update_dataset(
+def update_dataset(
     dataset_id: str,
     request: DatasetUpdateRequest,
     db: Session = Depends(get_db)
@@ -501,7 +597,7 @@ async def update_dataset(
 
 
 @router.delete("/{dataset_id}")
-async def delete_dataset(dataset_id: str, db: Session = Depends(get_db)):
+def delete_dataset(dataset_id: str, db: Session = Depends(get_db)):
     """Delete a dataset and all its images"""
     try:
         # Check if dataset exists
@@ -540,12 +636,12 @@ async def upload_dataset(
     auto_label_enabled: bool = Form(True),
     model_id: Optional[str] = Form(None),
     files: List[UploadFile] = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new dataset and upload images to it"""
     try:
         # Verify project exists
-        project = ProjectOperations.get_project(db, project_id)
+        project = await db.run_sync(ProjectOperations.get_project, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
@@ -558,7 +654,7 @@ async def upload_dataset(
             model_id=model_id
         )
         
-        dataset = DatasetOperations.create_dataset(db, dataset_data.dict())
+        dataset = await db.run_sync(DatasetOperations.create_dataset, **dataset_data.dict())
         
         # Upload images to the new dataset
         upload_results = await file_handler.upload_images_to_dataset(
@@ -4,16 +4,28 @@ Easy import and management of custom YOLO models
 """
 
 import os
+import asyncio
 import tempfile
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.model_manager import model_manager, ModelType, ModelFormat
+from models.warmup import model_warmer
+from models.model_export import model_exporter
+from models.prediction_cache import prediction_cache
+from models.inference_scheduler import inference_scheduler
+from models.postprocess import MASK_FORMATS
+from models.benchmark import model_benchmarker, benchmark_to_dict, compare_runs
+from database.database import get_db, get_async_db
+from database.operations import ImageOperations, ModelBenchmarkOperations
 from core.config import settings
+from core.image_prefetcher import decode_image_bytes
 
 
 router = APIRouter()
@@ -29,6 +41,31 @@ class ModelImportRequest(BaseModel):
     iou_threshold: float = 0.45
 
 
+class WarmupRequest(BaseModel):
+    """Request model for warming up models"""
+    model_ids: Optional[List[str]] = None  # Uses settings.MODEL_WARMUP_IDS if None
+
+
+class ModelExportRequest(BaseModel):
+    """Request model for exporting/quantizing a registered model"""
+    variants: Optional[List[str]] = None  # onnx-fp32, onnx-int8 (all if None)
+    project_id: Optional[str] = None  # Images used for latency and parity checks
+    dataset_id: Optional[str] = None
+    sample_size: int = 50
+
+
+class ModelBenchmarkRequest(BaseModel):
+    """Request model for running an inference benchmark"""
+    model_ids: Optional[List[str]] = None  # All registered models if None
+    batch_sizes: Optional[List[int]] = None  # Uses settings.BENCHMARK_BATCH_SIZES if None
+    thread_counts: Optional[List[int]] = None  # Uses settings.BENCHMARK_THREAD_COUNTS if None
+    iterations: Optional[int] = None
+    seed: Optional[int] = None
+    project_id: Optional[str] = None  # Sample images added to the synthetic set
+    dataset_id: Optional[str] = None
+    sample_size: Optional[int] = None
+
+
 class ModelUpdateRequest(BaseModel):
     """Request model for updating model settings"""
     confidence_threshold: Optional[float] = None
@@ -41,6 +78,9 @@ class PredictionRequest(BaseModel):
     model_id: str
     confidence: Optional[float] = None
     iou_threshold: Optional[float] = None
+    tile_size: Optional[int] = None  # Tiled inference for high-resolution images when set
+    tile_overlap: Optional[float] = None
+    mask_format: str = "polygon"  # Segmentation masks as none, polygon, rle or bitmask
 
 
 @router.get("/", response_model=List[Dict[str, Any]])
@@ -196,33 +236,263 @@ async def predict_with_model(
                 detail=f"Unsupported image format. Supported formats: {settings.SUPPORTED_IMAGE_FORMATS}"
             )
         
-        # Save uploaded image to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Run prediction
-            results = model_manager.predict(
-                model_id=request.model_id,
-                image=tmp_file_path,
-                confidence=request.confidence,
-                iou_threshold=request.iou_threshold
+        if request.model_id not in model_manager.models_info:
+            raise HTTPException(status_code=404, detail="Model not found")
+        if request.mask_format not in MASK_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported mask format. Supported formats: {list(MASK_FORMATS)}"
             )
-            
-            return results
-            
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
-            
+        
+        # Decode straight from the request bytes (no temp file, no second read from disk),
+        # on a thread so large images do not stall the event loop
+        content = await file.read()
+        image = await asyncio.to_thread(decode_image_bytes, content)
+        if image is None:
+            raise HTTPException(status_code=400, detail="Could not decode image")
+        
+        # Run prediction in a micro-batch with concurrent requests (off the event loop)
+        results = await inference_scheduler.predict(
+            model_id=request.model_id,
+            image=image,
+            confidence=request.confidence,
+            iou_threshold=request.iou_threshold,
+            tile_size=request.tile_size,
+            tile_overlap=request.tile_overlap,
+            mask_format=request.mask_format
+        )
+        
+        return results
+        
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@router.get("/pool/stats")
+async def get_model_pool_stats():
+    """Loaded models, memory use and hit/miss statistics of the shared model pool"""
+    return model_manager.model_pool.stats()
+
+
+@router.get("/scheduler/stats")
+async def get_inference_scheduler_stats():
+    """Request and micro-batch statistics of the interactive prediction scheduler"""
+    return inference_scheduler.stats()
+
+
+@router.get("/cache/stats")
+async def get_prediction_cache_stats():
+    """Size and hit/miss statistics of the prediction cache"""
+    return prediction_cache.stats()
+
+
+@router.delete("/{model_id}/cache")
+async def clear_model_prediction_cache(model_id: str):
+    """Drop every cached prediction of a model"""
+    if model_id not in model_manager.models_info:
+        raise HTTPException(status_code=404, detail="Model not found")
+    prediction_cache.invalidate_model(model_id)
+    return {"success": True, "message": "Prediction cache cleared"}
+
+
+@router.post("/warmup")
+async def warmup_models(request: WarmupRequest, background_tasks: BackgroundTasks):
+    """Load and warm models in the background; poll /readiness for progress"""
+    model_ids = request.model_ids if request.model_ids is not None else settings.MODEL_WARMUP_IDS
+    unknown = [model_id for model_id in model_ids if model_id not in model_manager.models_info]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Models not found: {', '.join(unknown)}")
+    
+    background_tasks.add_task(model_warmer.warm_models, model_ids)
+    return {"message": "Warm-up started", "model_ids": model_ids}
+
+
+@router.get("/readiness")
+async def get_models_readiness():
+    """Readiness of every model; "ready" is true once all startup warm-up models are warm"""
+    return model_warmer.readiness_report()
+
+
+@router.post("/benchmarks")
+def run_benchmark(
+    request: ModelBenchmarkRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Benchmark models at several batch sizes and thread counts in the background
+    Records p50/p95/p99 latency, throughput, peak RSS and load time per
+    configuration; poll /benchmarks/{run_id} for the status and results.
+    """
+    try:
+        run_id = model_benchmarker.create_run(request.model_ids)
+
+        sample_images = []
+        if request.project_id or request.dataset_id:
+            sample_images = ImageOperations.sample_image_paths(
+                db,
+                project_id=request.project_id,
+                dataset_id=request.dataset_id,
+                limit=request.sample_size or settings.BENCHMARK_SAMPLE_IMAGES
+            )
+        sample_images = [path for path in sample_images if os.path.exists(path)]
+        
+        # Each configuration runs in its own process; the run is awaited in a worker thread
+        background_tasks.add_task(
+            model_benchmarker.run,
+            model_ids=request.model_ids,
+            batch_sizes=request.batch_sizes,
+            thread_counts=request.thread_counts,
+            iterations=request.iterations,
+            seed=request.seed,
+            sample_images=sample_images,
+            run_id=run_id
+        )
+        return {"run_id": run_id, "message": "Benchmark started", "status": "queued"}
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start benchmark: {str(e)}")
+
+
+@router.get("/benchmarks/runs")
+def get_benchmark_runs(limit: int = 50, db: Session = Depends(get_db)):
+    """Most recent benchmark runs"""
+    return ModelBenchmarkOperations.get_benchmark_runs(db, limit=limit)
+
+
+@router.get("/benchmarks/compare")
+def compare_benchmark_runs(
+    baseline_run_id: str,
+    run_id: str,
+    threshold: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """Per-configuration diff of two benchmark runs, flagging regressions"""
+    baseline = ModelBenchmarkOperations.get_benchmark_run(db, baseline_run_id)
+    candidate = ModelBenchmarkOperations.get_benchmark_run(db, run_id)
+    if not baseline or not candidate:
+        raise HTTPException(status_code=404, detail="Benchmark run not found")
+    
+    diffs = compare_runs(
+        [benchmark_to_dict(row) for row in baseline],
+        [benchmark_to_dict(row) for row in candidate],
+        threshold
+    )
+    return {
+        "baseline_run_id": baseline_run_id,
+        "run_id": run_id,
+        "regressions": sum(1 for diff in diffs if diff["regression"]),
+        "configurations": diffs
+    }
+
+
+@router.get("/benchmarks/{run_id}")
+def get_benchmark_run(run_id: str, db: Session = Depends(get_db)):
+    """Status and results so far of one benchmark run"""
+    status = model_benchmarker.run_status(run_id)
+    rows = ModelBenchmarkOperations.get_benchmark_run(db, run_id)
+    if status is None:
+        if not rows:
+            raise HTTPException(status_code=404, detail="Benchmark run not found")
+        # Run recorded by the CLI or before a restart: only its rows are known
+        status = {"run_id": run_id, "status": "completed", "errors": {}, "error": None}
+    return {**status, "results": [benchmark_to_dict(row) for row in rows]}
+
+
+@router.get("/{model_id}/benchmarks")
+def get_model_benchmarks(model_id: str, limit: int = 100, db: Session = Depends(get_db)):
+    """Most recent benchmark results of one model"""
+    return [
+        benchmark_to_dict(row)
+        for row in ModelBenchmarkOperations.get_benchmarks_by_model(db, model_id, limit=limit)
+    ]
+
+
+@router.get("/{model_id}/readiness")
+async def get_model_readiness(model_id: str):
+    """Readiness and warm-up latency of one model"""
+    if model_id not in model_manager.models_info:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return model_warmer.readiness(model_id)
+
+
+@router.post("/{model_id}/export")
+async def export_model(
+    model_id: str,
+    request: ModelExportRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Export a registered .pt model to ONNX FP32 / INT8 variants in the background
+    Each variant is registered with its latency and box mAP50 delta vs the
+    source; poll /{model_id}/export/{export_id} for the status and report.
+    """
+    try:
+        if model_id not in model_manager.models_info:
+            raise HTTPException(status_code=404, detail="Model not found")
+        export_id = model_exporter.create_export(model_id, request.variants)
+        
+        sample_images = []
+        if request.project_id or request.dataset_id:
+            sample_images = await db.run_sync(
+                ImageOperations.sample_image_paths,
+                project_id=request.project_id,
+                dataset_id=request.dataset_id,
+                limit=request.sample_size
+            )
+        sample_images = [path for path in sample_images if os.path.exists(path)]
+        
+        # Export, quantization and parity sampling take minutes; they run in a worker thread
+        background_tasks.add_task(
+            model_exporter.run_export,
+            export_id,
+            model_id,
+            request.variants,
+            sample_images
+        )
+        return {"export_id": export_id, "model_id": model_id, "message": "Export started", "status": "queued"}
+        
+    except HTTPException:
+        raise
+    except (ValueError, RuntimeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start model export: {str(e)}")
+
+
+@router.get("/{model_id}/export/{export_id}")
+async def get_model_export(model_id: str, export_id: str):
+    """Status of a model export; includes the variant report once completed"""
+    status = model_exporter.export_status(export_id)
+    if not status or status["model_id"] != model_id:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return status
+
+
+@router.get("/{model_id}/variants")
+async def get_model_variants(model_id: str):
+    """Exported/quantized variants derived from a model"""
+    if model_id not in model_manager.models_info:
+        raise HTTPException(status_code=404, detail="Model not found")
+    
+    return [
+        {
+            "id": info.id,
+            "name": info.name,
+            "variant": info.variant,
+            "format": info.format,
+            "latency_ms": info.latency_ms,
+            "map_delta": info.map_delta
+        }
+        for info in model_manager.get_variants(model_id)
+    ]
+
+
 @router.get("/{model_id}")
 async def get_model_info(model_id: str):
     """Get detailed information about a specific model"""
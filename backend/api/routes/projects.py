@@ -59,7 +59,7 @@ class ProjectResponse(BaseModel):
 
 
 @router.get("/", response_model=List[ProjectResponse])
-async def get_projects(
+def get_projects(
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db)
@@ -101,7 +101,7 @@ async def get_projects(
 
 
 @router.post("/", response_model=ProjectResponse)
-async def create_project(
+def create_project(
     request: ProjectCreateRequest, 
     db: Session = Depends(get_db)
 ):
@@ -146,7 +146,7 @@ async def create_project(
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: str, db: Session = Depends(get_db)):
+def get_project(project_id: str, db: Session = Depends(get_db)):
     """Get a specific project with detailed statistics"""
     try:
         project = ProjectOperations.get_project(db, project_id)
@@ -181,7 +181,7 @@ async def get_project(project_id: str, db: Session = Depends(get_db)):
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-async def update_project(
+def update_project(
     project_id: str, 
     request: ProjectUpdateRequest, 
     db: Session = Depends(get_db)
@@ -276,7 +276,7 @@ async def update_project(
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str, db: Session = Depends(get_db)):
+def delete_project(project_id: str, db: Session = Depends(get_db)):
     """Delete a project and all its datasets"""
     try:
         # Check if project exists
@@ -313,7 +313,7 @@ async def delete_project(project_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{project_id}/datasets")
-async def get_project_datasets(project_id: str, db: Session = Depends(get_db)):
+def get_project_datasets(project_id: str, db: Session = Depends(get_db)):
     """Get all datasets for a project"""
     try:
         # Check if project exists
@@ -353,7 +353,7 @@ async def get_project_datasets(project_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{project_id}/management")
-async def get_project_management_data(project_id: str, db: Session = Depends(get_db)):
+def get_project_management_data(project_id: str, db: Session = Depends(get_db)):
     """Get datasets organized by management status (Unassigned, Annotating, Dataset)"""
     try:
         # Check if project exists
@@ -414,7 +414,7 @@ async def get_project_management_data(project_id: str, db: Session = Depends(get
 
 
 @router.put("/{project_id}/datasets/{dataset_id}/assign")
-async def assign_dataset_to_annotating(project_id: str, dataset_id: str, db: Session = Depends(get_db)):
+def assign_dataset_to_annotating(project_id: str, dataset_id: str, db: Session = Depends(get_db)):
     """Assign a dataset to annotating status"""
     try:
         # Check if project exists
@@ -510,7 +510,7 @@ async def assign_dataset_to_annotating(project_id: str, dataset_id: str, db: Ses
 
 
 @router.put("/{project_id}/datasets/{dataset_id}/rename")
-async def rename_dataset(project_id: str, dataset_id: str, new_name: str = Body(..., embed=True), db: Session = Depends(get_db)):
+def rename_dataset(project_id: str, dataset_id: str, new_name: str = Body(..., embed=True), db: Session = Depends(get_db)):
     """Rename a dataset"""
     try:
         # Check if project exists
@@ -626,7 +626,7 @@ async def rename_dataset(project_id: str, dataset_id: str, new_name: str = Body(
 
 
 @router.delete("/{project_id}/datasets/{dataset_id}")
-async def delete_dataset(project_id: str, dataset_id: str, db: Session = Depends(get_db)):
+def delete_dataset(project_id: str, dataset_id: str, db: Session = Depends(get_db)):
     """Delete a dataset and all its images"""
     try:
         # Check if project exists
@@ -679,7 +679,7 @@ async def delete_dataset(project_id: str, dataset_id: str, db: Session = Depends
 
 
 @router.delete("/{project_id}/clear-data")
-async def clear_project_data(project_id: str, db: Session = Depends(get_db)):
+def clear_project_data(project_id: str, db: Session = Depends(get_db)):
     """Clear all data (datasets and images) from a project"""
     try:
         # Check if project exists
@@ -730,7 +730,7 @@ async def clear_project_data(project_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/{project_id}/duplicate", response_model=ProjectResponse)
-async def duplicate_project(project_id: str, db: Session = Depends(get_db)):
+def duplicate_project(project_id: str, db: Session = Depends(get_db)):
     """Duplicate a project with all its datasets, images, and annotations"""
     try:
         # Check if source project exists
@@ -864,7 +864,7 @@ class ProjectMergeRequest(BaseModel):
 
 
 @router.post("/{source_project_id}/merge", response_model=ProjectResponse)
-async def merge_projects(
+def merge_projects(
     source_project_id: str, 
     request: ProjectMergeRequest, 
     db: Session = Depends(get_db)
@@ -1014,7 +1014,7 @@ async def merge_projects(
 
 
 @router.get("/{project_id}/stats")
-async def get_project_stats(project_id: str, db: Session = Depends(get_db)):
+def get_project_stats(project_id: str, db: Session = Depends(get_db)):
     """Get detailed statistics for a project"""
     try:
         # Check if project exists
@@ -1067,7 +1067,7 @@ async def get_project_stats(project_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/{project_id}/upload")
-async def upload_images_to_project(
+def upload_images_to_project(
     project_id: str,
     file: UploadFile = File(...),
     batch_name: str = Form(None),
@@ -1109,8 +1109,8 @@ async def upload_images_to_project(
         safe_filename = re.sub(r'[^\w\-_\.]', '_', file.filename)
         file_path = os.path.join(dataset_upload_dir, safe_filename)
         
-        # Read and validate image
-        contents = await file.read()
+        # Read and validate image (handlers run in the threadpool, so the spooled upload is read directly)
+        contents = file.file.read()
         try:
             image = Image.open(io.BytesIO(contents))
             width, height = image.size
@@ -1152,9 +1152,6 @@ async def upload_images_to_project(
             format=image_format
         )
         
-        # Update dataset statistics
-        DatasetOperations.update_dataset_stats(db, target_dataset.id)
-        
         return {
             "success": True,
             "message": f"Successfully uploaded {file.filename}",
@@ -1185,7 +1182,7 @@ async def upload_images_to_project(
 
 
 @router.post("/{project_id}/upload-bulk")
-async def upload_multiple_images_to_project(
+def upload_multiple_images_to_project(
     project_id: str,
     files: List[UploadFile] = File(...),
     batch_name: str = Form(None),
@@ -1258,7 +1255,7 @@ async def upload_multiple_images_to_project(
                 file_path = os.path.join(dataset_upload_dir, safe_filename)
                 
                 # Read and validate image
-                contents = await file.read()
+                contents = file.file.read()
                 try:
                     image = Image.open(io.BytesIO(contents))
                     width, height = image.size
@@ -1301,9 +1298,6 @@ async def upload_multiple_images_to_project(
                 results['errors'].append(error_msg)
                 results['failed_uploads'] += 1
         
-        # Update dataset statistics
-        DatasetOperations.update_dataset_stats(db, target_dataset.id)
-        
         return {
             "success": True,
             "message": f"Successfully uploaded {results['successful_uploads']} of {results['total_files']} files",
@@ -1321,7 +1315,7 @@ async def upload_multiple_images_to_project(
 
 
 @router.get("/{project_id}/images")
-async def get_project_images(
+def get_project_images(
     project_id: str,
     limit: int = 50,
     offset: int = 0,
@@ -1376,7 +1370,7 @@ async def get_project_images(
 
 
 @router.put("/{project_id}/datasets/{dataset_id}/move-to-unassigned")
-async def move_dataset_to_unassigned(
+def move_dataset_to_unassigned(
     project_id: str,
     dataset_id: str,
     db: Session = Depends(get_db)
@@ -1467,7 +1461,7 @@ async def move_dataset_to_unassigned(
 
 
 @router.put("/{project_id}/datasets/{dataset_id}/move-to-completed")
-async def move_dataset_to_completed(
+def move_dataset_to_completed(
     project_id: str,
     dataset_id: str,
     db: Session = Depends(get_db)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark registered models and compare benchmark runs
+Each model runs over a fixed, seeded image set at several batch sizes and
+thread counts; results are stored in the model_benchmarks table.
+
+Usage:
+    python benchmark_models.py [model_id ...] [--batch-sizes 1 4 8] [--threads 1 4]
+                               [--iterations 20] [--seed 0] [--dataset-id ID]
+                               [--compare-to RUN_ID]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database import SessionLocal, init_db
+from database.operations import ImageOperations, ModelBenchmarkOperations
+from models.benchmark import model_benchmarker, benchmark_to_dict, compare_runs
+from core.config import settings
+
+def print_results(results):
+    """Print benchmark rows as a table"""
+    print(f"{'model':<28} {'source':<10} {'batch':>5} {'thr':>4} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'img/s':>8} {'rss MB':>8} {'load s':>7}")
+    for row in results:
+        rss = f"{row['peak_rss_mb']:.0f}" if row["peak_rss_mb"] is not None else "-"
+        print(f"{row['model_id']:<28} {row['source']:<10} {row['batch_size']:>5} {row['num_threads']:>4} "
+              f"{row['latency_p50']:>9.1f} {row['latency_p95']:>9.1f} {row['latency_p99']:>9.1f} "
+              f"{row['throughput']:>8.1f} {rss:>8} {row['load_time']:>7.2f}")
+
+def print_comparison(diffs):
+    """Print p95 latency and throughput changes per configuration"""
+    for diff in diffs:
+        p95 = diff["metrics"].get("latency_p95", {}).get("change")
+        throughput = diff["metrics"].get("throughput", {}).get("change")
+        flag = "REGRESSION" if diff["regression"] else "ok"
+        print(f"  {diff['model_id']} {diff['source']} batch={diff['batch_size']} threads={diff['num_threads']}: "
+              f"p95 {p95 or 0:+.1%}, throughput {throughput or 0:+.1%} [{flag}]")
+
+def benchmark_models(args):
+    """Run the benchmark; returns False on failures or regressions against --compare-to"""
+    asyncio.run(init_db())
+
+    sample_images = []
+    if args.project_id or args.dataset_id:
+        db = SessionLocal()
+        try:
+            sample_images = ImageOperations.sample_image_paths(
+                db, project_id=args.project_id, dataset_id=args.dataset_id, limit=args.sample_size
+            )
+        finally:
+            db.close()
+        sample_images = [path for path in sample_images if os.path.exists(path)]
+
+    report = model_benchmarker.run(
+        model_ids=args.model_ids or None,
+        batch_sizes=args.batch_sizes,
+        thread_counts=args.threads,
+        iterations=args.iterations,
+        seed=args.seed,
+        sample_images=sample_images
+    )
+    print(f"\nBenchmark run {report['run_id']}")
+    print_results(report["results"])
+    for model_id, error in report["errors"].items():
+        print(f"  {model_id}: FAILED ({error})")
+
+    success = not report["errors"]
+    if args.compare_to:
+        db = SessionLocal()
+        try:
+            baseline = [benchmark_to_dict(row) for row in ModelBenchmarkOperations.get_benchmark_run(db, args.compare_to)]
+        finally:
+            db.close()
+        if not baseline:
+            print(f"Baseline run not found: {args.compare_to}")
+            return False
+
+        diffs = compare_runs(baseline, report["results"])
+        print(f"\nCompared to run {args.compare_to}:")
+        print_comparison(diffs)
+        success = success and not any(diff["regression"] for diff in diffs)
+
+    return success
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark registered models")
+    parser.add_argument("model_ids", nargs="*", help="Models to benchmark (default: all registered models)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", help="Batch sizes (default: settings)")
+    parser.add_argument("--threads", type=int, nargs="+", help="Thread counts (default: settings)")
+    parser.add_argument("--iterations", type=int, help="Timed batches per configuration")
+    parser.add_argument("--seed", type=int, help="Seed of the synthetic image set")
+    parser.add_argument("--project-id", help="Add sample images of a project")
+    parser.add_argument("--dataset-id", help="Add sample images of a dataset")
+    parser.add_argument("--sample-size", type=int, default=settings.BENCHMARK_SAMPLE_IMAGES)
+    parser.add_argument("--compare-to", help="Baseline run id; exits non-zero on regressions")
+
+    print("Benchmarking models...")
+    if benchmark_models(parser.parse_args()):
+        print("Benchmark completed successfully!")
+    else:
+        print("Benchmark failed!")
+        sys.exit(1)
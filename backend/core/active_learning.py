@@ -5,14 +5,13 @@ import os
 import json
 import yaml
 import shutil
-import asyncio
 import numpy as np
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from ultralytics import YOLO
 from sqlalchemy.orm import Session
-from database.database import get_db
+from database.database import SessionLocal
 from models.training import TrainingSession, TrainingIteration, UncertainSample, ModelVersion
 from core.dataset_manager import DatasetManager
 import logging
@@ -28,7 +27,7 @@ class ActiveLearningPipeline:
         self.training_dir.mkdir(exist_ok=True)
         self.dataset_manager = DatasetManager()
         
-    async def create_training_session(
+    def create_training_session(
         self,
         db: Session,
         name: str,
@@ -64,13 +63,13 @@ class ActiveLearningPipeline:
         logger.info(f"Created training session {session.id}: {name}")
         return session
     
-    async def start_training_iteration(
+    def start_training_iteration(
         self,
         db: Session,
         session_id: int,
         newly_labeled_images: List[int] = None
     ) -> TrainingIteration:
-        """Start a new training iteration"""
+        """Create the next training iteration of a session; train_iteration() runs it"""
         
         session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
         if not session:
@@ -94,11 +93,18 @@ class ActiveLearningPipeline:
         session.started_at = datetime.utcnow()
         db.commit()
         
-        # Start training in background
-        asyncio.create_task(self._train_model(db, session, iteration, newly_labeled_images))
-        
         return iteration
     
+    async def train_iteration(self, session_id: int, iteration_id: int, newly_labeled_images: List[int] = None):
+        """Train an iteration created by start_training_iteration() (background task with its own session)"""
+        db = SessionLocal()
+        try:
+            session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
+            iteration = db.query(TrainingIteration).filter(TrainingIteration.id == iteration_id).first()
+            await self._train_model(db, session, iteration, newly_labeled_images)
+        finally:
+            db.close()
+    
     async def _train_model(
         self,
         db: Session,
@@ -342,7 +348,7 @@ class ActiveLearningPipeline:
         except Exception as e:
             logger.error(f"Failed to generate uncertain samples: {str(e)}")
     
-    async def get_uncertain_samples(
+    def get_uncertain_samples(
         self,
         db: Session,
         session_id: int,
@@ -359,7 +365,7 @@ class ActiveLearningPipeline:
         
         return query.order_by(UncertainSample.uncertainty_score.desc()).all()
     
-    async def review_uncertain_sample(
+    def review_uncertain_sample(
         self,
         db: Session,
         sample_id: int,
@@ -379,7 +385,7 @@ class ActiveLearningPipeline:
         
         db.commit()
     
-    async def get_training_progress(self, db: Session, session_id: int) -> Dict:
+    def get_training_progress(self, db: Session, session_id: int) -> Dict:
         """Get training progress and metrics"""
         
         session = db.query(TrainingSession).filter(TrainingSession.id == session_id).first()
@@ -0,0 +1,293 @@
+"""
+Multi-process auto-labeling worker pool
+Each worker process holds its own model instance and claims shards of a job's
+images from the auto_label_shards table. Predictions flow back to the parent
+process, where a single writer persists them.
+"""
+
+import os
+import queue
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.auto_label_writer import AutoLabelResultWriter
+from database.database import SessionLocal
+from database.operations import AutoLabelShardOperations
+
+
+def _worker_main(
+    worker_id: str,
+    job_id: str,
+    dataset_id: str,
+    model_path: str,
+    confidence_threshold: float,
+    iou_threshold: float,
+    labeled_only: Optional[bool],
+    batch_size: int,
+    torch_threads: int,
+    result_queue,
+    tile_size: Optional[int] = None,
+    tile_overlap: float = 0.2,
+    cache_key: Optional[str] = None
+):
+    """
+    Worker process entry point
+    Sends ("batch", worker_id, shard_id, results, failed, processing_time, last_image_id),
+    ("shard_done", worker_id, shard_id), ("error", worker_id, message) and
+    finally ("done", worker_id) messages to the parent
+    """
+    # Imported here so the parent process does not pay for them
+    import time
+    import torch
+    from ultralytics import YOLO
+    from core.image_prefetcher import ImagePrefetcher, decode_image
+    from database.operations import ImageOperations
+    from models.postprocess import result_to_annotations
+    from models.prediction_cache import prediction_cache, predict_cached, DEFAULT_MAX_DET
+    from models.tiling import predict_tiled
+    from models.onnx_backend import OnnxYoloModel, onnx_runtime_available
+
+    db = SessionLocal()
+    try:
+        torch.set_num_threads(torch_threads)
+        if model_path.endswith(".onnx") and onnx_runtime_available():
+            model = OnnxYoloModel(model_path, intra_op_threads=torch_threads)
+        else:
+            model = YOLO(model_path)
+        prefetcher = ImagePrefetcher()
+        loader = prediction_cache.loader(cache_key) if cache_key else decode_image
+
+        def run_model(arrays, conf, iou, **kwargs):
+            if tile_size:
+                return [
+                    predict_tiled(
+                        model, img, tile_size, tile_overlap, conf, iou,
+                        batch_size=settings.AUTO_LABEL_TILE_BATCH_SIZE, **kwargs
+                    )
+                    for img in arrays
+                ]
+            return model.predict(arrays, conf=conf, iou=iou, batch=len(arrays), verbose=False, **kwargs)
+
+        while True:
+            shard = AutoLabelShardOperations.claim_next_shard(db, job_id, worker_id)
+            if not shard:
+                break
+
+            # Images are paged in by the decode producer thread through their own session
+            read_db = SessionLocal()
+
+            def image_refs():
+                for chunk in ImageOperations.iter_images_by_dataset(
+                    read_db, dataset_id,
+                    chunk_size=settings.AUTO_LABEL_CHUNK_SIZE,
+                    labeled_only=labeled_only,
+                    # Resume after the shard's checkpoint if it was interrupted before
+                    after_id=shard.checkpoint_image_id or shard.after_image_id,
+                    until_id=shard.last_image_id
+                ):
+                    refs = [(image.id, image.file_path) for image in chunk]
+                    read_db.expunge_all()
+                    yield from refs
+
+            batches = prefetcher.iter_batches(image_refs(), batch_size, path_getter=lambda ref: ref[1], loader=loader)
+            try:
+                for batch in batches:
+                    image_ids = [image_id for (image_id, _), img in batch if img is not None]
+                    arrays = [img for _, img in batch if img is not None]
+                    failed = len(batch) - len(arrays)
+                    results = []
+                    processing_time = 0.0
+
+                    if arrays:
+                        start_time = time.time()
+                        try:
+                            if cache_key:
+                                # Cached images skip the model; misses are predicted and stored
+                                predictions = predict_cached(
+                                    prediction_cache, cache_key, arrays, run_model,
+                                    confidence_threshold, iou_threshold,
+                                    max_det=None if tile_size else DEFAULT_MAX_DET
+                                )
+                            else:
+                                predictions = run_model(arrays, confidence_threshold, iou_threshold)
+                            results = [
+                                (image_id, result_to_annotations(result, model.names))
+                                for image_id, result in zip(image_ids, predictions)
+                            ]
+                        except Exception as e:
+                            print(f"[{worker_id}] Batch inference failed: {e}")
+                            failed += len(arrays)
+                        processing_time = time.time() - start_time
+
+                    last_image_id = batch[-1][0][0]
+                    result_queue.put(("batch", worker_id, shard.id, results, failed, processing_time, last_image_id))
+            finally:
+                batches.close()
+                read_db.close()
+
+            result_queue.put(("shard_done", worker_id, shard.id))
+
+    except Exception as e:
+        result_queue.put(("error", worker_id, str(e)))
+
+    finally:
+        db.close()
+        result_queue.put(("done", worker_id))
+
+
+class AutoLabelWorkerPool:
+    """Runs auto-labeling jobs on a pool of worker processes"""
+
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = num_workers or settings.AUTO_LABEL_WORKERS
+        # spawn: workers must not inherit the parent's CUDA context or DB connections
+        self._context = multiprocessing.get_context("spawn")
+
+    def run_job(
+        self,
+        writer: AutoLabelResultWriter,
+        dataset_id: str,
+        model_path: str,
+        confidence_threshold: float = 0.5,
+        iou_threshold: float = 0.45,
+        labeled_only: Optional[bool] = None,
+        batch_size: int = 8,
+        num_workers: Optional[int] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: float = 0.2,
+        cache_key: Optional[str] = None,
+        after_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Shard the job (the images after after_id, the checkpoint of a job that
+        ran in-process before), start the workers and write their results as they arrive
+        Blocks until every shard is done; run it off the event loop. Raises
+        RuntimeError if shards are still unfinished after
+        AUTO_LABEL_SHARD_RETRIES re-runs.
+        """
+        db = writer.db
+        job_id = writer.job_id
+        num_workers = max(1, num_workers or self.num_workers)
+
+        shards = AutoLabelShardOperations.get_shards(db, job_id)
+        if shards:
+            # Resuming: re-queue shards orphaned by the previous run
+            AutoLabelShardOperations.requeue_unfinished_shards(db, job_id)
+            shards = [shard for shard in AutoLabelShardOperations.get_shards(db, job_id) if shard.status == "pending"]
+        else:
+            shards = AutoLabelShardOperations.create_shards(
+                db, job_id, dataset_id,
+                shard_size=settings.AUTO_LABEL_SHARD_SIZE,
+                labeled_only=labeled_only,
+                after_id=after_id
+            )
+        if not shards:
+            return writer.summary()
+
+        # Shards left unfinished by a crashed or failing worker are re-run a bounded number of times
+        for attempt in range(settings.AUTO_LABEL_SHARD_RETRIES + 1):
+            if attempt:
+                requeued = AutoLabelShardOperations.requeue_unfinished_shards(db, job_id)
+                print(f"Retrying {requeued} unfinished shard(s) of job {job_id} (attempt {attempt + 1})")
+
+            errors = self._run_workers(
+                writer, dataset_id, model_path, confidence_threshold, iou_threshold,
+                labeled_only, batch_size, min(num_workers, len(shards)),
+                tile_size, tile_overlap, cache_key, attempt
+            )
+
+            db.expire_all()
+            shards = [
+                shard for shard in AutoLabelShardOperations.get_shards(db, job_id) if shard.status != "completed"
+            ]
+            if not shards:
+                return writer.summary()
+
+        # Out of retries: the job must not look complete with images silently skipped
+        unprocessed = AutoLabelShardOperations.count_unprocessed_images(db, job_id, dataset_id, labeled_only)
+        for shard in shards:
+            AutoLabelShardOperations.complete_shard(db, shard.id, status="failed")
+        raise RuntimeError(
+            f"{unprocessed} images in {len(shards)} shard(s) were not processed after "
+            f"{settings.AUTO_LABEL_SHARD_RETRIES} retries: " + "; ".join(errors or ["workers stopped early"])
+        )
+
+    def _run_workers(
+        self,
+        writer: AutoLabelResultWriter,
+        dataset_id: str,
+        model_path: str,
+        confidence_threshold: float,
+        iou_threshold: float,
+        labeled_only: Optional[bool],
+        batch_size: int,
+        num_workers: int,
+        tile_size: Optional[int],
+        tile_overlap: float,
+        cache_key: Optional[str],
+        attempt: int = 0
+    ) -> List[str]:
+        """Start workers on the job's pending shards and write their results until all exit; returns worker errors"""
+        db = writer.db
+        job_id = writer.job_id
+        torch_threads = max(1, (os.cpu_count() or 1) // num_workers)
+        result_queue = self._context.Queue(maxsize=settings.AUTO_LABEL_RESULT_QUEUE_SIZE)
+
+        processes: Dict[str, Any] = {}
+        for index in range(num_workers):
+            worker_id = f"{job_id[:8]}-r{attempt}w{index}"
+            process = self._context.Process(
+                target=_worker_main,
+                args=(
+                    worker_id, job_id, dataset_id, model_path,
+                    confidence_threshold, iou_threshold, labeled_only,
+                    batch_size, torch_threads, result_queue,
+                    tile_size, tile_overlap, cache_key
+                ),
+                name=f"auto-label-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            processes[worker_id] = process
+
+        running = set(processes)
+        errors: List[str] = []
+        try:
+            while running:
+                try:
+                    message = result_queue.get(timeout=1.0)
+                except queue.Empty:
+                    # A worker that died without saying goodbye is no longer running
+                    for worker_id in list(running):
+                        if not processes[worker_id].is_alive():
+                            errors.append(f"{worker_id} exited with code {processes[worker_id].exitcode}")
+                            running.discard(worker_id)
+                    continue
+
+                kind, worker_id = message[0], message[1]
+                if kind == "batch":
+                    _, _, shard_id, results, failed, processing_time, last_image_id = message
+                    writer.write_batch(
+                        dict(results), processing_time, failed_images=failed,
+                        checkpoint_image_id=last_image_id, shard_id=shard_id
+                    )
+                elif kind == "shard_done":
+                    AutoLabelShardOperations.complete_shard(db, message[2])
+                elif kind == "error":
+                    print(f"Auto-label worker {worker_id} failed: {message[2]}")
+                    errors.append(f"{worker_id}: {message[2]}")
+                elif kind == "done":
+                    running.discard(worker_id)
+        finally:
+            for process in processes.values():
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            result_queue.close()
+
+        return errors
+
+
+# Global worker pool instance
+auto_label_worker_pool = AutoLabelWorkerPool()
@@ -0,0 +1,160 @@
+"""
+Single writer for auto-labeling results
+Persists predicted annotations batch by batch and keeps the job's counters
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from database.models import AutoLabelJob
+from database.operations import AnnotationOperations, AutoLabelJobOperations
+from core.job_progress import job_progress
+
+
+class JobLeaseLost(RuntimeError):
+    """The job was taken over by another process; this one must stop writing"""
+
+
+class AutoLabelResultWriter:
+    """
+    Owns every database write of an auto-labeling job
+
+    Inference can run in-process or in worker processes; either way results
+    are funnelled through one writer so a job holds a single database
+    connection for its annotation and progress writes.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        job_id: str,
+        model_id: str,
+        total_images: int,
+        overwrite_existing: bool = False,
+        owner_id: Optional[str] = None
+    ):
+        self.db = db
+        self.job_id = job_id
+        self.model_id = model_id
+        self.total_images = total_images
+        self.overwrite_existing = overwrite_existing
+        self.owner_id = owner_id  # Lease owner: batches are only written while it still owns the job
+
+        self.processed_count = 0
+        self.successful_count = 0
+        self.failed_count = 0
+        self.total_annotations = 0
+        self.total_processing_time = 0.0
+        self.confidence_sum = 0.0
+        self.confidence_count = 0
+
+    def restore(self, job: AutoLabelJob):
+        """Continue the counters of a resumed job from its last checkpoint"""
+        self.processed_count = job.processed_images or 0
+        self.successful_count = job.successful_images or 0
+        self.failed_count = job.failed_images or 0
+        self.total_annotations = job.total_annotations_created or 0
+
+    def write_batch(
+        self,
+        annotations_by_image: Dict[str, List[Dict[str, Any]]],
+        processing_time: float = 0.0,
+        failed_images: int = 0,
+        checkpoint_image_id: str = None,
+        shard_id: str = None
+    ) -> bool:
+        """
+        Save one batch of predictions in a single transaction and update progress
+        failed_images counts images of the batch that never reached the model.
+        checkpoint_image_id (the batch's last image id) is committed atomically
+        with the annotations, so a resumed job skips exactly the saved images.
+        Raises JobLeaseLost if another process has taken the job over.
+        """
+        saved = True
+        self.total_processing_time += processing_time
+
+        annotation_count = sum(len(annotations) for annotations in annotations_by_image.values())
+        processed = self.processed_count + len(annotations_by_image) + failed_images
+
+        try:
+            if checkpoint_image_id:
+                owned = AutoLabelJobOperations.stage_checkpoint(
+                    self.db, self.job_id, checkpoint_image_id, shard_id=shard_id,
+                    owner_id=self.owner_id,
+                    processed_images=processed,
+                    successful_images=self.successful_count + len(annotations_by_image),
+                    failed_images=self.failed_count + failed_images,
+                    total_annotations_created=self.total_annotations + annotation_count
+                )
+                if not owned:
+                    raise JobLeaseLost(f"Job {self.job_id} was taken over by another process")
+
+            if annotations_by_image:
+                # Save the whole batch (and replace existing labels) in one transaction
+                AnnotationOperations.bulk_create_annotations(
+                    self.db,
+                    annotations_by_image,
+                    replace_existing=self.overwrite_existing,
+                    is_auto_generated=True,
+                    model_id=self.model_id,
+                    is_auto_labeled=True
+                )
+            else:
+                self.db.commit()
+
+            for annotations in annotations_by_image.values():
+                self.confidence_sum += sum(ann['confidence'] for ann in annotations)
+                self.confidence_count += len(annotations)
+            self.total_annotations += annotation_count
+            self.successful_count += len(annotations_by_image)
+            self.failed_count += failed_images
+
+        except JobLeaseLost:
+            self.db.rollback()
+            raise
+
+        except Exception as e:
+            self.db.rollback()
+            print(f"Failed to save annotations for {len(annotations_by_image)} images: {e}")
+            self.failed_count += len(annotations_by_image) + failed_images
+            saved = False
+
+        self.processed_count = processed
+        self.update_progress()
+        return saved
+
+    def update_progress(self, **fields):
+        """Publish live progress (flushed to the database on an interval)"""
+        progress = min(100.0, (self.processed_count / self.total_images) * 100) if self.total_images else 100.0
+        job_progress.update(
+            self.db, self.job_id,
+            progress=progress,
+            total_images=self.total_images,
+            processed_images=self.processed_count,
+            successful_images=self.successful_count,
+            failed_images=self.failed_count,
+            total_annotations_created=self.total_annotations,
+            **fields
+        )
+
+    @property
+    def average_confidence(self) -> float:
+        return self.confidence_sum / self.confidence_count if self.confidence_count > 0 else 0.0
+
+    @property
+    def average_processing_time(self) -> float:
+        return self.total_processing_time / self.successful_count if self.successful_count > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Job results and statistics"""
+        return {
+            "job_id": self.job_id,
+            "total_images": self.total_images,
+            "processed_images": self.processed_count,
+            "successful_images": self.successful_count,
+            "failed_images": self.failed_count,
+            "total_annotations_created": self.total_annotations,
+            "average_confidence": self.average_confidence,
+            "average_processing_time": self.average_processing_time
+        }
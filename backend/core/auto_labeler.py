@@ -7,70 +7,83 @@ import os
 import time
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import cv2
 import numpy as np
 from PIL import Image
 import torch
 from ultralytics import YOLO
 
-from models.model_manager import ModelManager, ModelInfo
+from models.model_manager import model_manager, ModelInfo
+from models.postprocess import result_to_annotations
+from models.tiling import predict_tiled
+from models.prediction_cache import prediction_cache, predict_cached, check_thresholds, DEFAULT_MAX_DET
 from database.operations import (
     AnnotationOperations, ImageOperations, AutoLabelJobOperations,
-    ModelUsageOperations, DatasetOperations
+    AutoLabelShardOperations, ModelUsageOperations
 )
 from database.database import SessionLocal
 from core.config import settings
+from core.image_prefetcher import ImagePrefetcher, decode_image
+from core.job_progress import job_progress, is_dead_local_owner, PROCESS_ID
+from core.auto_label_writer import AutoLabelResultWriter, JobLeaseLost
+from core.auto_label_workers import auto_label_worker_pool
 
 
 class AutoLabeler:
     """Main auto-labeling pipeline"""
     
     def __init__(self):
-        self.model_manager = ModelManager()
-        self.loaded_models = {}  # Cache for loaded models
+        # Models are shared with the API through the model manager's pool
+        self.model_manager = model_manager
+        # Background tasks of resumed jobs (kept referenced until they finish)
+        self._resume_tasks = set()
         
     def load_model(self, model_id: str) -> Optional[YOLO]:
-        """Load and cache a YOLO model"""
-        if model_id in self.loaded_models:
-            return self.loaded_models[model_id]
-        
+        """
+        Load a YOLO model from the shared model pool and pin it
+        Every successful call must be paired with release_model()
+        """
         model_info = self.model_manager.get_model_info(model_id)
         if not model_info:
             print(f"Model {model_id} not found")
             return None
         
         try:
-            # Load YOLO model
-            model = YOLO(model_info.path)
-            self.loaded_models[model_id] = model
-            print(f"Loaded model: {model_info.name}")
-            return model
+            return self.model_manager.acquire_model(model_id)
         except Exception as e:
             print(f"Failed to load model {model_id}: {e}")
             return None
     
+    def release_model(self, model_id: str):
+        """Let the pool evict a model again once a job is done with it"""
+        self.model_manager.release_model(model_id)
+    
     def predict_image(
         self, 
-        image_path: str, 
+        image_path: Union[str, np.ndarray], 
         model: YOLO,
         confidence_threshold: float = 0.5,
-        iou_threshold: float = 0.45
+        iou_threshold: float = 0.45,
+        image_size: Optional[Tuple[int, int]] = None
     ) -> Tuple[List[Dict], float]:
         """
-        Run inference on a single image
+        Run inference on a single image (file path or decoded array)
+        image_size: optional (width, height) from the stored Image record, used
+        only if the result does not carry the original image shape
         Returns: (annotations, processing_time)
         """
         start_time = time.time()
         
         try:
-            # Run inference
-            results = model.predict(
-                image_path,
-                conf=confidence_threshold,
-                iou=iou_threshold,
-                verbose=False
-            )
+            # Run inference (the pooled model is shared with API requests)
+            with self.model_manager.model_pool.inference_lock(model):
+                results = model.predict(
+                    image_path,
+                    conf=confidence_threshold,
+                    iou=iou_threshold,
+                    verbose=False
+                )
             
             processing_time = time.time() - start_time
             
@@ -78,65 +91,101 @@ class AutoLabeler:
                 return [], processing_time
             
             result = results[0]  # Get first result
-            annotations = []
-            
-            # Get image dimensions
-            img = cv2.imread(image_path)
-            if img is None:
-                return [], processing_time
             
-            img_height, img_width = img.shape[:2]
-            
-            # Process detections
-            if result.boxes is not None:
-                boxes = result.boxes
-                
-                for i in range(len(boxes)):
-                    # Get bounding box (xyxy format)
-                    box = boxes.xyxy[i].cpu().numpy()
-                    confidence = float(boxes.conf[i].cpu().numpy())
-                    class_id = int(boxes.cls[i].cpu().numpy())
-                    
-                    # Convert to normalized coordinates
-                    x_min = float(box[0] / img_width)
-                    y_min = float(box[1] / img_height)
-                    x_max = float(box[2] / img_width)
-                    y_max = float(box[3] / img_height)
-                    
-                    # Get class name
-                    class_name = model.names[class_id] if class_id in model.names else f"class_{class_id}"
-                    
-                    # Handle segmentation if available
-                    segmentation = None
-                    if result.masks is not None and i < len(result.masks):
-                        mask = result.masks.xy[i]  # Get polygon points
-                        if len(mask) > 0:
-                            # Normalize polygon points
-                            segmentation = []
-                            for point in mask:
-                                segmentation.extend([
-                                    float(point[0] / img_width),
-                                    float(point[1] / img_height)
-                                ])
-                    
-                    annotation = {
-                        'class_name': class_name,
-                        'class_id': class_id,
-                        'confidence': confidence,
-                        'x_min': x_min,
-                        'y_min': y_min,
-                        'x_max': x_max,
-                        'y_max': y_max,
-                        'segmentation': segmentation
-                    }
-                    annotations.append(annotation)
-            
-            return annotations, processing_time
+            return self._format_result(result, model, image_size), processing_time
             
         except Exception as e:
-            print(f"Error processing image {image_path}: {e}")
+            name = image_path if isinstance(image_path, str) else "<array>"
+            print(f"Error processing image {name}: {e}")
             return [], time.time() - start_time
     
+    def predict_batch(
+        self,
+        images: List[Any],
+        model: YOLO,
+        confidence_threshold: float = 0.5,
+        iou_threshold: float = 0.45,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        cache_key: Optional[str] = None
+    ) -> Tuple[List[List[Dict]], float]:
+        """
+        Run inference on a batch of decoded images in a single model call
+        With tile_size set, each image is sliced into overlapping tiles that
+        are batched through the model and merged with cross-tile NMS instead.
+        With cache_key set, images are CachedImage entries from the prediction
+        cache loader and the model only runs on cache misses.
+        Returns: (annotations per image, processing_time for the whole batch)
+        """
+        start_time = time.time()
+        
+        if cache_key:
+            results = predict_cached(
+                prediction_cache, cache_key, images,
+                lambda arrays, conf, iou, **kwargs: self._run_model(
+                    arrays, model, conf, iou, tile_size, tile_overlap, **kwargs
+                ),
+                confidence_threshold, iou_threshold,
+                max_det=None if tile_size else DEFAULT_MAX_DET
+            )
+        else:
+            results = self._run_model(images, model, confidence_threshold, iou_threshold, tile_size, tile_overlap)
+        
+        processing_time = time.time() - start_time
+        
+        # Results carry orig_shape, so no separate image size is needed
+        batch_annotations = [self._format_result(result, model) for result in results]
+        
+        return batch_annotations, processing_time
+    
+    def _run_model(
+        self,
+        images: List[np.ndarray],
+        model: YOLO,
+        confidence_threshold: float,
+        iou_threshold: float,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        **predict_kwargs
+    ) -> List[Any]:
+        """One model call for a batch of decoded images (tiled if tile_size is set)"""
+        # The pooled model is shared with API requests and other jobs
+        with self.model_manager.model_pool.inference_lock(model):
+            if tile_size:
+                overlap = settings.AUTO_LABEL_TILE_OVERLAP if tile_overlap is None else tile_overlap
+                results = [
+                    predict_tiled(
+                        model, img, tile_size, overlap,
+                        confidence_threshold, iou_threshold,
+                        batch_size=settings.AUTO_LABEL_TILE_BATCH_SIZE,
+                        **predict_kwargs
+                    )
+                    for img in images
+                ]
+            else:
+                results = model.predict(
+                    images,
+                    conf=confidence_threshold,
+                    iou=iou_threshold,
+                    batch=len(images),
+                    verbose=False,
+                    **predict_kwargs
+                )
+        
+        return results
+    
+    def _format_result(
+        self,
+        result,
+        model: YOLO,
+        image_size: Optional[Tuple[int, int]] = None
+    ) -> List[Dict]:
+        """
+        Convert a single Ultralytics result into annotation dicts
+        Dimensions come from result.orig_shape, falling back to image_size (width, height)
+        """
+        return result_to_annotations(result, model.names, image_size)
+    
     async def auto_label_dataset(
         self,
         dataset_id: str,
@@ -144,12 +193,26 @@ class AutoLabeler:
         confidence_threshold: float = 0.5,
         iou_threshold: float = 0.45,
         overwrite_existing: bool = False,
-        job_id: str = None
+        job_id: str = None,
+        batch_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        resume: bool = False,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Auto-label all images in a dataset
+        Images are decoded ahead of time and sent to the model in batches
+        of `batch_size` (defaults to settings.AUTO_LABEL_BATCH_SIZE).
+        With num_workers > 0 (defaults to settings.AUTO_LABEL_WORKERS) inference
+        runs in a pool of worker processes instead of the API process.
+        With resume=True an interrupted job continues from its checkpoint, in
+        the execution mode (num_workers) it was started with.
+        With tile_size set, high-resolution images are labeled tile by tile.
         Returns job results and statistics
         """
+        batch_size = max(1, batch_size or settings.AUTO_LABEL_BATCH_SIZE)
+        tile_overlap = settings.AUTO_LABEL_TILE_OVERLAP if tile_overlap is None else tile_overlap
         db = SessionLocal()
         
         try:
@@ -157,7 +220,8 @@ class AutoLabeler:
             if not job_id:
                 job = AutoLabelJobOperations.create_auto_label_job(
                     db, dataset_id, model_id, confidence_threshold, 
-                    iou_threshold, overwrite_existing
+                    iou_threshold, overwrite_existing,
+                    tile_size=tile_size, tile_overlap=tile_overlap
                 )
                 job_id = job.id
             else:
@@ -166,160 +230,126 @@ class AutoLabeler:
             if not job:
                 return {"error": "Job not found"}
             
+            # Own the job's lease; a job run by another live process is left to it
+            if not AutoLabelJobOperations.acquire_job_lease(db, job_id, PROCESS_ID):
+                print(f"Auto-label job {job_id} is owned by another process")
+                return {"error": "Job is running in another process", "job_id": job_id}
+            
+            # A resumed job keeps the execution mode it was started with
+            if num_workers is None:
+                num_workers = job.num_workers if resume and job.num_workers is not None else settings.AUTO_LABEL_WORKERS
+            if job.num_workers != num_workers:
+                AutoLabelJobOperations.update_job_progress(db, job_id, num_workers=num_workers)
+            
             # Update job status
-            AutoLabelJobOperations.update_job_progress(
+            job_progress.update(
                 db, job_id, status="processing", progress=0.0
             )
             
-            # Load model
-            model = self.load_model(model_id)
-            if not model:
-                AutoLabelJobOperations.update_job_progress(
+            # Get model info
+            model_info = self.model_manager.get_model_info(model_id)
+            if not model_info:
+                job_progress.update(
                     db, job_id, status="failed", 
-                    error_message=f"Failed to load model {model_id}"
+                    error_message=f"Model {model_id} not found"
                 )
-                return {"error": f"Failed to load model {model_id}"}
+                return {"error": f"Model {model_id} not found"}
             
-            # Get model info
-            model_info = self.model_manager.get_model_info(model_id)
+            cache_key = self._cache_key(model_id, tile_size, tile_overlap)
+            if cache_key:
+                # Cached raw detections cannot be re-thresholded looser than they were stored
+                check_thresholds(confidence_threshold, iou_threshold)
             
-            # Get images to process
-            images = ImageOperations.get_images_by_dataset(
-                db, dataset_id, 
-                labeled_only=False if overwrite_existing else None
-            )
+            # Stream images to process: all of them when overwriting, else only unlabeled ones
+            labeled_only = None if overwrite_existing else False
             
-            if not overwrite_existing:
-                # Filter out already labeled images
-                images = [img for img in images if not img.is_labeled]
+            # A resumed job skips everything up to its checkpoint (keyset on the id index)
+            has_shards = resume and bool(AutoLabelShardOperations.get_shards(db, job_id))
+            after_id = job.checkpoint_image_id if resume and not has_shards else None
+            already_processed = (job.processed_images or 0) if resume else 0
             
-            total_images = len(images)
+            if has_shards:
+                # Sharded jobs keep their per-shard checkpoints; the total is unchanged
+                num_workers = num_workers or 1
+                total_images = job.total_images or 0
+            else:
+                total_images = already_processed + ImageOperations.count_images_by_dataset(
+                    db, dataset_id, labeled_only=labeled_only, after_id=after_id
+                )
             if total_images == 0:
-                AutoLabelJobOperations.update_job_progress(
+                job_progress.update(
                     db, job_id, status="completed", progress=100.0,
                     total_images=0, processed_images=0, successful_images=0
                 )
                 return {"message": "No images to process", "job_id": job_id}
             
-            # Update job with total count
-            AutoLabelJobOperations.update_job_progress(
-                db, job_id, total_images=total_images
+            writer = AutoLabelResultWriter(
+                db, job_id, model_id, total_images, overwrite_existing, owner_id=PROCESS_ID
             )
-            
-            # Process images
-            processed_count = 0
-            successful_count = 0
-            failed_count = 0
-            total_annotations = 0
-            total_processing_time = 0.0
-            confidence_sum = 0.0
-            confidence_count = 0
-            
-            for i, image in enumerate(images):
-                try:
-                    # Check if image file exists
-                    if not os.path.exists(image.file_path):
-                        print(f"Image file not found: {image.file_path}")
-                        failed_count += 1
-                        continue
-                    
-                    # Clear existing annotations if overwriting
-                    if overwrite_existing:
-                        AnnotationOperations.delete_annotations_by_image(db, image.id)
-                    
-                    # Run inference
-                    annotations, processing_time = self.predict_image(
-                        image.file_path, model, confidence_threshold, iou_threshold
-                    )
-                    
-                    total_processing_time += processing_time
-                    
-                    # Save annotations
-                    for ann_data in annotations:
-                        annotation = AnnotationOperations.create_annotation(
-                            db=db,
-                            image_id=image.id,
-                            class_name=ann_data['class_name'],
-                            class_id=ann_data['class_id'],
-                            x_min=ann_data['x_min'],
-                            y_min=ann_data['y_min'],
-                            x_max=ann_data['x_max'],
-                            y_max=ann_data['y_max'],
-                            confidence=ann_data['confidence'],
-                            segmentation=ann_data['segmentation'],
-                            is_auto_generated=True,
-                            model_id=model_id
-                        )
-                        total_annotations += 1
-                        confidence_sum += ann_data['confidence']
-                        confidence_count += 1
-                    
-                    # Update image status
-                    ImageOperations.update_image_status(
-                        db, image.id, 
-                        is_labeled=len(annotations) > 0,
-                        is_auto_labeled=True
-                    )
-                    
-                    successful_count += 1
-                    
-                except Exception as e:
-                    print(f"Failed to process image {image.filename}: {e}")
-                    failed_count += 1
-                
-                processed_count += 1
-                
-                # Update progress
-                progress = (processed_count / total_images) * 100
-                AutoLabelJobOperations.update_job_progress(
-                    db, job_id,
-                    progress=progress,
-                    processed_images=processed_count,
-                    successful_images=successful_count,
-                    failed_images=failed_count,
-                    total_annotations_created=total_annotations
+            if resume:
+                writer.restore(job)
+            writer.update_progress()
+            
+            if num_workers > 0:
+                # Workers load their own model; this process only writes results
+                await asyncio.to_thread(
+                    auto_label_worker_pool.run_job,
+                    writer,
+                    dataset_id,
+                    model_info.path,
+                    confidence_threshold,
+                    iou_threshold,
+                    labeled_only,
+                    batch_size,
+                    num_workers,
+                    tile_size,
+                    tile_overlap,
+                    cache_key,
+                    after_id
                 )
+            else:
+                # Load model
+                model = self.load_model(model_id)
+                if not model:
+                    job_progress.update(
+                        db, job_id, status="failed", 
+                        error_message=f"Failed to load model {model_id}"
+                    )
+                    return {"error": f"Failed to load model {model_id}"}
                 
-                # Small delay to prevent overwhelming the system
-                if i % 10 == 0:
-                    await asyncio.sleep(0.1)
-            
-            # Calculate average confidence
-            avg_confidence = confidence_sum / confidence_count if confidence_count > 0 else 0.0
-            avg_processing_time = total_processing_time / processed_count if processed_count > 0 else 0.0
+                try:
+                    await self._label_in_process(
+                        writer, dataset_id, model, confidence_threshold,
+                        iou_threshold, labeled_only, batch_size, after_id,
+                        tile_size, tile_overlap,
+                        cache_key=cache_key
+                    )
+                finally:
+                    self.release_model(model_id)
             
             # Update model usage statistics
             ModelUsageOperations.update_model_usage(
                 db, model_id, model_info.name,
-                images_processed=successful_count,
-                processing_time=avg_processing_time,
-                average_confidence=avg_confidence
+                images_processed=writer.successful_count,
+                processing_time=writer.average_processing_time,
+                average_confidence=writer.average_confidence
             )
             
-            # Update dataset statistics
-            DatasetOperations.update_dataset_stats(db, dataset_id)
-            
             # Complete job
-            AutoLabelJobOperations.update_job_progress(
-                db, job_id, status="completed", progress=100.0
-            )
+            writer.update_progress(status="completed")
             
-            return {
-                "job_id": job_id,
-                "status": "completed",
-                "total_images": total_images,
-                "processed_images": processed_count,
-                "successful_images": successful_count,
-                "failed_images": failed_count,
-                "total_annotations_created": total_annotations,
-                "average_confidence": avg_confidence,
-                "average_processing_time": avg_processing_time
-            }
+            return {**writer.summary(), "status": "completed"}
+            
+        except JobLeaseLost as e:
+            # The new owner continues from the last checkpoint; leave the job to it
+            print(str(e))
+            job_progress.forget(job_id)
+            return {"error": str(e), "job_id": job_id}
             
         except Exception as e:
             # Handle job failure
             if job_id:
-                AutoLabelJobOperations.update_job_progress(
+                job_progress.update(
                     db, job_id, status="failed", 
                     error_message=str(e)
                 )
@@ -329,6 +359,191 @@ class AutoLabeler:
         finally:
             db.close()
     
+    async def _label_in_process(
+        self,
+        writer: AutoLabelResultWriter,
+        dataset_id: str,
+        model: YOLO,
+        confidence_threshold: float,
+        iou_threshold: float,
+        labeled_only: Optional[bool],
+        batch_size: int,
+        after_id: Optional[str] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        cache_key: Optional[str] = None
+    ):
+        """Run inference in this process, handing each batch to the writer"""
+        # Images are paged in by the decode producer thread, so they are read
+        # through a dedicated session that the main thread never touches
+        read_db = SessionLocal()
+        image_refs = self._iter_image_refs(read_db, dataset_id, labeled_only, after_id)
+        
+        # Decode upcoming batches on a thread pool while the model runs
+        prefetcher = ImagePrefetcher()
+        
+        # With the prediction cache, the loader skips decoding images it already has predictions for
+        loader = prediction_cache.loader(cache_key) if cache_key else decode_image
+        batches = prefetcher.iter_batches(image_refs, batch_size, path_getter=lambda ref: ref[1], loader=loader)
+        try:
+            for batch in batches:
+                batch_images = []
+                batch_arrays = []
+                for image_ref, img in batch:
+                    if img is None:
+                        print(f"Image file missing or unreadable: {image_ref[1]}")
+                        continue
+                    
+                    batch_images.append(image_ref)
+                    batch_arrays.append(img)
+                
+                failed = len(batch) - len(batch_arrays)
+                annotations_by_image = {}
+                processing_time = 0.0
+                
+                if batch_arrays:
+                    try:
+                        # Run inference on the whole batch off the event loop
+                        batch_annotations, processing_time = await asyncio.to_thread(
+                            self.predict_batch,
+                            batch_arrays, model, confidence_threshold, iou_threshold,
+                            tile_size, tile_overlap, cache_key
+                        )
+                        annotations_by_image = {
+                            image_id: annotations
+                            for (image_id, _, _), annotations in zip(batch_images, batch_annotations)
+                        }
+                    except Exception as e:
+                        print(f"Batch inference failed: {e}")
+                        failed += len(batch_arrays)
+                
+                # Bulk insert and checkpoint commit are blocking I/O: keep them off the event loop too.
+                # The session is only used by one thread at a time, since each call is awaited.
+                await asyncio.to_thread(
+                    writer.write_batch,
+                    annotations_by_image, processing_time, failed_images=failed,
+                    checkpoint_image_id=batch[-1][0][0]
+                )
+        finally:
+            batches.close()
+            read_db.close()
+    
+    def _cache_key(
+        self,
+        model_id: str,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None
+    ) -> Optional[str]:
+        """Prediction cache namespace for a model, or None when caching is off"""
+        if not settings.PREDICTION_CACHE_ENABLED:
+            return None
+        
+        model_info = self.model_manager.get_model_info(model_id)
+        if not model_info:
+            return None
+        return prediction_cache.model_key(model_id, model_info.path, tile_size, tile_overlap)
+    
+    def _iter_image_refs(
+        self,
+        read_db,
+        dataset_id: str,
+        labeled_only: Optional[bool],
+        after_id: Optional[str] = None
+    ):
+        """
+        Lazily yield (id, file_path, filename) tuples for a dataset's images
+        Plain tuples are handed on so the decode threads never hold ORM instances
+        """
+        for chunk in ImageOperations.iter_images_by_dataset(
+            read_db, dataset_id,
+            chunk_size=settings.AUTO_LABEL_CHUNK_SIZE,
+            labeled_only=labeled_only,
+            after_id=after_id
+        ):
+            refs = [(image.id, image.file_path, image.filename) for image in chunk]
+            read_db.expunge_all()
+            yield from refs
+    
+    async def resume_job(self, job_id: str) -> Dict[str, Any]:
+        """Continue an interrupted auto-labeling job from its checkpoint"""
+        db = SessionLocal()
+        try:
+            job = AutoLabelJobOperations.get_job(db, job_id)
+            if not job:
+                return {"error": "Job not found"}
+            
+            dataset_id = job.dataset_id
+            model_id = job.model_id
+            confidence_threshold = job.confidence_threshold
+            iou_threshold = job.iou_threshold
+            overwrite_existing = job.overwrite_existing
+            tile_size = job.tile_size
+            tile_overlap = job.tile_overlap
+        finally:
+            db.close()
+        
+        print(f"Resuming auto-label job {job_id}")
+        return await self.auto_label_dataset(
+            dataset_id=dataset_id,
+            model_id=model_id,
+            confidence_threshold=confidence_threshold,
+            iou_threshold=iou_threshold,
+            overwrite_existing=overwrite_existing,
+            job_id=job_id,
+            resume=True,
+            tile_size=tile_size,
+            tile_overlap=tile_overlap
+        )
+    
+    def dead_owner_ids(self, db) -> List[str]:
+        """Owners of unfinished jobs that are exited server processes of this host"""
+        return [
+            owner_id for owner_id in AutoLabelJobOperations.get_unfinished_job_owners(db)
+            if is_dead_local_owner(owner_id)
+        ]
+    
+    def claim_orphaned_jobs(self) -> List[str]:
+        """Take over every orphaned job: stale lease, or owned by an exited process of this host (blocking)"""
+        db = SessionLocal()
+        try:
+            return AutoLabelJobOperations.claim_orphaned_jobs(
+                db, owner_id=PROCESS_ID, dead_owner_ids=self.dead_owner_ids(db)
+            )
+        finally:
+            db.close()
+    
+    def start_resume(self, job_id: str):
+        """Resume a claimed job in a background task"""
+        task = asyncio.create_task(self.resume_job(job_id))
+        self._resume_tasks.add(task)
+        task.add_done_callback(self._resume_tasks.discard)
+    
+    async def resume_orphaned_jobs(self) -> List[str]:
+        """
+        Sweep: claim unfinished jobs whose server process died and resume each
+        of them in the background
+        """
+        job_ids = await asyncio.to_thread(self.claim_orphaned_jobs)
+        for job_id in job_ids:
+            self.start_resume(job_id)
+        return job_ids
+    
+    async def resume_orphaned_jobs_periodically(self, interval_seconds: Optional[float] = None):
+        """
+        Sweep for orphaned jobs on startup and then every interval_seconds
+        (default: half the job lease), so jobs of a process that died while
+        another one kept running are taken over too
+        """
+        interval = interval_seconds or settings.AUTO_LABEL_ORPHAN_SWEEP_SECONDS or settings.AUTO_LABEL_JOB_LEASE_SECONDS / 2
+        while True:
+            try:
+                job_ids = await self.resume_orphaned_jobs()
+                if job_ids:
+                    print(f"Resuming {len(job_ids)} orphaned auto-label job(s): {', '.join(job_ids)}")
+            except Exception as e:
+                print(f"Orphaned job sweep failed: {e}")
+            await asyncio.sleep(interval)
+    
     async def auto_label_single_image(
         self,
         image_id: str,
@@ -355,48 +570,33 @@ class AutoLabeler:
             if not model:
                 return {"error": f"Failed to load model {model_id}"}
             
-            # Clear existing annotations if overwriting
-            if overwrite_existing:
-                AnnotationOperations.delete_annotations_by_image(db, image_id)
-            
             # Run inference
-            annotations, processing_time = self.predict_image(
-                image.file_path, model, confidence_threshold, iou_threshold
-            )
-            
-            # Save annotations
-            created_annotations = []
-            for ann_data in annotations:
-                annotation = AnnotationOperations.create_annotation(
-                    db=db,
-                    image_id=image_id,
-                    class_name=ann_data['class_name'],
-                    class_id=ann_data['class_id'],
-                    x_min=ann_data['x_min'],
-                    y_min=ann_data['y_min'],
-                    x_max=ann_data['x_max'],
-                    y_max=ann_data['y_max'],
-                    confidence=ann_data['confidence'],
-                    segmentation=ann_data['segmentation'],
-                    is_auto_generated=True,
-                    model_id=model_id
+            try:
+                annotations, processing_time = self.predict_image(
+                    image.file_path, model, confidence_threshold, iou_threshold,
+                    image_size=(image.width, image.height)
                 )
-                created_annotations.append({
-                    "id": annotation.id,
-                    "class_name": annotation.class_name,
-                    "confidence": annotation.confidence,
-                    "bbox": [annotation.x_min, annotation.y_min, annotation.x_max, annotation.y_max]
-                })
-            
-            # Update image status
-            ImageOperations.update_image_status(
-                db, image_id, 
-                is_labeled=len(annotations) > 0,
+            finally:
+                self.release_model(model_id)
+            
+            # Save annotations (clearing existing ones if overwriting) in one transaction
+            rows = AnnotationOperations.bulk_create_annotations(
+                db,
+                {image_id: annotations},
+                replace_existing=overwrite_existing,
+                is_auto_generated=True,
+                model_id=model_id,
                 is_auto_labeled=True
             )
-            
-            # Update dataset statistics
-            DatasetOperations.update_dataset_stats(db, image.dataset_id)
+            created_annotations = [
+                {
+                    "id": row["id"],
+                    "class_name": row["class_name"],
+                    "confidence": row["confidence"],
+                    "bbox": [row["x_min"], row["y_min"], row["x_max"], row["y_max"]]
+                }
+                for row in rows
+            ]
             
             return {
                 "image_id": image_id,
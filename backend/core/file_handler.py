@@ -198,9 +198,6 @@ class FileHandler:
                     results['failed_uploads'] += 1
                     print(error_msg)
             
-            # Update dataset statistics
-            DatasetOperations.update_dataset_stats(db, dataset_id)
-            
             return results
             
         finally:
@@ -222,22 +219,28 @@ class FileHandler:
         db = SessionLocal()
         try:
             image = ImageOperations.get_image(db, image_id)
-            if image and image.file_path:
-                # Handle both absolute and relative paths
-                if os.path.isabs(image.file_path):
-                    file_path = image.file_path
-                else:
-                    # If relative path, make it absolute
-                    file_path = os.path.join(settings.BASE_DIR, image.file_path)
-                
-                if os.path.exists(file_path):
-                    # Return relative path for serving via FastAPI static files
-                    relative_path = os.path.relpath(file_path, settings.UPLOAD_DIR)
-                    return f"/uploads/{relative_path}"
-            return None
+            return self.image_url(image.file_path) if image else None
         finally:
             db.close()
     
+    def image_url(self, image_path: Optional[str]) -> Optional[str]:
+        """URL for serving an image file (no database lookup)"""
+        if not image_path:
+            return None
+        
+        # Handle both absolute and relative paths
+        if os.path.isabs(image_path):
+            file_path = image_path
+        else:
+            # If relative path, make it absolute
+            file_path = os.path.join(settings.BASE_DIR, image_path)
+        
+        if os.path.exists(file_path):
+            # Return relative path for serving via FastAPI static files
+            relative_path = os.path.relpath(file_path, settings.UPLOAD_DIR)
+            return f"/uploads/{relative_path}"
+        return None
+    
     def rename_dataset_folder(self, project_name: str, old_dataset_name: str, new_dataset_name: str) -> bool:
         """Rename dataset folder when dataset name is updated"""
         try:
@@ -0,0 +1,124 @@
+"""
+Prefetching image decode pipeline for auto-labeling
+Decodes images on a bounded thread pool so the model is never idle waiting on disk I/O
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import settings
+
+
+def decode_image(image_path: str) -> Optional[np.ndarray]:
+    """Read and decode an image file in one pass (BGR, as expected by YOLO)"""
+    if not os.path.exists(image_path):
+        return None
+
+    try:
+        data = np.fromfile(image_path, dtype=np.uint8)
+    except OSError:
+        return None
+
+    if data.size == 0:
+        return None
+
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def decode_image_bytes(data: bytes) -> Optional[np.ndarray]:
+    """Decode an in-memory encoded image (e.g. an upload) without copying or touching disk"""
+    if not data:
+        return None
+
+    # np.frombuffer wraps the request bytes as-is; imdecode reads straight from them
+    return cv2.imdecode(np.frombuffer(memoryview(data), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class ImagePrefetcher:
+    """
+    Producer/consumer decode stage
+
+    A producer thread groups incoming items into batches and submits their decode
+    to a thread pool. Batches are handed to the consumer through a bounded queue,
+    so at most `queue_size` batches are decoded ahead of the model.
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, max_workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.max_workers = max(1, max_workers or settings.AUTO_LABEL_DECODE_WORKERS)
+        self.queue_size = max(1, queue_size or settings.AUTO_LABEL_PREFETCH_BATCHES)
+
+    def iter_batches(
+        self,
+        items: Iterable[Any],
+        batch_size: int,
+        path_getter: Callable[[Any], str] = lambda item: item.file_path,
+        loader: Callable[[str], Any] = decode_image
+    ) -> Iterator[List[Tuple[Any, Optional[np.ndarray]]]]:
+        """
+        Yield batches of (item, decoded image) pairs in input order
+        The decoded image is None when the file is missing or cannot be decoded.
+        A custom loader (path -> value or None) can replace decode_image.
+        """
+        batch_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="decode")
+
+        def put(entry) -> bool:
+            # Block on the bounded queue, but give up if the consumer went away
+            while not stop_event.is_set():
+                try:
+                    batch_queue.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                batch: List[Tuple[Any, Future]] = []
+                for item in items:
+                    if stop_event.is_set():
+                        return
+                    batch.append((item, executor.submit(loader, path_getter(item))))
+                    if len(batch) >= batch_size:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch:
+                    put(batch)
+            except Exception as e:
+                put(e)
+            finally:
+                put(self._SENTINEL)
+
+        producer_thread = threading.Thread(target=producer, name="decode-producer", daemon=True)
+        producer_thread.start()
+
+        try:
+            while True:
+                entry = batch_queue.get()
+                if entry is self._SENTINEL:
+                    break
+                if isinstance(entry, Exception):
+                    raise entry
+
+                decoded = []
+                for item, future in entry:
+                    try:
+                        decoded.append((item, future.result()))
+                    except Exception as e:
+                        print(f"Failed to decode image {path_getter(item)}: {e}")
+                        decoded.append((item, None))
+                yield decoded
+        finally:
+            stop_event.set()
+            producer_thread.join(timeout=5)
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,174 @@
+"""
+Live progress tracking for auto-labeling jobs
+Keeps job counters in memory, flushes them to the database on a time/count
+interval and publishes every change to in-process subscribers
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database.operations import AutoLabelJobOperations
+
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Owner id of the jobs this server process runs (see AutoLabelJob.owner_id)
+PROCESS_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def is_dead_local_owner(owner_id: Optional[str]) -> bool:
+    """
+    True if owner_id is a server process of this host that has exited
+    (e.g. the process this one replaced on restart), so its jobs need not wait
+    for their lease to expire. Owners on other hosts are never judged dead here.
+    """
+    if not owner_id or owner_id == PROCESS_ID:
+        return False
+    parts = owner_id.rsplit("-", 2)
+    if len(parts) != 3 or parts[0] != socket.gethostname() or not parts[1].isdigit():
+        return False
+
+    pid = int(parts[1])
+    if pid == os.getpid():
+        # Same pid with another token: an earlier process (containers reuse pids)
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) terminates the process on Windows; rely on the lease there
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobProgressTracker:
+    """
+    In-memory progress for running jobs
+
+    update() is cheap and can be called after every batch: the snapshot is
+    written to auto_label_jobs only when `flush_interval` seconds or
+    `flush_every` processed images have passed since the last write, or when
+    the job status changes. Status endpoints read live counters with get().
+    """
+
+    FINAL_STATUSES = ("completed", "failed")
+
+    def __init__(self, flush_interval: Optional[float] = None, flush_every: Optional[int] = None):
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.AUTO_LABEL_PROGRESS_FLUSH_SECONDS
+        )
+        self.flush_every = flush_every if flush_every is not None else settings.AUTO_LABEL_PROGRESS_FLUSH_IMAGES
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._last_flush: Dict[str, Dict[str, float]] = {}
+        self._subscribers: Dict[str, List[ProgressCallback]] = defaultdict(list)
+
+    def update(self, db: Session, job_id: str, force: bool = False, **fields) -> Dict[str, Any]:
+        """
+        Merge new counters into the job's live snapshot and publish it
+        Flushes to the database if the interval has elapsed, the status changed or force=True
+        """
+        with self._lock:
+            snapshot = self._jobs.setdefault(job_id, {"job_id": job_id})
+            status_changed = "status" in fields and fields["status"] != snapshot.get("status")
+            snapshot.update(fields)
+            snapshot["updated_at"] = time.time()
+            snapshot = dict(snapshot)
+
+            last = self._last_flush.setdefault(job_id, {"time": 0.0, "processed": 0})
+            processed = snapshot.get("processed_images", 0) or 0
+            due = (
+                force
+                or status_changed
+                or time.monotonic() - last["time"] >= self.flush_interval
+                or processed - last["processed"] >= self.flush_every
+            )
+            if due:
+                last["time"] = time.monotonic()
+                last["processed"] = processed
+
+        self._publish(job_id, snapshot)
+
+        if due:
+            self._write(db, job_id, snapshot)
+
+        if snapshot.get("status") in self.FINAL_STATUSES:
+            self.forget(job_id)
+
+        return snapshot
+
+    def flush(self, db: Session, job_id: str):
+        """Write the current snapshot to the database immediately"""
+        snapshot = self.get(job_id)
+        if snapshot:
+            self.update(db, job_id, force=True)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Live snapshot of a running job, or None if it is not tracked in this process"""
+        with self._lock:
+            snapshot = self._jobs.get(job_id)
+            return dict(snapshot) if snapshot else None
+
+    def forget(self, job_id: str):
+        """Stop tracking a job (its final state lives in the database)"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._last_flush.pop(job_id, None)
+
+    def subscribe(self, job_id: str, callback: ProgressCallback) -> Callable[[], None]:
+        """
+        Call `callback(job_id, snapshot)` on every update of a job ("*" for all jobs)
+        Returns a function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers[job_id].append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers.get(job_id, []):
+                    self._subscribers[job_id].remove(callback)
+                    if not self._subscribers[job_id]:
+                        del self._subscribers[job_id]
+
+        return unsubscribe
+
+    def _publish(self, job_id: str, snapshot: Dict[str, Any]):
+        with self._lock:
+            callbacks = list(self._subscribers.get(job_id, [])) + list(self._subscribers.get("*", []))
+
+        for callback in callbacks:
+            try:
+                callback(job_id, snapshot)
+            except Exception as e:
+                print(f"Progress subscriber failed for job {job_id}: {e}")
+
+    def _write(self, db: Session, job_id: str, snapshot: Dict[str, Any]):
+        fields = {
+            key: value for key, value in snapshot.items()
+            if key not in ("job_id", "updated_at", "status", "progress")
+        }
+        try:
+            AutoLabelJobOperations.update_job_progress(
+                db, job_id,
+                status=snapshot.get("status"),
+                progress=snapshot.get("progress"),
+                **fields
+            )
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to write progress for job {job_id}: {e}")
+
+
+# Global progress tracker instance
+job_progress = JobProgressTracker()
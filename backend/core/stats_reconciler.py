@@ -0,0 +1,35 @@
+"""
+Background reconciliation of dataset counters
+Dataset image counters are maintained incrementally by the write paths; this
+task periodically recomputes them from the images table and fixes any drift
+(e.g. rows changed outside the operations layer).
+"""
+
+import asyncio
+from typing import Optional
+
+from core.config import settings
+from database.database import SessionLocal
+from database.operations import DatasetOperations
+
+
+def reconcile_dataset_stats(dataset_id: Optional[str] = None) -> int:
+    """Recompute dataset counters once (blocking); returns the number of datasets corrected"""
+    db = SessionLocal()
+    try:
+        return DatasetOperations.reconcile_dataset_stats(db, dataset_id)
+    finally:
+        db.close()
+
+
+async def reconcile_dataset_stats_periodically(interval_seconds: Optional[float] = None):
+    """Reconcile on startup and then every interval_seconds, off the event loop"""
+    interval = interval_seconds if interval_seconds is not None else settings.DATASET_STATS_RECONCILE_SECONDS
+    while True:
+        try:
+            corrected = await asyncio.to_thread(reconcile_dataset_stats)
+            if corrected:
+                print(f"Reconciled image counters of {corrected} dataset(s)")
+        except Exception as e:
+            print(f"Dataset stats reconciliation failed: {e}")
+        await asyncio.sleep(interval)
@@ -3,36 +3,36 @@ Database configuration and initialization
 """
 
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from core.config import settings
 from .base import Base
+from .engine import create_database_engine, create_async_database_engine
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Create database engines (pool sizing and SQLite pragmas from settings)
+engine = create_database_engine()
+async_engine = create_async_database_engine()
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit: lazy reloads would need IO outside the event loop's await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 async def init_db():
-    """Initialize database tables"""
-    # Import all models here to ensure they are registered
-    from .models import (
-        Project, Dataset, Image, Annotation, 
-        ModelUsage, ExportJob, AutoLabelJob
-    )
-    
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    print("Database initialized successfully")
-    
+    """Initialize database tables by applying pending schema migrations"""
     # Create directories if they don't exist
     os.makedirs(os.path.dirname(settings.DATABASE_PATH), exist_ok=True)
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     os.makedirs(settings.MODELS_DIR, exist_ok=True)
+    
+    from .migrations import run_migrations, pending_migrations
+    if settings.DATABASE_AUTO_MIGRATE:
+        run_migrations(engine)
+        print("Database initialized successfully")
+    else:
+        pending = pending_migrations(engine)
+        if pending:
+            print(f"Database schema is behind by {len(pending)} migration(s); run `python migrate.py`")
 
 def get_db():
     """Get database session"""
@@ -40,4 +40,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    Get async database session
+    Sync operations run on it with `await db.run_sync(Operations.method, ...)`,
+    so queries do not block the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
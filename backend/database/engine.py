@@ -0,0 +1,116 @@
+"""
+Database engine factory
+Builds the sync and async SQLAlchemy engines with a sized connection pool and,
+for SQLite, applies WAL journaling and tuned pragmas on every new connection so
+readers never block on the writer and concurrent writers wait instead of
+failing with "database is locked". PostgreSQL URLs use psycopg2 (sync) and
+asyncpg (async); SQLite uses aiosqlite for the async engine.
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from core.config import settings
+
+
+SQLITE_SYNCHRONOUS_MODES = ("off", "normal", "full", "extra")
+SQLITE_TEMP_STORE_MODES = ("default", "file", "memory")
+
+# Backend -> async driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record=None):
+    """Apply the SQLite pragmas from settings to a new DBAPI connection"""
+    synchronous = settings.SQLITE_SYNCHRONOUS.lower()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {settings.SQLITE_SYNCHRONOUS}")
+    temp_store = settings.SQLITE_TEMP_STORE.lower()
+    if temp_store not in SQLITE_TEMP_STORE_MODES:
+        raise ValueError(f"Invalid SQLITE_TEMP_STORE: {settings.SQLITE_TEMP_STORE}")
+
+    cursor = dbapi_connection.cursor()
+    try:
+        # busy_timeout first: switching the journal mode itself needs the lock
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if settings.SQLITE_WAL_ENABLED:
+            cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute(f"PRAGMA wal_autocheckpoint = {int(settings.SQLITE_WAL_AUTOCHECKPOINT)}")
+        cursor.execute(f"PRAGMA synchronous = {synchronous.upper()}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store = {temp_store.upper()}")
+    finally:
+        cursor.close()
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """
+    Async driver URL for a database URL (settings.ASYNC_DATABASE_URL, or
+    settings.DATABASE_URL with its driver swapped for aiosqlite/asyncpg)
+    """
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+
+    parsed = make_url(url or settings.DATABASE_URL)
+    if parsed.get_dialect().is_async:
+        return parsed.render_as_string(hide_password=False)
+
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for {parsed.get_backend_name()} databases; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_database_engine(url: Optional[str] = None) -> Engine:
+    """Create an engine for `url` (default settings.DATABASE_URL) with pool and pragma settings"""
+    url = url or settings.DATABASE_URL
+    engine = create_engine(url, **_engine_args(url))
+    if is_sqlite(url):
+        event.listen(engine, "connect", configure_sqlite_connection)
+    return engine
+
+
+def create_async_database_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create an async engine (default: derived from settings) with the same pool and pragma settings"""
+    url = async_database_url(url)
+    engine = create_async_engine(url, **_engine_args(url))
+    if is_sqlite(url):
+        event.listen(engine.sync_engine, "connect", configure_sqlite_connection)
+    return engine
+
+
+def _engine_args(url: str) -> Dict[str, Any]:
+    parsed = make_url(url)
+    engine_args = {"pool_pre_ping": settings.DATABASE_POOL_PRE_PING}
+
+    if is_sqlite(url):
+        engine_args["connect_args"] = {
+            "check_same_thread": False,
+            # sqlite3's own busy handler, in seconds (matches PRAGMA busy_timeout)
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000.0
+        }
+        in_memory = parsed.database in (None, "", ":memory:")
+    else:
+        in_memory = False
+
+    # In-memory SQLite keeps one connection per thread; pool sizing does not apply
+    if not in_memory:
+        engine_args.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE
+        )
+    return engine_args
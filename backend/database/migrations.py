@@ -0,0 +1,181 @@
+"""
+Schema migrations
+Versioned Alembic migrations live in backend/migrations/versions; this module
+runs them (on startup or from migrate.py) and provides the helpers revisions
+use to change large tables without long locks: idempotent column/index
+changes, online index builds and batched backfills.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+from .engine import create_database_engine
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ALEMBIC_INI = BACKEND_DIR / "alembic.ini"
+
+
+def alembic_config(engine: Optional[Engine] = None) -> Config:
+    """Alembic config for backend/migrations, bound to `engine` (default: settings.DATABASE_URL)"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.attributes["engine"] = engine
+    return config
+
+
+def run_migrations(engine: Optional[Engine] = None, revision: str = "head"):
+    """Upgrade the database to `revision`; databases created before migrations existed are upgraded in place"""
+    command.upgrade(alembic_config(engine), revision)
+
+
+def downgrade_migrations(revision: str, engine: Optional[Engine] = None):
+    """Downgrade the database to `revision`"""
+    command.downgrade(alembic_config(engine), revision)
+
+
+def current_revision(engine: Optional[Engine] = None) -> Optional[str]:
+    """Revision the database is at (None if it has never been migrated)"""
+    engine = engine or create_database_engine()
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def head_revision() -> str:
+    """Latest revision in backend/migrations/versions"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def pending_migrations(engine: Optional[Engine] = None) -> List[str]:
+    """Revisions not yet applied to the database, oldest first"""
+    script = ScriptDirectory.from_config(alembic_config())
+    current = current_revision(engine)
+    revisions = [revision.revision for revision in script.iterate_revisions("head", current)]
+    return list(reversed(revisions))
+
+
+# Helpers for revision scripts (they run inside an Alembic migration context)
+
+def has_table(table: str) -> bool:
+    return inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    return column in {col["name"] for col in inspect(op.get_bind()).get_columns(table)}
+
+
+def has_index(table: str, name: str) -> bool:
+    return name in {index["name"] for index in inspect(op.get_bind()).get_indexes(table)}
+
+
+def add_column_if_missing(table: str, column) -> bool:
+    """Add a column unless it exists (databases upgraded by the old ad-hoc scripts already have it)"""
+    if has_column(table, column.name):
+        return False
+    print(f"Adding {column.name} column to {table} table...")
+    op.add_column(table, column)
+    return True
+
+
+def create_index_online(name: str, table: str, columns: Sequence[str], unique: bool = False) -> bool:
+    """
+    Create an index unless it exists. On PostgreSQL it is built with CREATE
+    INDEX CONCURRENTLY outside the migration transaction, so writes to the
+    table continue during the build.
+    """
+    bind = op.get_bind()
+    postgresql = bind.dialect.name == "postgresql"
+    if postgresql and _drop_invalid_index(name):
+        print(f"Dropped invalid index {name} left by an interrupted build")
+
+    if has_index(table, name):
+        return False
+
+    print(f"Creating index {name} on {table} table...")
+    if postgresql:
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, list(columns), unique=unique, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, list(columns), unique=unique)
+    return True
+
+
+def drop_index_online(name: str, table: str) -> bool:
+    """Drop an index if it exists (DROP INDEX CONCURRENTLY on PostgreSQL)"""
+    if not has_index(table, name):
+        return False
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
+    return True
+
+
+def batched_update(
+    table: str,
+    assignments: str,
+    where: str,
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: Optional[int] = None,
+    key: str = "id"
+) -> int:
+    """
+    Backfill `UPDATE table SET assignments WHERE where` in batches of
+    batch_size rows, each committed on its own so the table is never locked
+    for the whole backfill. Batches walk the primary key `key`, so the cost is
+    linear in the table size. Returns the number of rows updated.
+    """
+    bind = op.get_bind()
+    params = dict(params or {})
+    batch_size = batch_size or settings.DATABASE_MIGRATION_BATCH_SIZE
+
+    total = bind.execute(text(f"SELECT COUNT(*) FROM {table} WHERE {where}"), params).scalar()
+    if not total:
+        return 0
+
+    select_batch = text(
+        f"SELECT {key} FROM {table} WHERE {key} > :_after AND ({where}) ORDER BY {key} LIMIT :_limit"
+    )
+    first_batch = text(f"SELECT {key} FROM {table} WHERE {where} ORDER BY {key} LIMIT :_limit")
+    update_batch = text(
+        f"UPDATE {table} SET {assignments} WHERE {key} IN :_keys AND ({where})"
+    ).bindparams(bindparam("_keys", expanding=True))
+
+    print(f"Backfilling {total} rows of {table} table...")
+    updated = 0
+    after = None
+    with op.get_context().autocommit_block():
+        while True:
+            if after is None:
+                keys = [row[0] for row in bind.execute(first_batch, {**params, "_limit": batch_size})]
+            else:
+                keys = [row[0] for row in bind.execute(select_batch, {**params, "_after": after, "_limit": batch_size})]
+            if not keys:
+                break
+
+            updated += bind.execute(update_batch, {**params, "_keys": keys}).rowcount
+            after = keys[-1]
+            print(f"  {table}: {updated}/{total} rows")
+            if len(keys) < batch_size:
+                break
+    return updated
+
+
+def _drop_invalid_index(name: str) -> bool:
+    """Drop a PostgreSQL index left INVALID by a failed CONCURRENTLY build"""
+    valid = op.get_bind().execute(text(
+        "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+    ), {"name": name}).scalar()
+    if valid is None or valid:
+        return False
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    return True
@@ -3,7 +3,7 @@ Database models for the Auto-Labeling Tool
 Defines all database tables and relationships
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -97,6 +97,16 @@ class Image(Base):
     # Relationships
     annotations = relationship("Annotation", back_populates="image", cascade="all, delete-orphan")
     
+    # Indexes matched to the query shapes in operations.py
+    __table_args__ = (
+        # Per-dataset keyset pages (dataset_id = ? AND id > ? ORDER BY id) and counts
+        Index("ix_images_dataset_id_id", "dataset_id", "id"),
+        # Labeled counts and labeled/unlabeled keyset pages
+        Index("ix_images_dataset_labeled", "dataset_id", "is_labeled", "id"),
+        # Split counts
+        Index("ix_images_dataset_split", "dataset_id", "split_type"),
+    )
+    
     def __repr__(self):
         return f"<Image(id='{self.id}', filename='{self.filename}')>"
 
@@ -106,7 +116,7 @@ class Annotation(Base):
     __tablename__ = "annotations"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    image_id = Column(String, ForeignKey("images.id"), nullable=False)
+    image_id = Column(String, ForeignKey("images.id"), nullable=False, index=True)
     
     # Annotation data
     class_name = Column(String(100), nullable=False)
@@ -160,6 +170,42 @@ class ModelUsage(Base):
         return f"<ModelUsage(model_id='{self.model_id}', inferences={self.total_inferences})>"
 
 
+class ModelBenchmark(Base):
+    """Inference benchmark of one model configuration within a benchmark run"""
+    __tablename__ = "model_benchmarks"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String, nullable=False, index=True)  # Rows of one benchmark run share a run id
+    model_id = Column(String, nullable=False, index=True)
+    model_name = Column(String(255), nullable=False)
+    model_format = Column(String(20), nullable=True)  # pytorch, onnx, tensorrt
+    
+    # Configuration
+    source = Column(String(20), nullable=False)  # synthetic, sample
+    batch_size = Column(Integer, nullable=False)
+    num_threads = Column(Integer, nullable=False)
+    iterations = Column(Integer, nullable=False)
+    num_images = Column(Integer, default=0)  # Size of the fixed image set
+    seed = Column(Integer, nullable=True)
+    
+    # Results
+    load_time = Column(Float, nullable=True)  # seconds
+    latency_mean = Column(Float, nullable=True)  # ms per batch
+    latency_p50 = Column(Float, nullable=True)
+    latency_p95 = Column(Float, nullable=True)
+    latency_p99 = Column(Float, nullable=True)
+    throughput = Column(Float, nullable=True)  # images per second
+    peak_rss_mb = Column(Float, nullable=True)
+    
+    # Library versions and host details (JSON)
+    environment = Column(JSON, nullable=True)
+    
+    created_at = Column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<ModelBenchmark(model_id='{self.model_id}', batch={self.batch_size}, p95={self.latency_p95})>"
+
+
 class ExportJob(Base):
     """Track export jobs and their status"""
     __tablename__ = "export_jobs"
@@ -197,16 +243,19 @@ class AutoLabelJob(Base):
     __tablename__ = "auto_label_jobs"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False)
+    dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False, index=True)
     model_id = Column(String, nullable=False)
     
     # Job configuration
     confidence_threshold = Column(Float, default=0.5)
     iou_threshold = Column(Float, default=0.45)
     overwrite_existing = Column(Boolean, default=False)
+    tile_size = Column(Integer, nullable=True)  # Tiled inference when set (pixels)
+    tile_overlap = Column(Float, default=0.2)
+    num_workers = Column(Integer, nullable=True)  # Execution mode: 0 = in-process, N = worker processes
     
     # Job status
-    status = Column(String(20), default="pending")  # pending, processing, completed, failed
+    status = Column(String(20), default="pending")  # pending, queued, processing, completed, failed
     progress = Column(Float, default=0.0)  # 0-100
     
     # Statistics
@@ -216,6 +265,14 @@ class AutoLabelJob(Base):
     failed_images = Column(Integer, default=0)
     total_annotations_created = Column(Integer, default=0)
     
+    # Resume checkpoint (high-water mark): images with id <= checkpoint are done
+    checkpoint_image_id = Column(String, nullable=True)
+    
+    # Lease: the process running the job renews last_progress_at with every batch;
+    # other processes only take the job over once the lease has gone stale
+    owner_id = Column(String(100), nullable=True)
+    last_progress_at = Column(DateTime, nullable=True)
+    
     # Error handling
     error_message = Column(Text, nullable=True)
     
@@ -224,10 +281,44 @@ class AutoLabelJob(Base):
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
+    # Orphaned job lookup on startup (status IN (...) ORDER BY created_at)
+    __table_args__ = (
+        Index("ix_auto_label_jobs_status_created", "status", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<AutoLabelJob(id='{self.id}', dataset='{self.dataset_id}', status='{self.status}')>"
 
 
+class AutoLabelShard(Base):
+    """Slice of an auto-labeling job's images, claimed by one worker process at a time"""
+    __tablename__ = "auto_label_shards"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String, ForeignKey("auto_label_jobs.id"), nullable=False, index=True)
+    shard_index = Column(Integer, nullable=False)
+    
+    # Image id range (keyset bounds): after_image_id < Image.id <= last_image_id
+    after_image_id = Column(String, nullable=True)  # None = start of dataset
+    last_image_id = Column(String, nullable=False)
+    image_count = Column(Integer, default=0)
+    
+    # Resume checkpoint (high-water mark) within the shard's range
+    checkpoint_image_id = Column(String, nullable=True)
+    
+    # Claim status
+    status = Column(String(20), default="pending")  # pending, processing, completed, failed
+    worker_id = Column(String(100), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=func.now())
+    claimed_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<AutoLabelShard(job='{self.job_id}', index={self.shard_index}, status='{self.status}')>"
+
+
 class DataAugmentation(Base):
     """Data augmentation configuration and jobs"""
     __tablename__ = "data_augmentations"
@@ -4,16 +4,16 @@ CRUD operations for all models
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from sqlalchemy import and_, or_, func, desc, case, insert, update, delete
+from typing import List, Optional, Dict, Any, Iterator
+from datetime import datetime, timedelta
 import uuid
 import os
 from pathlib import Path
 
 from .models import (
     Project, Dataset, Image, Annotation, 
-    ModelUsage, ExportJob, AutoLabelJob,
+    ModelUsage, ModelBenchmark, ExportJob, AutoLabelJob, AutoLabelShard,
     DataAugmentation, DatasetSplit, LabelAnalytics
 )
 from core.config import settings
@@ -129,7 +129,16 @@ class DatasetOperations:
     
     @staticmethod
     def update_dataset_stats(db: Session, dataset_id: str):
-        """Update dataset statistics"""
+        """Recompute dataset statistics from the images table (full count)"""
+        dataset = DatasetOperations._recompute_dataset_stats(db, dataset_id)
+        if dataset:
+            db.commit()
+            db.refresh(dataset)
+        return dataset
+    
+    @staticmethod
+    def _recompute_dataset_stats(db: Session, dataset_id: str) -> Optional[Dataset]:
+        """Recompute dataset statistics in the current transaction (no commit)"""
         dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
         if dataset:
             total_images = db.query(func.count(Image.id)).filter(Image.dataset_id == dataset_id).scalar()
@@ -141,10 +150,57 @@ class DatasetOperations:
             dataset.labeled_images = labeled_images
             dataset.unlabeled_images = total_images - labeled_images
             dataset.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(dataset)
         return dataset
     
+    @staticmethod
+    def _apply_stats_delta(db: Session, dataset_id: str, total: int = 0, labeled: int = 0):
+        """
+        Adjust dataset counters by a delta in the current transaction (no commit)
+        The UPDATE is relative (total_images = total_images + n), so concurrent
+        writers never overwrite each other's counts.
+        """
+        if not total and not labeled:
+            return
+        db.query(Dataset).filter(Dataset.id == dataset_id).update(
+            {
+                Dataset.total_images: func.coalesce(Dataset.total_images, 0) + total,
+                Dataset.labeled_images: func.coalesce(Dataset.labeled_images, 0) + labeled,
+                Dataset.unlabeled_images: func.coalesce(Dataset.unlabeled_images, 0) + (total - labeled),
+                Dataset.updated_at: datetime.utcnow()
+            },
+            synchronize_session=False
+        )
+    
+    @staticmethod
+    def reconcile_dataset_stats(db: Session, dataset_id: str = None) -> int:
+        """
+        Recompute counters of every dataset (or one) with a single grouped query
+        and fix the ones that drifted. Returns the number of datasets corrected.
+        """
+        counts = db.query(
+            Image.dataset_id,
+            func.count(Image.id),
+            func.sum(case((Image.is_labeled == True, 1), else_=0))
+        ).group_by(Image.dataset_id)
+        datasets = db.query(Dataset)
+        if dataset_id is not None:
+            counts = counts.filter(Image.dataset_id == dataset_id)
+            datasets = datasets.filter(Dataset.id == dataset_id)
+        actual = {row[0]: (row[1], int(row[2] or 0)) for row in counts.all()}
+        
+        corrected = 0
+        for dataset in datasets.all():
+            total_images, labeled_images = actual.get(dataset.id, (0, 0))
+            if (dataset.total_images, dataset.labeled_images, dataset.unlabeled_images) != \
+                    (total_images, labeled_images, total_images - labeled_images):
+                dataset.total_images = total_images
+                dataset.labeled_images = labeled_images
+                dataset.unlabeled_images = total_images - labeled_images
+                corrected += 1
+        
+        db.commit()
+        return corrected
+    
     @staticmethod
     def update_dataset(
         db: Session,
@@ -218,11 +274,11 @@ class ImageOperations:
             format=format
         )
         db.add(image)
+        
+        # Update dataset stats in the same transaction
+        DatasetOperations._apply_stats_delta(db, dataset_id, total=1, labeled=1 if image.is_labeled else 0)
         db.commit()
         db.refresh(image)
-        
-        # Update dataset stats
-        DatasetOperations.update_dataset_stats(db, dataset_id)
         return image
     
     @staticmethod
@@ -246,6 +302,88 @@ class ImageOperations:
         
         return query.offset(skip).limit(limit).all()
     
+    @staticmethod
+    def iter_images_by_dataset(
+        db: Session,
+        dataset_id: str,
+        chunk_size: int = 500,
+        labeled_only: bool = None,
+        after_id: str = None,
+        until_id: str = None
+    ) -> Iterator[List[Image]]:
+        """
+        Stream a dataset's images in primary-key order, one chunk at a time
+        Uses keyset pagination (id > last seen id), so every image is visited
+        exactly once and only one chunk of ORM objects is loaded at a time.
+        after_id/until_id optionally bound the range (after_id < id <= until_id)
+        """
+        last_id = after_id
+        while True:
+            query = db.query(Image).filter(Image.dataset_id == dataset_id)
+            
+            if labeled_only is not None:
+                query = query.filter(Image.is_labeled == labeled_only)
+            if last_id is not None:
+                query = query.filter(Image.id > last_id)
+            if until_id is not None:
+                query = query.filter(Image.id <= until_id)
+            
+            chunk = query.order_by(Image.id).limit(chunk_size).all()
+            if not chunk:
+                return
+            
+            last_id = chunk[-1].id
+            yield chunk
+            
+            if len(chunk) < chunk_size:
+                return
+    
+    @staticmethod
+    def sample_image_paths(
+        db: Session,
+        project_id: str = None,
+        dataset_id: str = None,
+        limit: int = 50
+    ) -> List[str]:
+        """File paths of up to `limit` images of a project or dataset (stable sample in id order)"""
+        query = db.query(Image.file_path)
+        
+        if dataset_id is not None:
+            query = query.filter(Image.dataset_id == dataset_id)
+        elif project_id is not None:
+            query = query.join(Dataset, Dataset.id == Image.dataset_id).filter(Dataset.project_id == project_id)
+        
+        return [row[0] for row in query.order_by(Image.id).limit(limit).all()]
+    
+    @staticmethod
+    def count_images_by_dataset(
+        db: Session,
+        dataset_id: str,
+        labeled_only: bool = None,
+        after_id: str = None
+    ) -> int:
+        """Count images in a dataset with the same filters as iter_images_by_dataset"""
+        query = db.query(func.count(Image.id)).filter(Image.dataset_id == dataset_id)
+        
+        if labeled_only is not None:
+            query = query.filter(Image.is_labeled == labeled_only)
+        if after_id is not None:
+            query = query.filter(Image.id > after_id)
+        
+        return query.scalar()
+    
+    @staticmethod
+    def count_images_by_split(db: Session, dataset_id: str) -> Dict[str, int]:
+        """Image count per split of a dataset (one grouped query on the split index)"""
+        counts = {"train": 0, "val": 0, "test": 0, "unassigned": 0}
+        rows = db.query(Image.split_type, func.count(Image.id)).filter(
+            Image.dataset_id == dataset_id
+        ).group_by(Image.split_type).all()
+        for split_type, count in rows:
+            if split_type in counts:
+                counts[split_type] = count
+        return counts
+    
     @staticmethod
     def update_image_status(
         db: Session, 
@@ -257,21 +395,30 @@ class ImageOperations:
         """Update image labeling status"""
         image = db.query(Image).filter(Image.id == image_id).first()
         if image:
-            if is_labeled is not None:
-                image.is_labeled = is_labeled
-            if is_auto_labeled is not None:
-                image.is_auto_labeled = is_auto_labeled
-            if is_verified is not None:
-                image.is_verified = is_verified
-            
-            image.updated_at = datetime.utcnow()
+            ImageOperations._set_image_status(db, image, is_labeled, is_auto_labeled, is_verified)
             db.commit()
             db.refresh(image)
-            
-            # Update dataset stats
-            DatasetOperations.update_dataset_stats(db, image.dataset_id)
         return image
     
+    @staticmethod
+    def _set_image_status(
+        db: Session,
+        image: Image,
+        is_labeled: bool = None,
+        is_auto_labeled: bool = None,
+        is_verified: bool = None
+    ):
+        """Set image status flags and adjust dataset counters (no commit)"""
+        if is_labeled is not None and bool(image.is_labeled) != is_labeled:
+            DatasetOperations._apply_stats_delta(db, image.dataset_id, labeled=1 if is_labeled else -1)
+            image.is_labeled = is_labeled
+        if is_auto_labeled is not None:
+            image.is_auto_labeled = is_auto_labeled
+        if is_verified is not None:
+            image.is_verified = is_verified
+        
+        image.updated_at = datetime.utcnow()
+    
     @staticmethod
     def update_image_split(db: Session, image_id: str, split_type: str) -> bool:
         """Update image split assignment"""
@@ -338,13 +485,119 @@ class AnnotationOperations:
             model_id=model_id
         )
         db.add(annotation)
+        
+        # Update image status (and dataset stats) in the same transaction
+        image = db.query(Image).filter(Image.id == image_id).first()
+        if image:
+            ImageOperations._set_image_status(db, image, is_labeled=True)
         db.commit()
         db.refresh(annotation)
-        
-        # Update image status
-        ImageOperations.update_image_status(db, image_id, is_labeled=True)
         return annotation
     
+    @staticmethod
+    def bulk_create_annotations(
+        db: Session,
+        annotations_by_image: Dict[str, List[Dict[str, Any]]],
+        replace_existing: bool = False,
+        is_auto_generated: bool = False,
+        model_id: str = None,
+        is_auto_labeled: bool = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Write annotations for a batch of images in a single transaction
+        
+        annotations_by_image maps image_id to a list of annotation dicts with
+        class_name, class_id, x_min, y_min, x_max, y_max and optionally
+        confidence and segmentation. Image labeling status is updated for every
+        image in the batch and dataset stats are adjusted by the number of images
+        whose labeled flag actually changed.
+        
+        Returns the inserted annotation rows (including their generated ids)
+        """
+        image_ids = list(annotations_by_image.keys())
+        if not image_ids:
+            return []
+        
+        now = datetime.utcnow()
+        rows = []
+        for image_id, annotations in annotations_by_image.items():
+            for ann in annotations:
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "image_id": image_id,
+                    "class_name": ann["class_name"],
+                    "class_id": ann["class_id"],
+                    "x_min": ann["x_min"],
+                    "y_min": ann["y_min"],
+                    "x_max": ann["x_max"],
+                    "y_max": ann["y_max"],
+                    "confidence": ann.get("confidence", 1.0),
+                    "segmentation": ann.get("segmentation"),
+                    "is_auto_generated": is_auto_generated,
+                    "model_id": model_id,
+                    "created_at": now,
+                    "updated_at": now
+                })
+        
+        labeled_ids = [image_id for image_id, anns in annotations_by_image.items() if anns]
+        empty_ids = [image_id for image_id, anns in annotations_by_image.items() if not anns]
+        
+        try:
+            if replace_existing:
+                db.execute(
+                    delete(Annotation).where(Annotation.image_id.in_(image_ids)),
+                    execution_options={"synchronize_session": False}
+                )
+            
+            if rows:
+                db.execute(insert(Annotation), rows)
+            
+            status_values = {"updated_at": now}
+            if is_auto_labeled is not None:
+                status_values["is_auto_labeled"] = is_auto_labeled
+            
+            dataset_ids = [
+                row[0] for row in
+                db.query(Image.dataset_id).filter(Image.id.in_(image_ids)).distinct().all()
+            ]
+            
+            # Flip labeled flags with conditional UPDATEs: the row counts are exactly
+            # the counter deltas, even with concurrent writers
+            for dataset_id in dataset_ids:
+                labeled = 0
+                if labeled_ids:
+                    labeled += db.execute(
+                        update(Image).where(
+                            Image.id.in_(labeled_ids),
+                            Image.dataset_id == dataset_id,
+                            Image.is_labeled.isnot(True)
+                        ).values(is_labeled=True),
+                        execution_options={"synchronize_session": False}
+                    ).rowcount
+                if empty_ids and replace_existing:
+                    # Images left without annotations are only unlabeled when replacing
+                    labeled -= db.execute(
+                        update(Image).where(
+                            Image.id.in_(empty_ids),
+                            Image.dataset_id == dataset_id,
+                            Image.is_labeled == True
+                        ).values(is_labeled=False),
+                        execution_options={"synchronize_session": False}
+                    ).rowcount
+                DatasetOperations._apply_stats_delta(db, dataset_id, labeled=labeled)
+            
+            db.execute(
+                update(Image).where(Image.id.in_(image_ids)).values(**status_values),
+                execution_options={"synchronize_session": False}
+            )
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        return rows
+    
     @staticmethod
     def get_annotations_by_image(db: Session, image_id: str) -> List[Annotation]:
         """Get all annotations for an image"""
@@ -353,12 +606,13 @@ class AnnotationOperations:
     @staticmethod
     def delete_annotations_by_image(db: Session, image_id: str) -> int:
         """Delete all annotations for an image"""
-        count = db.query(Annotation).filter(Annotation.image_id == image_id).count()
-        db.query(Annotation).filter(Annotation.image_id == image_id).delete()
-        db.commit()
+        count = db.query(Annotation).filter(Annotation.image_id == image_id).delete()
         
-        # Update image status
-        ImageOperations.update_image_status(db, image_id, is_labeled=False)
+        # Update image status (and dataset stats) in the same transaction
+        image = db.query(Image).filter(Image.id == image_id).first()
+        if image:
+            ImageOperations._set_image_status(db, image, is_labeled=False)
+        db.commit()
         return count
     
     @staticmethod
@@ -385,15 +639,20 @@ class AutoLabelJobOperations:
         model_id: str,
         confidence_threshold: float = 0.5,
         iou_threshold: float = 0.45,
-        overwrite_existing: bool = False
+        overwrite_existing: bool = False,
+        tile_size: Optional[int] = None,
+        tile_overlap: float = 0.2
     ) -> AutoLabelJob:
-        """Create a new auto-labeling job"""
+        """Create a new auto-labeling job (its lease starts fresh until a process acquires it)"""
         job = AutoLabelJob(
             dataset_id=dataset_id,
             model_id=model_id,
             confidence_threshold=confidence_threshold,
             iou_threshold=iou_threshold,
-            overwrite_existing=overwrite_existing
+            overwrite_existing=overwrite_existing,
+            tile_size=tile_size,
+            tile_overlap=tile_overlap,
+            last_progress_at=datetime.utcnow()
         )
         db.add(job)
         db.commit()
@@ -435,6 +694,258 @@ class AutoLabelJobOperations:
         return job
 
 
+    @staticmethod
+    def acquire_job_lease(db: Session, job_id: str, owner_id: str) -> bool:
+        """
+        Take ownership of a job that has no owner or is already owned by owner_id
+        and renew its lease. False if another process owns the job.
+        """
+        updated = db.execute(
+            update(AutoLabelJob).where(and_(
+                AutoLabelJob.id == job_id,
+                or_(AutoLabelJob.owner_id.is_(None), AutoLabelJob.owner_id == owner_id)
+            )).values(owner_id=owner_id, last_progress_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        db.commit()
+        return bool(updated)
+
+    @staticmethod
+    def stage_checkpoint(
+        db: Session,
+        job_id: str,
+        checkpoint_image_id: str,
+        shard_id: str = None,
+        owner_id: str = None,
+        **counters
+    ) -> bool:
+        """
+        Record a job's resume checkpoint and counters and renew its lease in the
+        current transaction. Not committed here: it is committed together with
+        the batch it covers. With owner_id, nothing is written (and False is
+        returned) if the job has been taken over by another process.
+        """
+        condition = AutoLabelJob.id == job_id
+        if owner_id is not None:
+            condition = and_(condition, AutoLabelJob.owner_id == owner_id)
+        updated = db.execute(
+            update(AutoLabelJob).where(condition).values(
+                **({} if shard_id else {"checkpoint_image_id": checkpoint_image_id}),
+                last_progress_at=datetime.utcnow(),
+                **counters
+            ),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        if not updated:
+            return False
+        if shard_id:
+            db.execute(
+                update(AutoLabelShard).where(AutoLabelShard.id == shard_id).values(
+                    checkpoint_image_id=checkpoint_image_id
+                ),
+                execution_options={"synchronize_session": False}
+            )
+        return True
+    
+    @staticmethod
+    def get_unfinished_job_owners(db: Session) -> List[str]:
+        """Distinct owner ids of unfinished jobs"""
+        rows = db.query(AutoLabelJob.owner_id).filter(and_(
+            AutoLabelJob.status.in_(["pending", "queued", "processing"]),
+            AutoLabelJob.owner_id.isnot(None)
+        )).distinct().all()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def claim_orphaned_jobs(
+        db: Session,
+        owner_id: str = None,
+        lease_seconds: float = None,
+        dead_owner_ids: List[str] = None
+    ) -> List[str]:
+        """
+        Claim unfinished jobs whose lease has gone stale (their process died)
+        Jobs owned by dead_owner_ids (processes known to have exited) are
+        claimed at once; jobs still making progress in another process are
+        left alone, as are jobs already owned by owner_id. Each orphaned job is
+        moved to "queued" under owner_id with a conditional UPDATE that
+        re-checks the condition, so only one process takes it over.
+        Returns the claimed job ids.
+        """
+        lease_seconds = settings.AUTO_LABEL_JOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        unfinished = AutoLabelJob.status.in_(["pending", "queued", "processing"])
+        orphaned = or_(
+            AutoLabelJob.last_progress_at.is_(None),
+            AutoLabelJob.last_progress_at < datetime.utcnow() - timedelta(seconds=lease_seconds),
+            AutoLabelJob.owner_id.in_(dead_owner_ids or [])
+        )
+        condition = and_(unfinished, orphaned)
+        if owner_id is not None:
+            condition = and_(condition, or_(AutoLabelJob.owner_id.is_(None), AutoLabelJob.owner_id != owner_id))
+
+        candidates = [
+            row[0] for row in db.query(AutoLabelJob.id).filter(condition).order_by(AutoLabelJob.created_at).all()
+        ]
+        
+        claimed = []
+        for job_id in candidates:
+            updated = db.query(AutoLabelJob).filter(
+                and_(AutoLabelJob.id == job_id, condition)
+            ).update(
+                {"status": "queued", "owner_id": owner_id, "last_progress_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            if updated:
+                claimed.append(job_id)
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def claim_job_for_resume(
+        db: Session,
+        job_id: str,
+        owner_id: str,
+        lease_seconds: float = None,
+        dead_owner_ids: List[str] = None
+    ) -> bool:
+        """
+        Claim one unfinished or failed job so it can be resumed
+        False if the job is completed or still running under a live lease in
+        another process.
+        """
+        lease_seconds = settings.AUTO_LABEL_JOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        updated = db.query(AutoLabelJob).filter(and_(
+            AutoLabelJob.id == job_id,
+            AutoLabelJob.status != "completed",
+            or_(
+                AutoLabelJob.status == "failed",
+                AutoLabelJob.owner_id.is_(None),
+                AutoLabelJob.owner_id.in_(dead_owner_ids or []),
+                AutoLabelJob.last_progress_at.is_(None),
+                AutoLabelJob.last_progress_at < datetime.utcnow() - timedelta(seconds=lease_seconds)
+            )
+        )).update(
+            {"status": "queued", "owner_id": owner_id, "last_progress_at": datetime.utcnow(), "error_message": None},
+            synchronize_session=False
+        )
+        db.commit()
+        return bool(updated)
+
+
+class AutoLabelShardOperations:
+    """Operations for the auto-labeling shard queue"""
+    
+    @staticmethod
+    def create_shards(
+        db: Session,
+        job_id: str,
+        dataset_id: str,
+        shard_size: int = 1000,
+        labeled_only: bool = None,
+        after_id: str = None
+    ) -> List[AutoLabelShard]:
+        """Split a job's images (after the after_id checkpoint, if set) into id-range shards of at most shard_size images"""
+        shards = []
+        while True:
+            query = db.query(Image.id).filter(Image.dataset_id == dataset_id)
+            if labeled_only is not None:
+                query = query.filter(Image.is_labeled == labeled_only)
+            if after_id is not None:
+                query = query.filter(Image.id > after_id)
+            
+            ids = [row[0] for row in query.order_by(Image.id).limit(shard_size).all()]
+            if not ids:
+                break
+            
+            shard = AutoLabelShard(
+                job_id=job_id,
+                shard_index=len(shards),
+                after_image_id=after_id,
+                last_image_id=ids[-1],
+                image_count=len(ids)
+            )
+            db.add(shard)
+            shards.append(shard)
+            after_id = ids[-1]
+        
+        db.commit()
+        return shards
+    
+    @staticmethod
+    def claim_next_shard(db: Session, job_id: str, worker_id: str) -> Optional[AutoLabelShard]:
+        """
+        Atomically claim the next pending shard of a job
+        The conditional UPDATE only succeeds for one worker, so shards are never shared
+        """
+        while True:
+            candidate = db.query(AutoLabelShard.id).filter(
+                and_(AutoLabelShard.job_id == job_id, AutoLabelShard.status == "pending")
+            ).order_by(AutoLabelShard.shard_index).first()
+            if not candidate:
+                return None
+            
+            claimed = db.query(AutoLabelShard).filter(
+                and_(AutoLabelShard.id == candidate[0], AutoLabelShard.status == "pending")
+            ).update(
+                {"status": "processing", "worker_id": worker_id, "claimed_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+            
+            if claimed:
+                return db.query(AutoLabelShard).filter(AutoLabelShard.id == candidate[0]).first()
+    
+    @staticmethod
+    def complete_shard(db: Session, shard_id: str, status: str = "completed") -> Optional[AutoLabelShard]:
+        """Mark a shard as finished"""
+        shard = db.query(AutoLabelShard).filter(AutoLabelShard.id == shard_id).first()
+        if shard:
+            shard.status = status
+            shard.completed_at = datetime.utcnow()
+            db.commit()
+        return shard
+    
+    @staticmethod
+    def requeue_unfinished_shards(db: Session, job_id: str) -> int:
+        """Put shards abandoned mid-run back in the queue (their checkpoints are kept)"""
+        count = db.query(AutoLabelShard).filter(
+            and_(AutoLabelShard.job_id == job_id, AutoLabelShard.status.in_(["processing", "failed"]))
+        ).update({"status": "pending", "worker_id": None}, synchronize_session=False)
+        db.commit()
+        return count
+    
+    @staticmethod
+    def count_unprocessed_images(
+        db: Session,
+        job_id: str,
+        dataset_id: str,
+        labeled_only: bool = None
+    ) -> int:
+        """Images of a job's unfinished shards that lie past their checkpoints"""
+        total = 0
+        shards = db.query(AutoLabelShard).filter(
+            and_(AutoLabelShard.job_id == job_id, AutoLabelShard.status != "completed")
+        ).all()
+        for shard in shards:
+            query = db.query(func.count(Image.id)).filter(
+                and_(Image.dataset_id == dataset_id, Image.id <= shard.last_image_id)
+            )
+            after_id = shard.checkpoint_image_id or shard.after_image_id
+            if after_id is not None:
+                query = query.filter(Image.id > after_id)
+            if labeled_only is not None:
+                query = query.filter(Image.is_labeled == labeled_only)
+            total += query.scalar()
+        return total
+    
+    @staticmethod
+    def get_shards(db: Session, job_id: str) -> List[AutoLabelShard]:
+        """Get all shards of a job"""
+        return db.query(AutoLabelShard).filter(
+            AutoLabelShard.job_id == job_id
+        ).order_by(AutoLabelShard.shard_index).all()
+
+
 class ModelUsageOperations:
     """CRUD operations for ModelUsage model"""
     
@@ -489,6 +1000,55 @@ class ModelUsageOperations:
         return db.query(ModelUsage).order_by(desc(ModelUsage.last_used)).all()
 
 
+class ModelBenchmarkOperations:
+    """CRUD operations for ModelBenchmark model"""
+    
+    @staticmethod
+    def create_benchmark(db: Session, **fields) -> ModelBenchmark:
+        """Store one benchmark result row"""
+        benchmark = ModelBenchmark(**fields)
+        db.add(benchmark)
+        db.commit()
+        db.refresh(benchmark)
+        return benchmark
+    
+    @staticmethod
+    def get_benchmarks_by_model(db: Session, model_id: str, limit: int = 100) -> List[ModelBenchmark]:
+        """Most recent benchmark rows of a model"""
+        return db.query(ModelBenchmark).filter(
+            ModelBenchmark.model_id == model_id
+        ).order_by(desc(ModelBenchmark.created_at)).limit(limit).all()
+    
+    @staticmethod
+    def get_benchmark_run(db: Session, run_id: str) -> List[ModelBenchmark]:
+        """All rows of one benchmark run"""
+        return db.query(ModelBenchmark).filter(
+            ModelBenchmark.run_id == run_id
+        ).order_by(
+            ModelBenchmark.model_id, ModelBenchmark.num_threads,
+            ModelBenchmark.batch_size, ModelBenchmark.source
+        ).all()
+    
+    @staticmethod
+    def get_benchmark_runs(db: Session, limit: int = 50) -> List[Dict[str, Any]]:
+        """Summary of the most recent benchmark runs"""
+        rows = db.query(
+            ModelBenchmark.run_id,
+            func.min(ModelBenchmark.created_at).label("created_at"),
+            func.count(ModelBenchmark.id).label("results"),
+            func.count(func.distinct(ModelBenchmark.model_id)).label("models")
+        ).group_by(ModelBenchmark.run_id).order_by(desc("created_at")).limit(limit).all()
+        return [
+            {
+                "run_id": row.run_id,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "results": row.results,
+                "models": row.models
+            }
+            for row in rows
+        ]
+
+
 class DataAugmentationOperations:
     """CRUD operations for DataAugmentation model"""
     
@@ -676,6 +1236,9 @@ def get_annotations_by_images(db: Session, image_ids: List[str]) -> List[Annotat
 def get_annotations_by_dataset(db: Session, dataset_id: str) -> List[Annotation]:
     return ImageOperations.get_annotations_by_dataset(db, dataset_id)
 
+def count_images_by_split(db: Session, dataset_id: str) -> Dict[str, int]:
+    return ImageOperations.count_images_by_split(db, dataset_id)
+
 # Convenience functions for existing operations (avoiding circular imports)
 def get_dataset(db: Session, dataset_id: str):
     return DatasetOperations.get_dataset(db, dataset_id)
@@ -4,6 +4,7 @@ Main FastAPI application for Auto-Labeling-Tool
 
 import os
 import sys
+import asyncio
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -91,6 +92,22 @@ async def root():
 async def startup_event():
     """Initialize database and create tables"""
     await init_db()
+    
+    # Resume auto-labeling jobs interrupted by a previous shutdown, and keep
+    # sweeping for jobs whose process dies later
+    if settings.AUTO_LABEL_RESUME_ON_STARTUP:
+        from core.auto_labeler import auto_labeler
+        asyncio.create_task(auto_labeler.resume_orphaned_jobs_periodically())
+    
+    # Dataset counters are maintained incrementally; periodically fix any drift
+    if settings.DATASET_STATS_RECONCILE_SECONDS > 0:
+        from core.stats_reconciler import reconcile_dataset_stats_periodically
+        asyncio.create_task(reconcile_dataset_stats_periodically())
+    
+    # Preload and warm frequently used models in the background
+    if settings.MODEL_WARMUP_IDS:
+        from models.warmup import model_warmer
+        asyncio.create_task(model_warmer.warm_models())
 
 if __name__ == "__main__":
     # Run the application
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Apply or inspect the database schema migrations (backend/migrations)
+
+Usage:
+    python migrate.py [upgrade [REVISION]]    apply pending migrations (default: to head)
+    python migrate.py downgrade REVISION      revert to REVISION (e.g. -1, 0003, base)
+    python migrate.py current                 show the applied and pending revisions
+    python migrate.py history                 list all revisions
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from database.migrations import (
+    alembic_config, run_migrations, downgrade_migrations,
+    current_revision, head_revision, pending_migrations
+)
+
+def migrate(args):
+    """Run the requested migration command"""
+    try:
+        if args.command == "upgrade":
+            run_migrations(revision=args.revision or "head")
+        elif args.command == "downgrade":
+            if not args.revision:
+                print("downgrade needs a target revision")
+                return False
+            downgrade_migrations(args.revision)
+        elif args.command == "current":
+            print(f"Current revision: {current_revision() or 'none'} (head: {head_revision()})")
+            pending = pending_migrations()
+            print(f"Pending migrations: {', '.join(pending) if pending else 'none'}")
+        elif args.command == "history":
+            command.history(alembic_config())
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "downgrade", "current", "history"])
+    parser.add_argument("revision", nargs="?", help="Target revision")
+
+    print("Starting database migration...")
+    if migrate(parser.parse_args()):
+        print("Migration completed successfully!")
+    else:
+        print("Migration failed!")
+        sys.exit(1)
@@ -0,0 +1,50 @@
+"""
+Alembic environment
+Runs the revisions against settings.DATABASE_URL (or the engine passed by
+database.migrations.run_migrations), one transaction per revision so a
+failure keeps every revision before it applied.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import context
+
+from core.config import settings
+from database.base import Base
+from database.engine import create_database_engine, is_sqlite
+
+# Register every table with the metadata (used by `alembic revision --autogenerate`)
+import database.models  # noqa: F401
+import models.training  # noqa: F401
+
+target_metadata = Base.metadata
+
+
+def print_applied(ctx, step, heads, run_args):
+    action = "Applied" if step.is_upgrade else "Reverted"
+    print(f"{action} migration {step.up_revision_id}: {step.up_revision.doc}")
+
+
+def run_migrations_online():
+    engine = context.config.attributes.get("engine") or create_database_engine(settings.DATABASE_URL)
+
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+            # SQLite cannot ALTER most constraints; batch operations recreate the table
+            render_as_batch=is_sqlite(str(engine.url)),
+            on_version_apply=print_applied
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    raise RuntimeError("Offline (--sql) migrations are not supported: revisions inspect the live schema")
+
+run_migrations_online()
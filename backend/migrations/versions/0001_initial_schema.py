@@ -0,0 +1,392 @@
+"""Initial schema
+
+The schema create_all built before versioned migrations. Tables that already
+exist are left alone, so databases created before migrations are adopted
+in place.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.migrations import has_table
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# In dependency order
+TABLES = [
+    "projects",
+    "datasets",
+    "images",
+    "annotations",
+    "model_usage",
+    "model_benchmarks",
+    "export_jobs",
+    "auto_label_jobs",
+    "auto_label_shards",
+    "data_augmentations",
+    "dataset_splits",
+    "label_analytics",
+    "training_sessions",
+    "training_iterations",
+    "model_versions",
+    "uncertain_samples"
+]
+
+
+def upgrade():
+    if not has_table("projects"):
+        op.create_table('projects',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('default_model_id', sa.String(), nullable=True),
+            sa.Column('confidence_threshold', sa.Float(), nullable=True),
+            sa.Column('iou_threshold', sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("datasets"):
+        op.create_table('datasets',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('total_images', sa.Integer(), nullable=True),
+            sa.Column('labeled_images', sa.Integer(), nullable=True),
+            sa.Column('unlabeled_images', sa.Integer(), nullable=True),
+            sa.Column('auto_label_enabled', sa.Boolean(), nullable=True),
+            sa.Column('model_id', sa.String(), nullable=True),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("images"):
+        op.create_table('images',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('filename', sa.String(length=255), nullable=False),
+            sa.Column('original_filename', sa.String(length=255), nullable=False),
+            sa.Column('file_path', sa.String(length=500), nullable=False),
+            sa.Column('file_size', sa.Integer(), nullable=True),
+            sa.Column('width', sa.Integer(), nullable=True),
+            sa.Column('height', sa.Integer(), nullable=True),
+            sa.Column('format', sa.String(length=10), nullable=True),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('is_labeled', sa.Boolean(), nullable=True),
+            sa.Column('is_auto_labeled', sa.Boolean(), nullable=True),
+            sa.Column('is_verified', sa.Boolean(), nullable=True),
+            sa.Column('split_type', sa.String(length=10), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("annotations"):
+        op.create_table('annotations',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('image_id', sa.String(), nullable=False),
+            sa.Column('class_name', sa.String(length=100), nullable=False),
+            sa.Column('class_id', sa.Integer(), nullable=False),
+            sa.Column('confidence', sa.Float(), nullable=True),
+            sa.Column('x_min', sa.Float(), nullable=False),
+            sa.Column('y_min', sa.Float(), nullable=False),
+            sa.Column('x_max', sa.Float(), nullable=False),
+            sa.Column('y_max', sa.Float(), nullable=False),
+            sa.Column('segmentation', sa.JSON(), nullable=True),
+            sa.Column('is_auto_generated', sa.Boolean(), nullable=True),
+            sa.Column('is_verified', sa.Boolean(), nullable=True),
+            sa.Column('model_id', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['image_id'], ['images.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("model_usage"):
+        op.create_table('model_usage',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('model_id', sa.String(), nullable=False),
+            sa.Column('model_name', sa.String(length=255), nullable=False),
+            sa.Column('total_inferences', sa.Integer(), nullable=True),
+            sa.Column('total_images_processed', sa.Integer(), nullable=True),
+            sa.Column('average_confidence', sa.Float(), nullable=True),
+            sa.Column('average_processing_time', sa.Float(), nullable=True),
+            sa.Column('last_used', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("model_benchmarks"):
+        op.create_table('model_benchmarks',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('run_id', sa.String(), nullable=False),
+            sa.Column('model_id', sa.String(), nullable=False),
+            sa.Column('model_name', sa.String(length=255), nullable=False),
+            sa.Column('model_format', sa.String(length=20), nullable=True),
+            sa.Column('source', sa.String(length=20), nullable=False),
+            sa.Column('batch_size', sa.Integer(), nullable=False),
+            sa.Column('num_threads', sa.Integer(), nullable=False),
+            sa.Column('iterations', sa.Integer(), nullable=False),
+            sa.Column('num_images', sa.Integer(), nullable=True),
+            sa.Column('seed', sa.Integer(), nullable=True),
+            sa.Column('load_time', sa.Float(), nullable=True),
+            sa.Column('latency_mean', sa.Float(), nullable=True),
+            sa.Column('latency_p50', sa.Float(), nullable=True),
+            sa.Column('latency_p95', sa.Float(), nullable=True),
+            sa.Column('latency_p99', sa.Float(), nullable=True),
+            sa.Column('throughput', sa.Float(), nullable=True),
+            sa.Column('peak_rss_mb', sa.Float(), nullable=True),
+            sa.Column('environment', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_model_benchmarks_model_id', 'model_benchmarks', ['model_id'], unique=False)
+        op.create_index('ix_model_benchmarks_run_id', 'model_benchmarks', ['run_id'], unique=False)
+
+    if not has_table("export_jobs"):
+        op.create_table('export_jobs',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=True),
+            sa.Column('export_format', sa.String(length=50), nullable=False),
+            sa.Column('include_images', sa.Boolean(), nullable=True),
+            sa.Column('include_annotations', sa.Boolean(), nullable=True),
+            sa.Column('verified_only', sa.Boolean(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('progress', sa.Float(), nullable=True),
+            sa.Column('file_path', sa.String(length=500), nullable=True),
+            sa.Column('file_size', sa.Integer(), nullable=True),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("auto_label_jobs"):
+        op.create_table('auto_label_jobs',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('model_id', sa.String(), nullable=False),
+            sa.Column('confidence_threshold', sa.Float(), nullable=True),
+            sa.Column('iou_threshold', sa.Float(), nullable=True),
+            sa.Column('overwrite_existing', sa.Boolean(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('progress', sa.Float(), nullable=True),
+            sa.Column('total_images', sa.Integer(), nullable=True),
+            sa.Column('processed_images', sa.Integer(), nullable=True),
+            sa.Column('successful_images', sa.Integer(), nullable=True),
+            sa.Column('failed_images', sa.Integer(), nullable=True),
+            sa.Column('total_annotations_created', sa.Integer(), nullable=True),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("auto_label_shards"):
+        op.create_table('auto_label_shards',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('job_id', sa.String(), nullable=False),
+            sa.Column('shard_index', sa.Integer(), nullable=False),
+            sa.Column('after_image_id', sa.String(), nullable=True),
+            sa.Column('last_image_id', sa.String(), nullable=False),
+            sa.Column('image_count', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('worker_id', sa.String(length=100), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('claimed_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['job_id'], ['auto_label_jobs.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_auto_label_shards_job_id', 'auto_label_shards', ['job_id'], unique=False)
+
+    if not has_table("data_augmentations"):
+        op.create_table('data_augmentations',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('augmentation_config', sa.JSON(), nullable=False),
+            sa.Column('images_per_original', sa.Integer(), nullable=True),
+            sa.Column('apply_to_split', sa.String(length=20), nullable=True),
+            sa.Column('preserve_annotations', sa.Boolean(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('progress', sa.Float(), nullable=True),
+            sa.Column('total_original_images', sa.Integer(), nullable=True),
+            sa.Column('total_augmented_images', sa.Integer(), nullable=True),
+            sa.Column('successful_augmentations', sa.Integer(), nullable=True),
+            sa.Column('failed_augmentations', sa.Integer(), nullable=True),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("dataset_splits"):
+        op.create_table('dataset_splits',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('train_percentage', sa.Float(), nullable=True),
+            sa.Column('val_percentage', sa.Float(), nullable=True),
+            sa.Column('test_percentage', sa.Float(), nullable=True),
+            sa.Column('split_method', sa.String(length=20), nullable=True),
+            sa.Column('random_seed', sa.Integer(), nullable=True),
+            sa.Column('stratify_by_class', sa.Boolean(), nullable=True),
+            sa.Column('train_count', sa.Integer(), nullable=True),
+            sa.Column('val_count', sa.Integer(), nullable=True),
+            sa.Column('test_count', sa.Integer(), nullable=True),
+            sa.Column('unassigned_count', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('last_split_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('dataset_id')
+        )
+
+    if not has_table("label_analytics"):
+        op.create_table('label_analytics',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('class_distribution', sa.JSON(), nullable=False),
+            sa.Column('total_annotations', sa.Integer(), nullable=True),
+            sa.Column('num_classes', sa.Integer(), nullable=True),
+            sa.Column('most_common_class', sa.String(length=100), nullable=True),
+            sa.Column('most_common_count', sa.Integer(), nullable=True),
+            sa.Column('least_common_class', sa.String(length=100), nullable=True),
+            sa.Column('least_common_count', sa.Integer(), nullable=True),
+            sa.Column('gini_coefficient', sa.Float(), nullable=True),
+            sa.Column('entropy', sa.Float(), nullable=True),
+            sa.Column('imbalance_ratio', sa.Float(), nullable=True),
+            sa.Column('train_distribution', sa.JSON(), nullable=True),
+            sa.Column('val_distribution', sa.JSON(), nullable=True),
+            sa.Column('test_distribution', sa.JSON(), nullable=True),
+            sa.Column('is_balanced', sa.Boolean(), nullable=True),
+            sa.Column('needs_augmentation', sa.Boolean(), nullable=True),
+            sa.Column('recommended_techniques', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if not has_table("training_sessions"):
+        op.create_table('training_sessions',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('base_model_id', sa.String(), nullable=True),
+            sa.Column('epochs', sa.Integer(), nullable=True),
+            sa.Column('batch_size', sa.Integer(), nullable=True),
+            sa.Column('learning_rate', sa.Float(), nullable=True),
+            sa.Column('image_size', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=True),
+            sa.Column('current_iteration', sa.Integer(), nullable=True),
+            sa.Column('max_iterations', sa.Integer(), nullable=True),
+            sa.Column('best_map50', sa.Float(), nullable=True),
+            sa.Column('best_map95', sa.Float(), nullable=True),
+            sa.Column('current_loss', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_training_sessions_id', 'training_sessions', ['id'], unique=False)
+
+    if not has_table("training_iterations"):
+        op.create_table('training_iterations',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('session_id', sa.Integer(), nullable=False),
+            sa.Column('iteration_number', sa.Integer(), nullable=False),
+            sa.Column('training_images_count', sa.Integer(), nullable=True),
+            sa.Column('validation_images_count', sa.Integer(), nullable=True),
+            sa.Column('newly_labeled_count', sa.Integer(), nullable=True),
+            sa.Column('map50', sa.Float(), nullable=True),
+            sa.Column('map95', sa.Float(), nullable=True),
+            sa.Column('precision', sa.Float(), nullable=True),
+            sa.Column('recall', sa.Float(), nullable=True),
+            sa.Column('loss', sa.Float(), nullable=True),
+            sa.Column('model_path', sa.String(length=500), nullable=True),
+            sa.Column('weights_path', sa.String(length=500), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=True),
+            sa.Column('training_time_seconds', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['session_id'], ['training_sessions.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_training_iterations_id', 'training_iterations', ['id'], unique=False)
+
+    if not has_table("model_versions"):
+        op.create_table('model_versions',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('session_id', sa.Integer(), nullable=False),
+            sa.Column('iteration_id', sa.Integer(), nullable=True),
+            sa.Column('version_name', sa.String(length=50), nullable=False),
+            sa.Column('model_path', sa.String(length=500), nullable=False),
+            sa.Column('export_format', sa.String(length=50), nullable=False),
+            sa.Column('map50', sa.Float(), nullable=True),
+            sa.Column('map95', sa.Float(), nullable=True),
+            sa.Column('precision', sa.Float(), nullable=True),
+            sa.Column('recall', sa.Float(), nullable=True),
+            sa.Column('model_size_mb', sa.Float(), nullable=True),
+            sa.Column('inference_time_ms', sa.Float(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('is_best', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['iteration_id'], ['training_iterations.id'], ),
+            sa.ForeignKeyConstraint(['session_id'], ['training_sessions.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_model_versions_id', 'model_versions', ['id'], unique=False)
+
+    if not has_table("uncertain_samples"):
+        op.create_table('uncertain_samples',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('iteration_id', sa.Integer(), nullable=False),
+            sa.Column('image_id', sa.String(), nullable=False),
+            sa.Column('uncertainty_score', sa.Float(), nullable=False),
+            sa.Column('confidence_variance', sa.Float(), nullable=True),
+            sa.Column('entropy_score', sa.Float(), nullable=True),
+            sa.Column('predicted_boxes', sa.Text(), nullable=True),
+            sa.Column('max_confidence', sa.Float(), nullable=True),
+            sa.Column('min_confidence', sa.Float(), nullable=True),
+            sa.Column('reviewed', sa.Boolean(), nullable=True),
+            sa.Column('accepted', sa.Boolean(), nullable=True),
+            sa.Column('corrected', sa.Boolean(), nullable=True),
+            sa.Column('corrected_labels', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['image_id'], ['images.id'], ),
+            sa.ForeignKeyConstraint(['iteration_id'], ['training_iterations.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_uncertain_samples_id', 'uncertain_samples', ['id'], unique=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        if has_table(table):
+            op.drop_table(table)
@@ -0,0 +1,37 @@
+"""Project type
+
+Adds projects.project_type (formerly migrate_project_types.py) and backfills
+projects without one.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.migrations import add_column_if_missing, batched_update
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column_if_missing(
+        "projects",
+        sa.Column("project_type", sa.String(length=50), nullable=True, server_default="Object Detection")
+    )
+    batched_update(
+        "projects",
+        "project_type = :project_type",
+        "project_type IS NULL OR project_type = ''",
+        {"project_type": "Object Detection"}
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("projects") as batch_op:
+        batch_op.drop_column("project_type")
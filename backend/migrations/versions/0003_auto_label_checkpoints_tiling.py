@@ -0,0 +1,36 @@
+"""Auto-label resume checkpoints and tiling
+
+Adds the checkpoint and tiling columns of auto-labeling jobs and shards
+(formerly migrate_auto_label_jobs.py).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.migrations import add_column_if_missing
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column_if_missing("auto_label_jobs", sa.Column("checkpoint_image_id", sa.String(), nullable=True))
+    add_column_if_missing("auto_label_jobs", sa.Column("tile_size", sa.Integer(), nullable=True))
+    # A constant default is filled in without rewriting the table (SQLite, PostgreSQL 11+)
+    add_column_if_missing("auto_label_jobs", sa.Column("tile_overlap", sa.Float(), nullable=True, server_default="0.2"))
+    add_column_if_missing("auto_label_shards", sa.Column("checkpoint_image_id", sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("auto_label_shards") as batch_op:
+        batch_op.drop_column("checkpoint_image_id")
+    with op.batch_alter_table("auto_label_jobs") as batch_op:
+        batch_op.drop_column("tile_overlap")
+        batch_op.drop_column("tile_size")
+        batch_op.drop_column("checkpoint_image_id")
@@ -0,0 +1,38 @@
+"""Hot query indexes
+
+Secondary indexes for the dataset, annotation, job and active learning
+queries (formerly migrate_indexes.py). Built online: CREATE INDEX
+CONCURRENTLY on PostgreSQL, so uploads and labeling continue meanwhile.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from database.migrations import create_index_online, drop_index_online
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+INDEXES = [
+    ("ix_images_dataset_id_id", "images", ["dataset_id", "id"]),
+    ("ix_images_dataset_labeled", "images", ["dataset_id", "is_labeled", "id"]),
+    ("ix_images_dataset_split", "images", ["dataset_id", "split_type"]),
+    ("ix_annotations_image_id", "annotations", ["image_id"]),
+    ("ix_auto_label_jobs_dataset_id", "auto_label_jobs", ["dataset_id"]),
+    ("ix_auto_label_jobs_status_created", "auto_label_jobs", ["status", "created_at"]),
+    ("ix_uncertain_samples_iteration_id", "uncertain_samples", ["iteration_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        drop_index_online(name, table)
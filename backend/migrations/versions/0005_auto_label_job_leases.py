@@ -0,0 +1,31 @@
+"""Auto-label job leases
+
+Adds the owner and last progress time of auto-labeling jobs, so a process
+only takes over jobs whose owner stopped making progress.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.migrations import add_column_if_missing
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column_if_missing("auto_label_jobs", sa.Column("owner_id", sa.String(length=100), nullable=True))
+    # NULL counts as stale: jobs of processes from before leases existed can be taken over
+    add_column_if_missing("auto_label_jobs", sa.Column("last_progress_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("auto_label_jobs") as batch_op:
+        batch_op.drop_column("last_progress_at")
+        batch_op.drop_column("owner_id")
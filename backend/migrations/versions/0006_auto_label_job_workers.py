@@ -0,0 +1,28 @@
+"""Auto-label job execution mode
+
+Records the number of worker processes a job runs with, so a resumed job
+continues in the same mode (0 = in-process).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.migrations import add_column_if_missing
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column_if_missing("auto_label_jobs", sa.Column("num_workers", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("auto_label_jobs") as batch_op:
+        batch_op.drop_column("num_workers")
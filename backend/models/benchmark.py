@@ -0,0 +1,352 @@
+"""
+Per-model inference benchmarks
+Runs registered models over a fixed, seeded image set at several batch sizes
+and thread counts, and records latency percentiles, throughput, peak memory
+and load time in the model_benchmarks table so runs can be compared.
+"""
+
+import multiprocessing
+import platform
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.config import settings
+from database.database import SessionLocal
+from database.operations import ModelBenchmarkOperations
+from models.model_manager import model_manager, ModelFormat, ModelType
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+COMPARED_METRICS = (
+    "load_time", "latency_p50", "latency_p95", "latency_p99", "throughput", "peak_rss_mb"
+)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_images(count: int, height: int, width: int, seed: int) -> List[np.ndarray]:
+    """Deterministic BGR test images: seeded noise with a few filled rectangles"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(count):
+        image = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        for _ in range(4):
+            x1, x2 = np.sort(rng.integers(0, width, size=2))
+            y1, y2 = np.sort(rng.integers(0, height, size=2))
+            image[y1:y2, x1:x2] = rng.integers(0, 256, size=3, dtype=np.uint8)
+        images.append(image)
+    return images
+
+
+def environment_info() -> Dict[str, Any]:
+    """Library versions and host details stored with every benchmark row"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count()
+    }
+    for module in ("ultralytics", "torch", "onnxruntime", "numpy"):
+        try:
+            info[module] = __import__(module).__version__
+        except Exception:
+            info[module] = None
+    return info
+
+
+def _benchmark_worker(
+    model_path: str,
+    use_onnx_runtime: bool,
+    classes: List[str],
+    input_size: List[int],
+    num_threads: int,
+    batch_sizes: List[int],
+    iterations: int,
+    seed: int,
+    num_synthetic: int,
+    sample_images: List[str]
+) -> Dict[str, Any]:
+    """
+    Benchmark one model at one thread count in a fresh process
+    A fresh process makes load time cold and peak RSS the model's own; batch
+    sizes run in ascending order, so the peak after each one is its peak.
+    """
+    # Imported here so the parent process does not pay for them
+    import cv2
+    import torch
+    from ultralytics import YOLO
+    from models.onnx_backend import OnnxYoloModel
+
+    torch.set_num_threads(num_threads)
+    start_time = time.perf_counter()
+    if use_onnx_runtime:
+        model = OnnxYoloModel(model_path, names=classes, intra_op_threads=num_threads)
+    else:
+        model = YOLO(model_path)
+    load_time = time.perf_counter() - start_time
+
+    height, width = input_size
+    sources = {"synthetic": synthetic_images(num_synthetic, height, width, seed)}
+    samples = [image for image in (cv2.imread(path) for path in sample_images) if image is not None]
+    if samples:
+        sources["sample"] = samples
+
+    # Untimed first pass: graph setup is not part of the steady-state latency
+    model.predict(sources["synthetic"][:1], imgsz=[height, width], verbose=False)
+
+    rows = []
+    for batch_size in sorted(batch_sizes):
+        for source, images in sources.items():
+            latencies = []
+            for iteration in range(iterations):
+                # Cycle through the fixed image set so every run sees the same batches
+                batch = [images[(iteration * batch_size + i) % len(images)] for i in range(batch_size)]
+                batch_start = time.perf_counter()
+                model.predict(batch, imgsz=[height, width], batch=batch_size, verbose=False)
+                latencies.append((time.perf_counter() - batch_start) * 1000)
+
+            latencies = np.asarray(latencies)
+            rows.append({
+                "source": source,
+                "batch_size": batch_size,
+                "num_threads": num_threads,
+                "iterations": iterations,
+                "num_images": len(images),
+                "load_time": load_time,
+                "latency_mean": float(latencies.mean()),
+                "latency_p50": float(np.percentile(latencies, 50)),
+                "latency_p95": float(np.percentile(latencies, 95)),
+                "latency_p99": float(np.percentile(latencies, 99)),
+                "throughput": float(batch_size * iterations / (latencies.sum() / 1000)),
+                "peak_rss_mb": peak_rss_mb()
+            })
+    return {"rows": rows, "environment": environment_info()}
+
+
+class ModelBenchmarker:
+    """
+    Runs benchmark suites and compares their results
+    Runs started from the API execute in the background; their status (queued,
+    running, completed, failed) and per-model errors are tracked in memory.
+    """
+
+    def __init__(self):
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._runs: Dict[str, Dict[str, Any]] = {}
+
+    def create_run(self, model_ids: Optional[List[str]] = None) -> str:
+        """Validate the models and register a queued run; returns its run id"""
+        self._check_models(model_ids or sorted(model_manager.models_info))
+        run_id = str(uuid.uuid4())
+        self._set_status(run_id, status="queued", errors={}, error=None)
+        return run_id
+
+    def run_status(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a run started in this process (None if unknown)"""
+        with self._lock:
+            status = self._runs.get(run_id)
+            return dict(status) if status else None
+
+    def run(
+        self,
+        model_ids: Optional[List[str]] = None,
+        batch_sizes: Optional[List[int]] = None,
+        thread_counts: Optional[List[int]] = None,
+        iterations: Optional[int] = None,
+        seed: Optional[int] = None,
+        sample_images: Optional[List[str]] = None,
+        run_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Benchmark models (default: every registered model) and store the results
+        Returns the run id, the stored rows and per-model errors.
+        """
+        run_id = run_id or str(uuid.uuid4())
+        self._set_status(run_id, status="running", errors={}, error=None)
+        try:
+            report = self._run(run_id, model_ids, batch_sizes, thread_counts, iterations, seed, sample_images)
+        except Exception as e:
+            self._set_status(run_id, status="failed", error=str(e))
+            raise
+        self._set_status(run_id, status="completed", errors=report["errors"])
+        return report
+
+    def _run(
+        self,
+        run_id: str,
+        model_ids: Optional[List[str]],
+        batch_sizes: Optional[List[int]],
+        thread_counts: Optional[List[int]],
+        iterations: Optional[int],
+        seed: Optional[int],
+        sample_images: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        model_ids = model_ids or sorted(model_manager.models_info)
+        self._check_models(model_ids)
+
+        batch_sizes = batch_sizes or settings.BENCHMARK_BATCH_SIZES
+        thread_counts = thread_counts or settings.BENCHMARK_THREAD_COUNTS or [multiprocessing.cpu_count()]
+        iterations = iterations or settings.BENCHMARK_ITERATIONS
+        seed = settings.BENCHMARK_SEED if seed is None else seed
+        sample_images = sample_images or []
+
+        results, errors = [], {}
+        db = SessionLocal()
+        try:
+            for model_id in model_ids:
+                model_info = model_manager.get_model_info(model_id)
+                for num_threads in thread_counts:
+                    print(f"Benchmarking {model_id} with {num_threads} thread(s)...")
+                    try:
+                        report = self._run_isolated(
+                            model_manager.resolve_weights(model_info),
+                            model_info.format == ModelFormat.ONNX and model_info.type == ModelType.OBJECT_DETECTION,
+                            model_info.classes,
+                            self._input_shape(model_info.input_size),
+                            num_threads, batch_sizes, iterations, seed,
+                            settings.BENCHMARK_SYNTHETIC_IMAGES, sample_images
+                        )
+                    except Exception as e:
+                        print(f"Benchmark of {model_id} failed: {e}")
+                        errors[model_id] = str(e)
+                        self._set_status(run_id, errors=dict(errors))
+                        break
+
+                    for row in report["rows"]:
+                        benchmark = ModelBenchmarkOperations.create_benchmark(
+                            db,
+                            run_id=run_id,
+                            model_id=model_id,
+                            model_name=model_info.name,
+                            model_format=model_info.format,
+                            seed=seed,
+                            environment=report["environment"],
+                            **row
+                        )
+                        results.append(benchmark_to_dict(benchmark))
+        finally:
+            db.close()
+
+        return {"run_id": run_id, "results": results, "errors": errors}
+
+    @staticmethod
+    def _check_models(model_ids: List[str]):
+        unknown = [model_id for model_id in model_ids if model_id not in model_manager.models_info]
+        if unknown:
+            raise ValueError(f"Models not found: {', '.join(unknown)}")
+
+    def _set_status(self, run_id: str, **fields):
+        with self._lock:
+            self._runs.setdefault(run_id, {"run_id": run_id}).update(fields)
+
+    def _run_isolated(self, model_path: str, use_onnx: bool, *args) -> Dict[str, Any]:
+        """Run _benchmark_worker in a fresh spawned process"""
+        from models.onnx_backend import onnx_runtime_available
+
+        use_onnx_runtime = use_onnx and onnx_runtime_available()
+        with ProcessPoolExecutor(max_workers=1, mp_context=self._context) as pool:
+            return pool.submit(_benchmark_worker, model_path, use_onnx_runtime, *args).result()
+
+    @staticmethod
+    def _input_shape(input_size: Any) -> List[int]:
+        """[height, width] from a model's input_size (int or pair)"""
+        if isinstance(input_size, int):
+            return [input_size, input_size]
+        if input_size and len(input_size) >= 2:
+            return [int(input_size[0]), int(input_size[1])]
+        return [640, 640]
+
+
+def benchmark_to_dict(benchmark) -> Dict[str, Any]:
+    """Serialize a ModelBenchmark row"""
+    return {
+        "id": benchmark.id,
+        "run_id": benchmark.run_id,
+        "model_id": benchmark.model_id,
+        "model_name": benchmark.model_name,
+        "model_format": benchmark.model_format,
+        "source": benchmark.source,
+        "batch_size": benchmark.batch_size,
+        "num_threads": benchmark.num_threads,
+        "iterations": benchmark.iterations,
+        "num_images": benchmark.num_images,
+        "seed": benchmark.seed,
+        "load_time": benchmark.load_time,
+        "latency_mean": benchmark.latency_mean,
+        "latency_p50": benchmark.latency_p50,
+        "latency_p95": benchmark.latency_p95,
+        "latency_p99": benchmark.latency_p99,
+        "throughput": benchmark.throughput,
+        "peak_rss_mb": benchmark.peak_rss_mb,
+        "environment": benchmark.environment,
+        "created_at": benchmark.created_at.isoformat() if benchmark.created_at else None
+    }
+
+
+def compare_runs(
+    baseline: List[Dict[str, Any]],
+    candidate: List[Dict[str, Any]],
+    threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Diff two benchmark runs configuration by configuration
+    (model, image source, batch size, thread count). A configuration regresses
+    when p95 latency grows or throughput drops by more than `threshold`
+    (a fraction, default settings.BENCHMARK_REGRESSION_THRESHOLD).
+    """
+    threshold = settings.BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold
+
+    def config(row):
+        return row["model_id"], row["source"], row["batch_size"], row["num_threads"]
+
+    baseline_rows = {config(row): row for row in baseline}
+    diffs = []
+    for row in candidate:
+        before = baseline_rows.get(config(row))
+        if before is None:
+            continue
+
+        metrics = {}
+        for metric in COMPARED_METRICS:
+            old, new = before[metric], row[metric]
+            if old is None or new is None:
+                continue
+            metrics[metric] = {
+                "baseline": old,
+                "current": new,
+                "delta": new - old,
+                "change": (new - old) / old if old else None
+            }
+
+        p95 = metrics.get("latency_p95", {}).get("change") or 0.0
+        throughput = metrics.get("throughput", {}).get("change") or 0.0
+        diffs.append({
+            "model_id": row["model_id"],
+            "source": row["source"],
+            "batch_size": row["batch_size"],
+            "num_threads": row["num_threads"],
+            "metrics": metrics,
+            "regression": p95 > threshold or throughput < -threshold
+        })
+    return diffs
+
+
+# Global model benchmarker instance
+model_benchmarker = ModelBenchmarker()
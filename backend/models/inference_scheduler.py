@@ -0,0 +1,137 @@
+"""
+Dynamic micro-batching for interactive predictions
+Concurrent prediction requests for the same model and thresholds are queued,
+grouped into one batch within a short latency window and run on a worker
+thread, so the event loop never blocks on inference.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from models.model_manager import model_manager
+
+
+BatchKey = Tuple[str, Optional[float], Optional[float], Optional[int], Optional[float], str]
+
+
+class InferenceScheduler:
+    """
+    Per-model request queues feeding micro-batches to ModelManager.predict_batch
+
+    The first request of a batch waits at most `max_wait_ms` for others to
+    join; a batch is dispatched as soon as it holds `max_batch_size` requests.
+    Requests only share a batch when their model, thresholds, tiling and mask options
+    match, so every caller gets exactly the result it would get on its own.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        num_threads: Optional[int] = None
+    ):
+        self.max_batch_size = max(1, max_batch_size or settings.INFERENCE_BATCH_MAX_SIZE)
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.INFERENCE_BATCH_WAIT_MS) / 1000.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, num_threads or settings.INFERENCE_WORKER_THREADS),
+            thread_name_prefix="inference"
+        )
+        self._queues: Dict[BatchKey, asyncio.Queue] = {}
+        self._collectors: Dict[BatchKey, asyncio.Task] = {}
+
+        self.requests = 0
+        self.batches = 0
+        self.total_inference_time = 0.0
+
+    async def predict(
+        self,
+        model_id: str,
+        image: Any,
+        confidence: Optional[float] = None,
+        iou_threshold: Optional[float] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        mask_format: str = "polygon"
+    ) -> Dict[str, Any]:
+        """Queue one image for prediction and wait for its slice of the batch"""
+        loop = asyncio.get_running_loop()
+        key = (model_id, confidence, iou_threshold, tile_size, tile_overlap, mask_format)
+        future = loop.create_future()
+
+        queue = self._queues.setdefault(key, asyncio.Queue())
+        queue.put_nowait((image, future))
+        self.requests += 1
+
+        collector = self._collectors.get(key)
+        if collector is None or collector.done():
+            self._collectors[key] = asyncio.create_task(self._collect(key, queue))
+
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "requests": self.requests,
+            "batches": self.batches,
+            "average_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "average_inference_time": self.total_inference_time / self.batches if self.batches else 0.0,
+            "active_queues": len(self._queues)
+        }
+
+    async def _collect(self, key: BatchKey, queue: asyncio.Queue):
+        """Drain one queue batch by batch; exits (and is recreated on demand) once it is empty"""
+        loop = asyncio.get_running_loop()
+        try:
+            while not queue.empty():
+                batch = [queue.get_nowait()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._dispatch(key, batch)
+        finally:
+            # No await between the emptiness check and this cleanup, so no request is lost
+            if self._queues.get(key) is queue and queue.empty():
+                del self._queues[key]
+                self._collectors.pop(key, None)
+
+    async def _dispatch(self, key: BatchKey, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run one batch on the inference thread and hand every caller its result"""
+        model_id, confidence, iou_threshold, tile_size, tile_overlap, mask_format = key
+        images = [image for image, _ in batch]
+
+        start_time = time.time()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                lambda: model_manager.predict_batch(
+                    model_id, images, confidence, iou_threshold, tile_size, tile_overlap, mask_format
+                )
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batches += 1
+            self.total_inference_time += time.time() - start_time
+
+        for (_, future), result in zip(batch, results):
+            # A caller that disconnected has a cancelled future
+            if not future.done():
+                future.set_result(result)
+
+
+# Global inference scheduler instance
+inference_scheduler = InferenceScheduler()
@@ -0,0 +1,262 @@
+"""
+Model export and quantization pipeline
+Converts a registered PyTorch model into ONNX FP32 and dynamically quantized
+INT8 variants, measures their latency and checks box parity against the source
+model on a sample of project images before registering them.
+"""
+
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from ultralytics import YOLO
+
+from core.config import settings
+from models.model_manager import model_manager, ModelInfo, ModelFormat
+from models.postprocess import box_iou, extract_detections
+
+try:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:
+    quantize_dynamic = None
+
+
+SUPPORTED_VARIANTS = ("onnx-fp32", "onnx-int8")
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """Area under the precision/recall curve (all-point interpolation)"""
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    changes = np.nonzero(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[changes + 1] - recall[changes]) * precision[changes + 1]))
+
+
+def box_map50(predictions: List[np.ndarray], references: List[np.ndarray]) -> float:
+    """
+    Box mAP@0.5 of predictions against reference detections, image by image
+    Both lists hold one (N, 6) array of [x1, y1, x2, y2, conf, cls] per image
+    """
+    classes = set()
+    for reference in references:
+        classes.update(reference[:, 5].astype(int).tolist())
+    if not classes:
+        # Nothing to find: perfect parity unless the variant invents boxes
+        return 1.0 if all(len(p) == 0 for p in predictions) else 0.0
+
+    aps = []
+    for class_id in sorted(classes):
+        scores, matches, total = [], [], 0
+        for prediction, reference in zip(predictions, references):
+            preds = prediction[prediction[:, 5] == class_id]
+            refs = reference[reference[:, 5] == class_id, :4]
+            total += len(refs)
+            preds = preds[np.argsort(-preds[:, 4], kind="stable")]
+
+            used = np.zeros(len(refs), dtype=bool)
+            for pred in preds:
+                scores.append(pred[4])
+                if len(refs) == 0:
+                    matches.append(False)
+                    continue
+                ious = np.where(used, 0.0, box_iou(pred[:4], refs))
+                best = int(ious.argmax())
+                matched = ious[best] >= 0.5
+                used[best] |= matched
+                matches.append(bool(matched))
+
+        if not scores:
+            aps.append(0.0)
+            continue
+
+        order = np.argsort(-np.asarray(scores), kind="stable")
+        hits = np.asarray(matches)[order]
+        true_positives = np.cumsum(hits)
+        false_positives = np.cumsum(~hits)
+        recall = true_positives / max(total, 1)
+        precision = true_positives / np.maximum(true_positives + false_positives, 1)
+        aps.append(average_precision(recall, precision))
+
+    return float(np.mean(aps))
+
+
+class ModelExporter:
+    """
+    Builds, measures and registers deployment variants of registered models
+    Exports started from the API run in the background; their status (queued,
+    running, completed, failed) and report are tracked in memory.
+    """
+
+    def __init__(self):
+        self.export_dir = settings.MODELS_DIR / "exported"
+        self._lock = threading.Lock()
+        self._exports: Dict[str, Dict[str, Any]] = {}
+
+    def create_export(self, model_id: str, variants: Optional[List[str]] = None) -> str:
+        """Validate an export request and register it as queued; returns its export id"""
+        self._check_request(model_id, variants)
+        export_id = str(uuid.uuid4())
+        self._set_status(export_id, model_id=model_id, status="queued", result=None, error=None)
+        return export_id
+
+    def export_status(self, export_id: str) -> Optional[Dict[str, Any]]:
+        """Status (and report once completed) of an export started in this process"""
+        with self._lock:
+            status = self._exports.get(export_id)
+            return dict(status) if status else None
+
+    def run_export(self, export_id: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        """export_variants() for a queued export, recording its outcome (background task)"""
+        self._set_status(export_id, status="running")
+        try:
+            result = self.export_variants(*args, **kwargs)
+        except Exception as e:
+            print(f"Export {export_id} failed: {e}")
+            self._set_status(export_id, status="failed", error=str(e))
+            return None
+        self._set_status(export_id, status="completed", result=result)
+        return result
+
+    def export_variants(
+        self,
+        model_id: str,
+        variants: Optional[List[str]] = None,
+        sample_images: Optional[List[str]] = None,
+        confidence_threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Export a registered .pt model to the requested variants (default: all)
+        sample_images are used for latency and parity checks against the source.
+        Returns the source latency and one report per registered variant.
+        """
+        source, variants = self._check_request(model_id, variants)
+
+        conf = confidence_threshold if confidence_threshold is not None else source.confidence_threshold
+        sample_images = sample_images or []
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+
+        # FP32 ONNX is exported once and also feeds the INT8 quantization
+        fp32_path = self._export_onnx(source)
+
+        artifacts = {}
+        if "onnx-fp32" in variants:
+            artifacts["onnx-fp32"] = fp32_path
+        if "onnx-int8" in variants:
+            int8_path = self.export_dir / f"{source.id}-onnx-int8.onnx"
+            quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QUInt8)
+            artifacts["onnx-int8"] = int8_path
+        if "onnx-fp32" not in variants:
+            fp32_path.unlink(missing_ok=True)
+
+        # Source predictions are the reference for the parity check
+        with model_manager.lease_model(source.id) as model:
+            references, source_latency = self._run_sample(model, sample_images, conf, source.iou_threshold)
+
+        reports = []
+        for variant, path in artifacts.items():
+            info = ModelInfo(
+                id=f"{source.id}-{variant}",
+                name=f"{source.name} ({variant.upper()})",
+                type=source.type,
+                format=ModelFormat.ONNX,
+                path=str(path),
+                classes=source.classes,
+                input_size=source.input_size,
+                confidence_threshold=source.confidence_threshold,
+                iou_threshold=source.iou_threshold,
+                description=f"{variant.upper()} export of {source.name}",
+                created_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                is_custom=True,
+                parent_model_id=source.id,
+                variant=variant
+            )
+            model_manager.register_model(info)
+
+            with model_manager.lease_model(info.id) as model:
+                predictions, latency = self._run_sample(model, sample_images, conf, source.iou_threshold)
+
+            if sample_images:
+                info.latency_ms = latency
+                info.map_delta = box_map50(predictions, references) - 1.0
+                model_manager.register_model(info)
+
+            reports.append({
+                "model_id": info.id,
+                "variant": variant,
+                "path": info.path,
+                "size_bytes": Path(info.path).stat().st_size,
+                "latency_ms": info.latency_ms,
+                "speedup": (source_latency / latency) if sample_images and latency else None,
+                "map_delta": info.map_delta
+            })
+
+        return {
+            "source_model_id": source.id,
+            "source_latency_ms": source_latency if sample_images else None,
+            "sample_size": len(sample_images),
+            "variants": reports
+        }
+
+    @staticmethod
+    def _check_request(model_id: str, variants: Optional[List[str]]):
+        """(source model info, variants to build); raises ValueError/RuntimeError for invalid requests"""
+        source = model_manager.get_model_info(model_id)
+        if not source:
+            raise ValueError(f"Model not found: {model_id}")
+        if source.format != ModelFormat.PYTORCH:
+            raise ValueError("Only PyTorch (.pt) models can be exported")
+
+        variants = variants or list(SUPPORTED_VARIANTS)
+        unknown = [variant for variant in variants if variant not in SUPPORTED_VARIANTS]
+        if unknown:
+            raise ValueError(f"Unsupported variants: {', '.join(unknown)}")
+        if "onnx-int8" in variants and quantize_dynamic is None:
+            raise RuntimeError("INT8 quantization requires onnxruntime")
+        return source, variants
+
+    def _set_status(self, export_id: str, **fields):
+        with self._lock:
+            self._exports.setdefault(export_id, {"export_id": export_id}).update(fields)
+
+    def _export_onnx(self, source: ModelInfo) -> Path:
+        """
+        Export the source weights to ONNX and move the file next to the other exports
+        Ultralytics writes the export beside the weights, so the model's pool lock
+        is held throughout: exports and predictions of the model do not overlap.
+        """
+        imgsz = list(source.input_size) if source.input_size else 640
+        weights = model_manager.resolve_weights(source)
+        with model_manager.lease_model(source.id):
+            exported = YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+        target = self.export_dir / f"{source.id}-onnx-fp32.onnx"
+        shutil.move(str(exported), str(target))
+        return target
+
+    @staticmethod
+    def _run_sample(model: Any, images: List[str], conf: float, iou: float):
+        """Predictions (one (N, 6) array per image) and mean latency in ms over the sample"""
+        if not images:
+            return [], 0.0
+
+        # Untimed first run: graph setup is not part of the steady-state latency
+        model.predict(images[0], conf=conf, iou=iou, verbose=False)
+
+        detections, elapsed = [], 0.0
+        for image in images:
+            start_time = time.perf_counter()
+            result = model.predict(image, conf=conf, iou=iou, verbose=False)[0]
+            elapsed += time.perf_counter() - start_time
+
+            xyxy, scores, classes = extract_detections(result)
+            detections.append(np.column_stack([xyxy, scores, classes.astype(np.float32)]))
+
+        return detections, elapsed * 1000 / len(images)
+
+
+# Global model exporter instance
+model_exporter = ModelExporter()
@@ -7,7 +7,8 @@ import os
 import json
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union, Any
 from dataclasses import dataclass
 from enum import Enum
 
@@ -19,6 +20,11 @@ from PIL import Image
 import yaml
 
 from core.config import settings
+from models.postprocess import extract_detections, class_names, encode_masks, MASK_FORMATS
+from models.tiling import predict_tiled
+from models.model_pool import model_pool
+from models.prediction_cache import prediction_cache
+from models.onnx_backend import OnnxYoloModel, onnx_runtime_available
 
 
 class ModelType(str, Enum):
@@ -52,6 +58,40 @@ class ModelInfo:
     description: str = ""
     created_at: str = ""
     is_custom: bool = False
+    # Derived variants (exports/quantizations) link back to their source model
+    parent_model_id: str = ""
+    variant: str = ""  # e.g. onnx-fp32, onnx-int8
+    latency_ms: Optional[float] = None  # Mean latency per image on the parity sample
+    map_delta: Optional[float] = None  # Box mAP50 change vs the source model's predictions
+
+
+# Pre-trained models fetched by provision_default_models()
+DEFAULT_MODELS = [
+    {
+        "id": "yolov8n",
+        "name": "YOLOv8 Nano",
+        "type": ModelType.OBJECT_DETECTION,
+        "model_name": "yolov8n.pt"
+    },
+    {
+        "id": "yolov8s",
+        "name": "YOLOv8 Small", 
+        "type": ModelType.OBJECT_DETECTION,
+        "model_name": "yolov8s.pt"
+    },
+    {
+        "id": "yolov8n-seg",
+        "name": "YOLOv8 Nano Segmentation",
+        "type": ModelType.INSTANCE_SEGMENTATION,
+        "model_name": "yolov8n-seg.pt"
+    },
+    {
+        "id": "yolov8s-seg",
+        "name": "YOLOv8 Small Segmentation",
+        "type": ModelType.INSTANCE_SEGMENTATION,
+        "model_name": "yolov8s-seg.pt"
+    }
+]
 
 
 class ModelManager:
@@ -60,13 +100,13 @@ class ModelManager:
     def __init__(self):
         self.models_dir = settings.MODELS_DIR
         self.models_config_file = self.models_dir / "models_config.json"
-        self.loaded_models: Dict[str, Any] = {}
+        self.model_pool = model_pool  # Shared, bounded cache of loaded models
         self.models_info: Dict[str, ModelInfo] = {}
         
         # Initialize models directory and config
         self._init_models_directory()
+        # Registry only: weights are loaded on first use (see resolve_weights)
         self._load_models_config()
-        self._download_default_models()
     
     def _init_models_directory(self):
         """Initialize models directory structure"""
@@ -98,74 +138,89 @@ class ModelManager:
                 "iou_threshold": model_info.iou_threshold,
                 "description": model_info.description,
                 "created_at": model_info.created_at,
-                "is_custom": model_info.is_custom
+                "is_custom": model_info.is_custom,
+                "parent_model_id": model_info.parent_model_id,
+                "variant": model_info.variant,
+                "latency_ms": model_info.latency_ms,
+                "map_delta": model_info.map_delta
             }
         
         with open(self.models_config_file, 'w') as f:
             json.dump(config, f, indent=2)
     
-    def _download_default_models(self):
-        """Download default YOLO models if not present"""
-        default_models = [
-            {
-                "id": "yolov8n",
-                "name": "YOLOv8 Nano",
-                "type": ModelType.OBJECT_DETECTION,
-                "model_name": "yolov8n.pt"
-            },
-            {
-                "id": "yolov8s",
-                "name": "YOLOv8 Small", 
-                "type": ModelType.OBJECT_DETECTION,
-                "model_name": "yolov8s.pt"
-            },
-            {
-                "id": "yolov8n-seg",
-                "name": "YOLOv8 Nano Segmentation",
-                "type": ModelType.INSTANCE_SEGMENTATION,
-                "model_name": "yolov8n-seg.pt"
-            },
-            {
-                "id": "yolov8s-seg",
-                "name": "YOLOv8 Small Segmentation",
-                "type": ModelType.INSTANCE_SEGMENTATION,
-                "model_name": "yolov8s-seg.pt"
-            }
-        ]
-        
-        for model_config in default_models:
-            if model_config["id"] not in self.models_info:
-                try:
-                    # Download model using ultralytics
-                    model = YOLO(model_config["model_name"])
-                    model_path = self.models_dir / "yolo" / model_config["model_name"]
-                    
-                    # Move downloaded model to our models directory
-                    if hasattr(model, 'ckpt_path') and os.path.exists(model.ckpt_path):
-                        shutil.copy2(model.ckpt_path, model_path)
-                    
-                    # Get model info
-                    classes = list(model.names.values()) if hasattr(model, 'names') else []
-                    
-                    # Create model info
-                    model_info = ModelInfo(
-                        id=model_config["id"],
-                        name=model_config["name"],
-                        type=model_config["type"],
-                        format=ModelFormat.PYTORCH,
-                        path=str(model_path),
-                        classes=classes,
-                        input_size=(640, 640),
-                        description=f"Pre-trained {model_config['name']} model",
-                        is_custom=False
-                    )
-                    
-                    self.models_info[model_config["id"]] = model_info
-                    
-                except Exception as e:
-                    print(f"Failed to download {model_config['name']}: {e}")
+    def provision_default_models(self, model_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Download the default YOLO models and register them
+        Explicit step (see provision_models.py); the server never runs it on startup
+        Returns the IDs of the models that are available afterwards
+        """
+        provisioned = []
+        for model_config in DEFAULT_MODELS:
+            if model_ids and model_config["id"] not in model_ids:
+                continue
+            
+            model_info = self.models_info.get(model_config["id"])
+            if model_info and Path(model_info.path).exists():
+                provisioned.append(model_config["id"])
+                continue
+            
+            try:
+                # Download model using ultralytics
+                model = YOLO(model_config["model_name"])
+                model_path = self.models_dir / "yolo" / model_config["model_name"]
+                
+                # Move downloaded model to our models directory
+                if hasattr(model, 'ckpt_path') and os.path.exists(model.ckpt_path):
+                    shutil.copy2(model.ckpt_path, model_path)
+                
+                # Get model info
+                classes = list(model.names.values()) if hasattr(model, 'names') else []
+                
+                # Create model info
+                self.models_info[model_config["id"]] = ModelInfo(
+                    id=model_config["id"],
+                    name=model_config["name"],
+                    type=model_config["type"],
+                    format=ModelFormat.PYTORCH,
+                    path=str(model_path),
+                    classes=classes,
+                    input_size=(640, 640),
+                    description=f"Pre-trained {model_config['name']} model",
+                    is_custom=False
+                )
+                provisioned.append(model_config["id"])
+                
+            except Exception as e:
+                print(f"Failed to download {model_config['name']}: {e}")
         
         self._save_models_config()
+        return provisioned
+    
+    def resolve_weights(self, model_info: ModelInfo) -> str:
+        """
+        Path of a model's weights
+        The registry may point at a missing file (fresh checkout, other machine);
+        missing default weights are only downloaded when MODEL_AUTO_DOWNLOAD is set
+        """
+        if Path(model_info.path).exists() or model_info.is_custom:
+            return model_info.path
+        
+        local_path = self.models_dir / "yolo" / Path(model_info.path).name
+        if not local_path.exists():
+            if not settings.MODEL_AUTO_DOWNLOAD:
+                raise FileNotFoundError(
+                    f"Weights for model {model_info.id} not found at {model_info.path}; "
+                    f"run 'python provision_models.py {model_info.id}' to download them"
+                )
+            # Ultralytics downloads official weights by file name
+            model = YOLO(local_path.name)
+            if hasattr(model, 'ckpt_path') and os.path.exists(model.ckpt_path):
+                shutil.copy2(model.ckpt_path, local_path)
+        
+        if local_path.exists():
+            model_info.path = str(local_path)
+            self._save_models_config()
+        return model_info.path
     
     def import_custom_model(
         self,
@@ -215,6 +270,7 @@ class ModelManager:
         shutil.copy2(model_file, custom_model_path)
         
         # Try to load model and extract information
+        input_size = (640, 640)  # Default YOLO input size
         try:
             if model_format == ModelFormat.PYTORCH:
                 model = YOLO(str(custom_model_path))
@@ -228,6 +284,13 @@ class ModelManager:
                 if hasattr(model.model, 'yaml') and 'imgsz' in model.model.yaml:
                     size = model.model.yaml['imgsz']
                     input_size = (size, size) if isinstance(size, int) else tuple(size)
+            
+            elif model_format == ModelFormat.ONNX and onnx_runtime_available():
+                # Exported models carry class names and image size in their metadata
+                model = OnnxYoloModel(str(custom_model_path))
+                if classes is None:
+                    classes = [model.names[i] for i in sorted(model.names)]
+                input_size = model.default_size
                 
         except Exception as e:
             print(f"Warning: Could not load model for inspection: {e}")
@@ -250,34 +313,74 @@ class ModelManager:
             is_custom=True
         )
         
-        # Save model info
+        # Save model info (predictions cached for an earlier model with this ID are stale)
         self.models_info[model_id] = model_info
+        prediction_cache.invalidate_model(model_id)
         self._save_models_config()
         
         return model_id
     
-    def load_model(self, model_id: str) -> Any:
-        """Load a model for inference"""
-        if model_id in self.loaded_models:
-            return self.loaded_models[model_id]
-        
-        if model_id not in self.models_info:
-            raise ValueError(f"Model not found: {model_id}")
-        
-        model_info = self.models_info[model_id]
-        
+    def register_model(self, model_info: ModelInfo):
+        """Add or replace a model in the registry (e.g. a derived variant)"""
+        self.models_info[model_info.id] = model_info
+        self.model_pool.evict(model_info.id)
+        prediction_cache.invalidate_model(model_info.id)
+        self._save_models_config()
+    
+    def get_variants(self, model_id: str) -> List[ModelInfo]:
+        """Models derived from the given model"""
+        return [info for info in self.models_info.values() if info.parent_model_id == model_id]
+    
+    def get_model_info(self, model_id: str) -> Optional[ModelInfo]:
+        """Get registered model information, or None if unknown"""
+        return self.models_info.get(model_id)
+    
+    def _build_model(self, model_info: ModelInfo) -> Any:
+        """Construct a model from its weights file"""
         try:
+            weights = self.resolve_weights(model_info)
             if model_info.format == ModelFormat.PYTORCH:
-                model = YOLO(model_info.path)
+                return YOLO(weights)
+            elif model_info.format == ModelFormat.ONNX and onnx_runtime_available() \
+                    and model_info.type == ModelType.OBJECT_DETECTION:
+                # Native ONNX Runtime session tuned for CPU inference
+                return OnnxYoloModel(weights, names=model_info.classes)
             else:
                 # For ONNX and TensorRT, we'll use YOLO's built-in support
-                model = YOLO(model_info.path)
-            
-            self.loaded_models[model_id] = model
-            return model
-            
+                return YOLO(weights)
         except Exception as e:
-            raise RuntimeError(f"Failed to load model {model_id}: {e}")
+            raise RuntimeError(f"Failed to load model {model_info.id}: {e}")
+    
+    def load_model(self, model_id: str):
+        """
+        Load a model into the shared model pool (e.g. to preload it)
+        Nothing is returned: run models through lease_model() or
+        acquire_model()/release_model(), which pin them while in use.
+        """
+        self.acquire_model(model_id)
+        self.release_model(model_id)
+    
+    def acquire_model(self, model_id: str) -> Any:
+        """Load a model and pin it in the pool until release_model() is called"""
+        if model_id not in self.models_info:
+            raise ValueError(f"Model not found: {model_id}")
+        
+        model_info = self.models_info[model_id]
+        return self.model_pool.acquire(model_id, lambda: self._build_model(model_info), model_info.path)
+    
+    def release_model(self, model_id: str):
+        """Unpin a model obtained with acquire_model()"""
+        self.model_pool.release(model_id)
+    
+    @contextmanager
+    def lease_model(self, model_id: str) -> Iterator[Any]:
+        """Pin a model and hold its inference lock for the duration of a with-block"""
+        model = self.acquire_model(model_id)
+        try:
+            with self.model_pool.inference_lock(model):
+                yield model
+        finally:
+            self.release_model(model_id)
     
     def predict(
         self,
@@ -285,6 +388,9 @@ class ModelManager:
         image: Union[str, Path, np.ndarray, Image.Image],
         confidence: Optional[float] = None,
         iou_threshold: Optional[float] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        mask_format: str = "polygon",
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -295,54 +401,111 @@ class ModelManager:
             image: Input image (path, numpy array, or PIL Image)
             confidence: Confidence threshold (uses model default if None)
             iou_threshold: IoU threshold (uses model default if None)
+            tile_size: Slice the image into tiles of this size (tiled inference) if set
+            tile_overlap: Fractional tile overlap (uses settings default if None)
+            mask_format: Segmentation mask encoding: none, polygon, rle or bitmask
             **kwargs: Additional arguments for model prediction
             
         Returns:
             Dictionary containing prediction results
         """
-        model = self.load_model(model_id)
+        return self.predict_batch(
+            model_id, [image], confidence, iou_threshold, tile_size, tile_overlap, mask_format, **kwargs
+        )[0]
+    
+    def predict_batch(
+        self,
+        model_id: str,
+        images: List[Union[str, Path, np.ndarray, Image.Image]],
+        confidence: Optional[float] = None,
+        iou_threshold: Optional[float] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None,
+        mask_format: str = "polygon",
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Run inference on several images in a single model call
+        Same arguments as predict(); returns one prediction dict per image
+        """
+        if model_id not in self.models_info:
+            raise ValueError(f"Model not found: {model_id}")
+        if mask_format not in MASK_FORMATS:
+            raise ValueError(f"Unsupported mask format: {mask_format}")
         model_info = self.models_info[model_id]
         
         # Use model defaults if thresholds not provided
         conf = confidence if confidence is not None else model_info.confidence_threshold
         iou = iou_threshold if iou_threshold is not None else model_info.iou_threshold
         
-        # Run prediction
-        results = model.predict(
-            image,
-            conf=conf,
-            iou=iou,
-            **kwargs
-        )
+        # Run prediction (the model stays pinned in the pool while in use)
+        with self.lease_model(model_id) as model:
+            if tile_size:
+                overlap = settings.AUTO_LABEL_TILE_OVERLAP if tile_overlap is None else tile_overlap
+                results = [
+                    predict_tiled(
+                        model, self._to_bgr_array(image), tile_size, overlap, conf, iou,
+                        batch_size=settings.AUTO_LABEL_TILE_BATCH_SIZE, **kwargs
+                    )
+                    for image in images
+                ]
+            else:
+                kwargs.setdefault("batch", len(images))
+                results = model.predict(
+                    list(images),
+                    conf=conf,
+                    iou=iou,
+                    **kwargs
+                )
         
-        # Format results
+        return [self._format_prediction(model_info, result, mask_format) for result in results]
+    
+    def _format_prediction(self, model_info: ModelInfo, result, mask_format: str = "polygon") -> Dict[str, Any]:
+        """Format one model result as a prediction dict"""
         formatted_results = []
-        for result in results:
-            if hasattr(result, 'boxes') and result.boxes is not None:
-                # Object detection results
-                boxes = result.boxes
-                for i in range(len(boxes)):
-                    box_data = {
-                        "bbox": boxes.xyxy[i].cpu().numpy().tolist(),
-                        "confidence": float(boxes.conf[i].cpu().numpy()),
-                        "class_id": int(boxes.cls[i].cpu().numpy()),
-                        "class_name": model_info.classes[int(boxes.cls[i].cpu().numpy())] if model_info.classes else f"class_{int(boxes.cls[i].cpu().numpy())}"
-                    }
-                    
-                    # Add segmentation mask if available
-                    if hasattr(result, 'masks') and result.masks is not None:
-                        mask = result.masks.data[i].cpu().numpy()
-                        box_data["mask"] = mask.tolist()
-                    
-                    formatted_results.append(box_data)
+        xyxy, conf, cls = extract_detections(result)
+        if len(xyxy) > 0:
+            labels = class_names(cls.tolist(), model_info.classes)
+            
+            # Encode segmentation masks compactly (one host transfer for all masks)
+            masks = encode_masks(result, mask_format)
+            
+            for i, (bbox, confidence, class_id, label) in enumerate(
+                zip(xyxy.tolist(), conf.tolist(), cls.tolist(), labels)
+            ):
+                box_data = {
+                    "bbox": bbox,
+                    "confidence": confidence,
+                    "class_id": class_id,
+                    "class_name": label
+                }
+                
+                if masks is not None and i < len(masks):
+                    box_data["mask"] = masks[i]
+                
+                formatted_results.append(box_data)
         
         return {
-            "model_id": model_id,
+            "model_id": model_info.id,
             "model_name": model_info.name,
             "predictions": formatted_results,
-            "image_shape": results[0].orig_shape if results else None
+            "image_shape": result.orig_shape,
+            "mask_format": mask_format
         }
     
+    @staticmethod
+    def _to_bgr_array(image: Union[str, Path, np.ndarray, Image.Image]) -> np.ndarray:
+        """Decode any supported image input to a BGR array (what Ultralytics expects for arrays)"""
+        if isinstance(image, np.ndarray):
+            return image
+        if isinstance(image, Image.Image):
+            return cv2.cvtColor(np.asarray(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+        
+        img = cv2.imread(str(image))
+        if img is None:
+            raise ValueError(f"Could not read image: {image}")
+        return img
+    
     def get_models_list(self) -> List[Dict[str, Any]]:
         """Get list of all available models"""
         models_list = []
@@ -356,7 +519,9 @@ class ModelManager:
                 "num_classes": len(model_info.classes),
                 "input_size": model_info.input_size,
                 "is_custom": model_info.is_custom,
-                "description": model_info.description
+                "description": model_info.description,
+                "parent_model_id": model_info.parent_model_id,
+                "variant": model_info.variant
             })
         return models_list
     
@@ -376,9 +541,9 @@ class ModelManager:
         if model_path.exists():
             model_path.unlink()
         
-        # Remove from loaded models
-        if model_id in self.loaded_models:
-            del self.loaded_models[model_id]
+        # Unload from the model pool and drop its cached predictions
+        self.model_pool.evict(model_id)
+        prediction_cache.invalidate_model(model_id)
         
         # Remove from models info
         del self.models_info[model_id]
@@ -0,0 +1,247 @@
+"""
+Shared model pool
+One bounded LRU cache for every loaded model in the process, with reference
+counting so models in use are never unloaded, and load/size statistics.
+"""
+
+import gc
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+from core.config import settings
+
+
+def estimate_model_bytes(model: Any, path: Optional[str] = None) -> int:
+    """
+    Resident size of a loaded model
+    Sums parameter and buffer tensors of the underlying torch module; falls back
+    to the weights file size for backends that do not expose tensors (ONNX, TensorRT)
+    """
+    module = getattr(model, "model", model)
+    total = 0
+    try:
+        for getter in ("parameters", "buffers"):
+            tensors = getattr(module, getter, None)
+            if callable(tensors):
+                total += sum(t.numel() * t.element_size() for t in tensors())
+    except Exception:
+        total = 0
+
+    if total == 0 and path and os.path.exists(path):
+        total = os.path.getsize(path)
+    return total
+
+
+@dataclass
+class PoolEntry:
+    """A loaded model and its accounting"""
+    model: Any
+    size_bytes: int
+    load_time: float
+    refcount: int = 0
+    hits: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    # Serializes inference/export on the shared instance: Ultralytics predictors
+    # keep per-call state (predictor.args conf/iou) and are not thread-safe
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class ModelPool:
+    """
+    LRU pool of loaded models bounded by a byte budget
+
+    acquire() returns a model and pins it until the matching release(); the
+    lease() context manager does both and also holds the model's inference
+    lock, so one caller at a time runs it. When the pool is over budget the least
+    recently used unpinned models are evicted. Pinned models are never evicted,
+    so the pool can temporarily exceed its budget while they are in use.
+    Every model is handed out pinned: an unpinned reference could outlive its
+    eviction and be run next to a second loaded copy.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_models: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MODEL_POOL_MAX_BYTES
+        self.max_models = max_models if max_models is not None else settings.MODEL_POOL_MAX_MODELS
+        self._entries: "OrderedDict[str, PoolEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # Inference lock of every instance the pool loaded, kept while the instance
+        # is alive (also after eviction, for callers still holding it)
+        self._instance_locks: "weakref.WeakKeyDictionary[Any, threading.RLock]" = weakref.WeakKeyDictionary()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_load_time = 0.0
+
+    def acquire(self, key: str, loader: Callable[[], Any], path: Optional[str] = None) -> Any:
+        """Get a model (loading it on a miss) and pin it until release()"""
+        with self._lock:
+            entry = self._touch(key)
+            if entry:
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the pool lock so other models stay available; the
+        # per-key lock makes concurrent misses on the same model load it once
+        with load_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry:
+                    return entry.model
+
+            start_time = time.time()
+            model = loader()
+            load_time = time.time() - start_time
+            size_bytes = estimate_model_bytes(model, path)
+
+            with self._lock:
+                self.misses += 1
+                self.total_load_time += load_time
+                entry = PoolEntry(model=model, size_bytes=size_bytes, load_time=load_time, refcount=1)
+                try:
+                    self._instance_locks[model] = entry.lock
+                except TypeError:
+                    # Not weak-referenceable: the lock lives with the pool entry only
+                    pass
+                self._entries[key] = entry
+                self._evict_over_budget()
+                print(f"Loaded model {key} into pool ({size_bytes / 1e6:.1f} MB, {load_time:.2f}s)")
+                return model
+
+    def release(self, key: str):
+        """Unpin a model obtained with acquire()"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.refcount > 0:
+                entry.refcount -= 1
+            self._evict_over_budget()
+
+    @contextmanager
+    def lease(self, key: str, loader: Callable[[], Any], path: Optional[str] = None) -> Iterator[Any]:
+        """Pin a model and hold its inference lock for the duration of a with-block"""
+        model = self.acquire(key, loader, path)
+        try:
+            with self.inference_lock(model):
+                yield model
+        finally:
+            self.release(key)
+
+    def inference_lock(self, model: Any) -> ContextManager:
+        """
+        Lock to hold around every predict/export call on a pooled model
+        The lock belongs to the instance, so a model evicted while a caller
+        still holds it stays serialized. Models the pool never loaded (private
+        instances) need no lock.
+        """
+        with self._lock:
+            try:
+                lock = self._instance_locks.get(model)
+            except TypeError:
+                lock = None
+            if lock is None:
+                lock = next((entry.lock for entry in self._entries.values() if entry.model is model), None)
+        return lock if lock is not None else nullcontext()
+
+    def evict(self, key: str) -> bool:
+        """Drop a model from the pool (e.g. after it was deleted); pinned models stay"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount > 0:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        """Drop every unpinned model"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.refcount == 0]:
+                self._remove(key)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool-wide and per-model statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_bytes": self.max_bytes,
+                "max_models": self.max_models,
+                "resident_bytes": self.resident_bytes,
+                "loaded_models": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "total_load_time": self.total_load_time,
+                "models": [
+                    {
+                        "model_id": key,
+                        "size_bytes": entry.size_bytes,
+                        "load_time": entry.load_time,
+                        "refcount": entry.refcount,
+                        "hits": entry.hits,
+                        "loaded_at": entry.loaded_at,
+                        "last_used": entry.last_used
+                    }
+                    # Most recently used first
+                    for key, entry in reversed(self._entries.items())
+                ]
+            }
+
+    def _touch(self, key: str) -> Optional[PoolEntry]:
+        """Record a hit, pin the entry and mark it most recently used (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        entry.hits += 1
+        entry.last_used = time.time()
+        entry.refcount += 1
+        return entry
+
+    def _over_budget(self) -> bool:
+        if self.max_bytes and self.resident_bytes > self.max_bytes:
+            return True
+        return bool(self.max_models) and len(self._entries) > self.max_models
+
+    def _evict_over_budget(self):
+        """Evict least recently used unpinned models until within budget (caller holds the lock)"""
+        for key in list(self._entries):
+            if not self._over_budget():
+                break
+            # The most recent model is kept so one larger than the whole budget still works
+            if self._entries[key].refcount == 0 and key != next(reversed(self._entries)):
+                self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.evictions += 1
+        print(f"Evicted model {key} from pool ({entry.size_bytes / 1e6:.1f} MB)")
+        del entry
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+
+# Global model pool instance
+model_pool = ModelPool()
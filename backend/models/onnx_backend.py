@@ -0,0 +1,282 @@
+"""
+ONNX Runtime inference backend
+Runs exported YOLO detection models on CPU with ONNX Runtime: tuned session
+threading, IO binding into reused buffers, and NumPy pre/post-processing.
+Results are DetectionResult objects, so the same formatting code serves both
+the PyTorch and the ONNX Runtime path.
+"""
+
+import ast
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from core.config import settings
+from models.postprocess import DetectionResult, nms
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+LETTERBOX_FILL = 114
+MAX_DETECTIONS = 300
+
+
+def onnx_runtime_available() -> bool:
+    """True if onnxruntime is installed and enabled in settings"""
+    return ort is not None and settings.ONNX_RUNTIME_ENABLED
+
+
+def letterbox_into(
+    image: np.ndarray,
+    out: np.ndarray,
+    height: int,
+    width: int
+) -> Tuple[float, float, float]:
+    """
+    Resize an image with unchanged aspect ratio and pad it into `out` (H, W, 3 uint8)
+    Returns (gain, pad_x, pad_y) to map boxes back to the original image
+    """
+    h, w = image.shape[:2]
+    gain = min(height / h, width / w)
+    new_w, new_h = int(round(w * gain)), int(round(h * gain))
+    pad_x, pad_y = (width - new_w) / 2, (height - new_h) / 2
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+
+    out[...] = LETTERBOX_FILL
+    resized = image if (new_w, new_h) == (w, h) else cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    out[top:top + new_h, left:left + new_w] = resized
+    return gain, left, top
+
+
+def decode_yolo_output(
+    output: np.ndarray,
+    confidence_threshold: float,
+    iou_threshold: float,
+    max_det: int = MAX_DETECTIONS
+) -> np.ndarray:
+    """
+    Decode one image's raw YOLOv8-style head output (4 + num_classes, anchors)
+    Returns rows of [x1, y1, x2, y2, conf, cls] in model input pixels
+    """
+    predictions = output.T  # (anchors, 4 + num_classes)
+    scores = predictions[:, 4:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), class_ids]
+
+    mask = confidences >= confidence_threshold
+    if not mask.any():
+        return np.zeros((0, 6), dtype=np.float32)
+
+    cxcywh = predictions[mask, :4]
+    confidences = confidences[mask]
+    class_ids = class_ids[mask]
+
+    half = cxcywh[:, 2:4] / 2
+    xyxy = np.concatenate([cxcywh[:, :2] - half, cxcywh[:, :2] + half], axis=1)
+
+    keep = nms(xyxy, confidences, iou_threshold, class_ids=class_ids)[:max_det]
+    return np.column_stack([xyxy[keep], confidences[keep], class_ids[keep]]).astype(np.float32)
+
+
+class OnnxYoloModel:
+    """
+    YOLO detection model executed by ONNX Runtime
+
+    predict() accepts the arguments our callers pass to Ultralytics'
+    YOLO.predict (conf, iou, batch, imgsz, verbose) and returns one
+    DetectionResult per image.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        names: Union[Dict[int, str], Sequence[str], None] = None,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        optimization_level: Optional[str] = None
+    ):
+        if ort is None:
+            raise RuntimeError("onnxruntime is not installed")
+
+        self.path = str(path)
+        options = ort.SessionOptions()
+        intra_op_threads = settings.ONNX_INTRA_OP_THREADS if intra_op_threads is None else intra_op_threads
+        inter_op_threads = settings.ONNX_INTER_OP_THREADS if inter_op_threads is None else inter_op_threads
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        level = GRAPH_OPTIMIZATION_LEVELS.get(optimization_level or settings.ONNX_GRAPH_OPTIMIZATION, "ORT_ENABLE_ALL")
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)
+
+        self.session = ort.InferenceSession(self.path, sess_options=options, providers=["CPUExecutionProvider"])
+
+        outputs = self.session.get_outputs()
+        if len(outputs) != 1:
+            raise ValueError("ONNX Runtime backend supports detection models only (single output)")
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_name = outputs[0].name
+        self.fixed_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+        self.fixed_size = tuple(model_input.shape[2:4]) if all(isinstance(d, int) for d in model_input.shape[2:4]) else None
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = self._parse_names(metadata.get("names")) or self._parse_names(names) or {}
+        imgsz = self._parse_literal(metadata.get("imgsz"))
+        self.default_size = self.fixed_size or (tuple(imgsz) if imgsz else (640, 640))
+
+        # IO binding keeps inputs/outputs in buffers reused across calls of the same shape
+        self._binding = self.session.io_binding()
+        self._lock = threading.Lock()  # Buffers and binding are shared by every caller
+        self._input_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+        self._canvas_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+        self._output_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    def predict(
+        self,
+        source: Any,
+        conf: float = 0.25,
+        iou: float = 0.7,
+        batch: Optional[int] = None,
+        imgsz: Union[int, Sequence[int], None] = None,
+        verbose: bool = False,
+        max_det: int = MAX_DETECTIONS,
+        **kwargs
+    ) -> List[DetectionResult]:
+        """Run detection on one image or a list of images (arrays in BGR, paths or PIL images)"""
+        images = [self._load_image(item) for item in (source if isinstance(source, list) else [source])]
+        height, width = self._input_size(imgsz)
+
+        batch = self.fixed_batch or batch or len(images)
+        results = []
+        for start in range(0, len(images), batch):
+            chunk = images[start:start + batch]
+            with self._lock:
+                results.extend(self._predict_chunk(chunk, height, width, conf, iou, max_det))
+        return results
+
+    def __call__(self, source: Any, **kwargs) -> List[DetectionResult]:
+        return self.predict(source, **kwargs)
+
+    def _predict_chunk(
+        self,
+        images: List[np.ndarray],
+        height: int,
+        width: int,
+        conf: float,
+        iou: float,
+        max_det: int = MAX_DETECTIONS
+    ) -> List[DetectionResult]:
+        count = len(images)
+        run_count = self.fixed_batch or count
+
+        # Letterbox every image into a reused uint8 canvas, then convert the whole
+        # batch to normalized float32 NCHW in one vectorized step
+        canvas = self._buffer(self._canvas_buffers, (run_count, height, width, 3), np.uint8)
+        transforms = []
+        for i, image in enumerate(images):
+            transforms.append(letterbox_into(image, canvas[i], height, width))
+        if run_count > count:
+            canvas[count:] = LETTERBOX_FILL
+
+        inputs = self._buffer(self._input_buffers, (run_count, 3, height, width), np.float32)
+        np.multiply(canvas[..., ::-1].transpose(0, 3, 1, 2), 1.0 / 255.0, out=inputs, casting="unsafe")
+
+        output = self._run(inputs)
+
+        results = []
+        for i, (image, (gain, pad_x, pad_y)) in enumerate(zip(images, transforms)):
+            detections = decode_yolo_output(output[i], conf, iou, max_det)
+            if len(detections):
+                # Undo letterboxing: back to original image pixels
+                detections[:, [0, 2]] = (detections[:, [0, 2]] - pad_x) / gain
+                detections[:, [1, 3]] = (detections[:, [1, 3]] - pad_y) / gain
+                h, w = image.shape[:2]
+                detections[:, [0, 2]] = detections[:, [0, 2]].clip(0, w)
+                detections[:, [1, 3]] = detections[:, [1, 3]].clip(0, h)
+            results.append(DetectionResult(detections, image.shape[:2], names=self.names))
+        return results
+
+    def _run(self, inputs: np.ndarray) -> np.ndarray:
+        """Run the session through IO binding; the output buffer is reused once its shape is known"""
+        self._binding.bind_cpu_input(self.input_name, inputs)
+
+        output = self._output_buffers.get(inputs.shape)
+        if output is not None:
+            self._binding.bind_output(
+                self.output_name, "cpu", 0, np.float32, list(output.shape), output.ctypes.data
+            )
+        else:
+            self._binding.bind_output(self.output_name, "cpu")
+
+        self.session.run_with_iobinding(self._binding)
+
+        if output is None:
+            output = self._binding.copy_outputs_to_cpu()[0]
+            self._output_buffers[inputs.shape] = np.ascontiguousarray(output, dtype=np.float32)
+        self._binding.clear_binding_inputs()
+        self._binding.clear_binding_outputs()
+        return output
+
+    def _input_size(self, imgsz: Union[int, Sequence[int], None]) -> Tuple[int, int]:
+        if self.fixed_size:
+            return self.fixed_size
+        if imgsz is None:
+            return self.default_size
+        if isinstance(imgsz, int):
+            return imgsz, imgsz
+        return int(imgsz[0]), int(imgsz[-1])
+
+    @staticmethod
+    def _buffer(cache: Dict[Tuple[int, ...], np.ndarray], shape: Tuple[int, ...], dtype) -> np.ndarray:
+        buffer = cache.get(shape)
+        if buffer is None:
+            buffer = cache[shape] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    @staticmethod
+    def _load_image(item: Any) -> np.ndarray:
+        if isinstance(item, np.ndarray):
+            return item
+        if isinstance(item, Image.Image):
+            return cv2.cvtColor(np.asarray(item.convert("RGB")), cv2.COLOR_RGB2BGR)
+        image = cv2.imread(str(item))
+        if image is None:
+            raise ValueError(f"Could not read image: {item}")
+        return image
+
+    @staticmethod
+    def _parse_literal(value: Optional[str]) -> Any:
+        if not value:
+            return None
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+
+    @classmethod
+    def _parse_names(cls, names: Any) -> Optional[Dict[int, str]]:
+        """Class names from Ultralytics export metadata (a dict literal) or a list"""
+        if isinstance(names, str):
+            names = cls._parse_literal(names)
+        if isinstance(names, dict):
+            return {int(key): value for key, value in names.items()}
+        if names:
+            return dict(enumerate(names))
+        return None
@@ -0,0 +1,335 @@
+"""
+Post-processing helpers for model predictions
+Vectorized conversion of detection results into annotation dicts
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+def to_numpy(data: Any) -> Optional[np.ndarray]:
+    """Move a tensor (or any array-like) to host memory as a NumPy array"""
+    if data is None:
+        return None
+    if hasattr(data, "cpu"):
+        data = data.cpu()
+    if hasattr(data, "numpy"):
+        return data.numpy()
+    return np.asarray(data)
+
+
+def extract_detections(result) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pull boxes, confidences and class ids off a result with one host transfer
+    Returns: (xyxy float32 (N, 4), conf float32 (N,), cls int64 (N,))
+    """
+    boxes = getattr(result, "boxes", None)
+    if boxes is None or len(boxes) == 0:
+        return (
+            np.zeros((0, 4), dtype=np.float32),
+            np.zeros((0,), dtype=np.float32),
+            np.zeros((0,), dtype=np.int64),
+        )
+
+    # boxes.data rows are [x1, y1, x2, y2, (track_id,) conf, cls]
+    data = to_numpy(boxes.data).astype(np.float32, copy=False)
+    return data[:, :4], data[:, -2], data[:, -1].astype(np.int64)
+
+
+def result_dimensions(result, image_size: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
+    """(width, height) of the original image, from result.orig_shape or the given fallback"""
+    orig_shape = getattr(result, "orig_shape", None)
+    if orig_shape is not None and len(orig_shape) >= 2:
+        return int(orig_shape[1]), int(orig_shape[0])
+    if image_size and image_size[0] and image_size[1]:
+        return int(image_size[0]), int(image_size[1])
+    return None
+
+
+def normalize_boxes(xyxy: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Scale pixel xyxy boxes to 0-1 coordinates"""
+    scale = np.array([width, height, width, height], dtype=np.float64)
+    return xyxy.astype(np.float64) / scale
+
+
+def normalize_polygons(
+    polygons: Sequence[np.ndarray],
+    width: int,
+    height: int
+) -> List[Optional[List[float]]]:
+    """Scale pixel polygons to flat [x1, y1, x2, y2, ...] lists in 0-1 coordinates"""
+    scale = np.array([width, height], dtype=np.float64)
+    normalized = []
+    for polygon in polygons:
+        polygon = np.asarray(polygon, dtype=np.float64)
+        if polygon.size == 0:
+            normalized.append(None)
+        else:
+            normalized.append((polygon.reshape(-1, 2) / scale).ravel().tolist())
+    return normalized
+
+
+def class_names(class_ids: Sequence[int], names: Union[Dict[int, str], Sequence[str], None]) -> List[str]:
+    """Look up class names for a list of ids, falling back to class_<id>"""
+    lookup = {}
+    if isinstance(names, dict):
+        lookup = names
+    elif names:
+        lookup = dict(enumerate(names))
+    return [lookup.get(class_id, f"class_{class_id}") for class_id in class_ids]
+
+
+def result_to_annotations(
+    result,
+    names: Union[Dict[int, str], Sequence[str], None],
+    image_size: Optional[Tuple[int, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert a single detection/segmentation result into normalized annotation dicts
+    image_size: (width, height) fallback when the result has no orig_shape
+    """
+    xyxy, conf, cls = extract_detections(result)
+    if len(xyxy) == 0:
+        return []
+
+    dimensions = result_dimensions(result, image_size)
+    if dimensions is None:
+        print("Cannot normalize detections: image dimensions unknown")
+        return []
+    img_width, img_height = dimensions
+
+    boxes = normalize_boxes(xyxy, img_width, img_height).tolist()
+    confidences = conf.tolist()
+    class_ids = cls.tolist()
+    labels = class_names(class_ids, names)
+
+    segmentations = [None] * len(boxes)
+    masks = getattr(result, "masks", None)
+    if masks is not None:
+        polygons = normalize_polygons(masks.xy, img_width, img_height)
+        segmentations[:len(polygons)] = polygons[:len(boxes)]
+
+    return [
+        {
+            'class_name': label,
+            'class_id': class_id,
+            'confidence': confidence,
+            'x_min': box[0],
+            'y_min': box[1],
+            'x_max': box[2],
+            'y_max': box[3],
+            'segmentation': segmentation
+        }
+        for box, confidence, class_id, label, segmentation
+        in zip(boxes, confidences, class_ids, labels, segmentations)
+    ]
+
+
+MASK_FORMATS = ("none", "polygon", "rle", "bitmask")
+
+# Masks brought to full resolution and encoded per vectorized pass
+MASK_ENCODE_CHUNK = 32
+
+
+def masks_to_rle(masks: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    COCO-style uncompressed RLE for a stack of binary masks (N, H, W)
+    Counts run over the column-major (Fortran order) pixels and start with a
+    run of zeros, as in pycocotools. All masks are encoded in one vectorized pass.
+    """
+    masks = np.asarray(masks) > 0.5
+    if masks.ndim != 3 or len(masks) == 0:
+        return []
+    n, height, width = masks.shape
+
+    # Column-major flattening of every mask at once
+    flat = masks.transpose(0, 2, 1).reshape(n, -1)
+    rows, cols = np.nonzero(flat[:, 1:] != flat[:, :-1])
+    boundaries = np.split(cols + 1, np.searchsorted(rows, np.arange(1, n)))
+
+    encoded = []
+    for i, changes in enumerate(boundaries):
+        edges = np.concatenate([[0], changes, [flat.shape[1]]])
+        counts = np.diff(edges)
+        if flat[i, 0]:
+            counts = np.concatenate([[0], counts])
+        encoded.append({"size": [height, width], "counts": counts.tolist()})
+    return encoded
+
+
+def masks_to_bitmask(masks: np.ndarray) -> List[Dict[str, Any]]:
+    """Bit-packed (row-major, 1 bit per pixel) base64 masks for a stack (N, H, W)"""
+    masks = np.asarray(masks) > 0.5
+    if masks.ndim != 3 or len(masks) == 0:
+        return []
+    _, height, width = masks.shape
+
+    packed = np.packbits(masks.reshape(len(masks), -1), axis=1)
+    return [
+        {"size": [height, width], "bits": base64.b64encode(row.tobytes()).decode("ascii")}
+        for row in packed
+    ]
+
+
+def scale_masks(masks: np.ndarray, orig_shape: Sequence[int]) -> np.ndarray:
+    """
+    Map a stack of masks (N, h, w) from the letterboxed model input grid to the
+    original image: crops the letterbox padding and resizes to orig_shape
+    (height, width), as Ultralytics' scale_masks does. Returns (N, height, width) booleans.
+    """
+    masks = np.asarray(masks, dtype=np.float32)
+    count, grid_h, grid_w = masks.shape
+    height, width = int(orig_shape[0]), int(orig_shape[1])
+
+    gain = min(grid_h / height, grid_w / width)
+    pad_x, pad_y = (grid_w - width * gain) / 2, (grid_h - height * gain) / 2
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+    bottom, right = grid_h - int(round(pad_y + 0.1)), grid_w - int(round(pad_x + 0.1))
+
+    cropped = masks[:, top:bottom, left:right]
+    if count and cropped.shape[1:] != (height, width):
+        # One resize for the whole stack: masks become the channels of one image
+        resized = cv2.resize(np.ascontiguousarray(cropped.transpose(1, 2, 0)), (width, height),
+                             interpolation=cv2.INTER_LINEAR)
+        cropped = resized.reshape(height, width, count).transpose(2, 0, 1)
+    return cropped > 0.5
+
+
+def rasterize_polygons(polygons: Sequence[np.ndarray], orig_shape: Sequence[int]) -> np.ndarray:
+    """Fill pixel polygons into a stack of (N, height, width) boolean masks"""
+    height, width = int(orig_shape[0]), int(orig_shape[1])
+    masks = np.zeros((len(polygons), height, width), dtype=np.uint8)
+    for mask, polygon in zip(masks, polygons):
+        points = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+        if len(points) >= 3:
+            cv2.fillPoly(mask, [np.round(points).astype(np.int32)], 1)
+    return masks.astype(bool)
+
+
+def encode_masks(result, mask_format: str = "polygon") -> Optional[List[Any]]:
+    """
+    Masks of a segmentation result in a compact encoding, one entry per detection
+    polygon: flat [x1, y1, x2, y2, ...] in original image pixels
+    rle / bitmask: encodings of the mask in original image pixels (size [height, width]).
+    Results that only carry polygons (tiling, cache) have them rasterized first.
+    Returns None for "none" or results without masks
+    """
+    if mask_format not in MASK_FORMATS:
+        raise ValueError(f"Unsupported mask format: {mask_format} (use one of {', '.join(MASK_FORMATS)})")
+
+    masks = getattr(result, "masks", None)
+    if mask_format == "none" or masks is None:
+        return None
+
+    if mask_format == "polygon":
+        return [np.asarray(polygon, dtype=np.float64).ravel().tolist() for polygon in masks.xy]
+
+    encoder = masks_to_rle if mask_format == "rle" else masks_to_bitmask
+    orig_shape = getattr(result, "orig_shape", None)
+    data = to_numpy(masks.data)
+    if data is None:
+        source = list(masks.xy)
+
+        def full_resolution(chunk):
+            return rasterize_polygons(chunk, orig_shape)
+    else:
+        source = data
+        orig_shape = orig_shape or data.shape[1:]
+
+        def full_resolution(chunk):
+            return scale_masks(chunk, orig_shape)
+
+    # Vectorized encoding in chunks: a full-resolution stack of every mask can be large
+    encoded = []
+    for start in range(0, len(source), MASK_ENCODE_CHUNK):
+        encoded.extend(encoder(full_resolution(source[start:start + MASK_ENCODE_CHUNK])))
+    return encoded
+
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IoU of one xyxy box against an (N, 4) array of boxes"""
+    xx1 = np.maximum(box[0], boxes[:, 0])
+    yy1 = np.maximum(box[1], boxes[:, 1])
+    xx2 = np.minimum(box[2], boxes[:, 2])
+    yy2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    class_ids: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression over xyxy boxes
+    With class_ids, boxes only suppress boxes of the same class
+    Returns indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    boxes = boxes.astype(np.float64, copy=False)
+    if class_ids is not None:
+        # Shift each class into its own coordinate range so classes never overlap
+        offset = float(boxes.max()) + 1.0
+        boxes = boxes + (class_ids.astype(np.float64) * offset)[:, None]
+
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size > 0:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        order = rest[box_iou(boxes[best], boxes[rest]) <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+class DetectionBoxes:
+    """Minimal stand-in for Ultralytics Boxes: rows of [x1, y1, x2, y2, conf, cls]"""
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+
+class DetectionMasks:
+    """Minimal stand-in for Ultralytics Masks carrying pixel polygons only"""
+
+    def __init__(self, xy: List[np.ndarray]):
+        self.xy = xy
+        self.data = None
+
+    def __len__(self):
+        return len(self.xy)
+
+
+class DetectionResult:
+    """
+    Detections produced outside Ultralytics (tiling, ONNX Runtime, cache)
+    Quacks like an Ultralytics result for the helpers in this module
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        orig_shape: Tuple[int, int],
+        polygons: Optional[List[np.ndarray]] = None,
+        names: Union[Dict[int, str], Sequence[str], None] = None
+    ):
+        self.boxes = DetectionBoxes(data.reshape(-1, 6).astype(np.float32, copy=False))
+        self.masks = DetectionMasks(polygons) if polygons is not None else None
+        self.orig_shape = orig_shape
+        self.names = names
+
+    def __len__(self):
+        return len(self.boxes)
@@ -0,0 +1,343 @@
+"""
+Persistent prediction cache
+Stores raw (low-threshold) detections per (image content hash, model, weights
+hash) so auto-labeling can re-apply stricter confidence/IoU thresholds
+without running the model again.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import settings
+from models.postprocess import DetectionResult, extract_detections, nms
+
+
+# Ultralytics' default max_det: the cap a direct (uncached) run applies
+DEFAULT_MAX_DET = 300
+
+
+class CachedImage(NamedTuple):
+    """An image as seen by the cache: decoded only when its predictions are not cached"""
+    digest: str
+    image: Optional[np.ndarray]
+    result: Optional[DetectionResult]
+
+
+def check_thresholds(confidence_threshold: float, iou_threshold: float):
+    """
+    Raise ValueError for thresholds looser than the raw ones the cache stores
+    (boxes below PREDICTION_CACHE_MIN_CONFIDENCE or suppressed at
+    PREDICTION_CACHE_RAW_IOU are not in the cache, so they cannot be recovered)
+    """
+    if confidence_threshold < settings.PREDICTION_CACHE_MIN_CONFIDENCE:
+        raise ValueError(
+            f"Confidence threshold {confidence_threshold} is below the prediction cache's raw "
+            f"confidence {settings.PREDICTION_CACHE_MIN_CONFIDENCE}"
+        )
+    if iou_threshold > settings.PREDICTION_CACHE_RAW_IOU:
+        raise ValueError(
+            f"IoU threshold {iou_threshold} is above the prediction cache's raw IoU {settings.PREDICTION_CACHE_RAW_IOU}"
+        )
+
+
+def apply_thresholds(
+    result: DetectionResult,
+    confidence_threshold: float,
+    iou_threshold: float,
+    max_det: Optional[int] = DEFAULT_MAX_DET
+) -> DetectionResult:
+    """Re-threshold raw detections: drop low-confidence boxes, class-aware NMS, then keep the max_det best"""
+    data = result.boxes.data
+    polygons = result.masks.xy if result.masks is not None else None
+
+    keep = np.nonzero(data[:, 4] >= confidence_threshold)[0]
+    kept = data[keep]
+    order = nms(kept[:, :4], kept[:, 4], iou_threshold, class_ids=kept[:, 5].astype(np.int64))
+    keep = keep[order[:max_det] if max_det else order]
+
+    return DetectionResult(
+        data[keep],
+        result.orig_shape,
+        polygons=[polygons[i] for i in keep] if polygons is not None else None,
+        names=result.names
+    )
+
+
+class PredictionCache:
+    """
+    On-disk cache of raw detections
+
+    Entries live in <cache_dir>/<model_id>/<weights hash>/<xx>/<image hash>.npz
+    as compressed columns (boxes, scores, classes, polygon points and lengths).
+    The weights hash in the key makes a re-imported model miss automatically;
+    invalidate_model() also removes its files. Least recently used entries are
+    evicted once the cache grows past its byte budget.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.PREDICTION_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.PREDICTION_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._file_hashes: Dict[Tuple[str, int, float], str] = {}
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    # Keys
+
+    def model_key(
+        self,
+        model_id: str,
+        model_path: str,
+        tile_size: Optional[int] = None,
+        tile_overlap: Optional[float] = None
+    ) -> Optional[str]:
+        """Cache namespace for a model's weights and inference options (None if the weights are missing)"""
+        weights_hash = self.file_hash(model_path)
+        if weights_hash is None:
+            return None
+
+        key = f"{model_id}/{weights_hash[:16]}"
+        if tile_size:
+            key += f"-t{int(tile_size)}o{float(tile_overlap or 0):.2f}"
+
+        # Entries of previous weights for this model id can never hit again
+        model_dir = self.cache_dir / model_id
+        if model_dir.exists():
+            for stale in model_dir.iterdir():
+                if stale.is_dir() and not stale.name.startswith(weights_hash[:16]):
+                    shutil.rmtree(stale, ignore_errors=True)
+                    with self._lock:
+                        self._size = None
+        return key
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """SHA-256 of a file, memoized by path, size and modification time"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        signature = (str(path), stat.st_size, stat.st_mtime)
+        with self._lock:
+            if signature in self._file_hashes:
+                return self._file_hashes[signature]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+        with self._lock:
+            self._file_hashes[signature] = digest.hexdigest()
+        return digest.hexdigest()
+
+    # Entries
+
+    def get(self, model_key: str, digest: str) -> Optional[DetectionResult]:
+        """Raw detections for an image, or None on a miss"""
+        path = self._entry_path(model_key, digest)
+        try:
+            with np.load(path) as entry:
+                boxes = entry["boxes"]
+                data = np.column_stack([boxes, entry["scores"], entry["classes"].astype(np.float32)])
+                polygons = None
+                if "polygon_lengths" in entry:
+                    points = entry["polygon_points"].astype(np.float32)
+                    polygons = np.split(points, np.cumsum(entry["polygon_lengths"])[:-1])
+                orig_shape = tuple(int(v) for v in entry["orig_shape"])
+            os.utime(path)  # LRU: eviction removes the least recently read entries
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return DetectionResult(data, orig_shape, polygons=polygons)
+
+    def put(self, model_key: str, digest: str, result: Any):
+        """Store the raw detections of a model result"""
+        xyxy, scores, classes = extract_detections(result)
+        columns = {
+            "boxes": xyxy.astype(np.float32),
+            "scores": scores.astype(np.float32),
+            "classes": classes.astype(np.int16),
+            "orig_shape": np.asarray(result.orig_shape[:2], dtype=np.int32)
+        }
+        masks = getattr(result, "masks", None)
+        if masks is not None:
+            polygons = [np.asarray(polygon, dtype=np.float32).reshape(-1, 2) for polygon in masks.xy]
+            columns["polygon_lengths"] = np.asarray([len(p) for p in polygons], dtype=np.int32)
+            columns["polygon_points"] = np.concatenate(polygons) if polygons else np.zeros((0, 2), np.float32)
+
+        path = self._entry_path(model_key, digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file and rename, so concurrent readers/workers never see partial entries
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp.npz")
+        try:
+            np.savez_compressed(tmp_path, **columns)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f"Failed to write prediction cache entry: {e}")
+            return
+
+        self._account(path.stat().st_size)
+
+    def loader(self, model_key: str) -> Callable[[str], Optional[CachedImage]]:
+        """
+        Image loader for ImagePrefetcher: hashes the file bytes it reads anyway
+        and decodes them only when the cache has no predictions for them
+        """
+        def load(image_path: str) -> Optional[CachedImage]:
+            try:
+                data = np.fromfile(image_path, dtype=np.uint8)
+            except OSError:
+                return None
+            if data.size == 0:
+                return None
+
+            digest = hashlib.sha256(data).hexdigest()
+            cached = self.get(model_key, digest)
+            if cached is not None:
+                return CachedImage(digest, None, cached)
+
+            image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+            return CachedImage(digest, image, None) if image is not None else None
+
+        return load
+
+    def invalidate_model(self, model_id: str):
+        """Remove every cached prediction of a model (e.g. when it is deleted or replaced)"""
+        shutil.rmtree(self.cache_dir / model_id, ignore_errors=True)
+        with self._lock:
+            self._size = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "max_bytes": self.max_bytes,
+            "size_bytes": self._scan_size(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+    # Size accounting
+
+    def _entry_path(self, model_key: str, digest: str) -> Path:
+        return self.cache_dir / model_key / digest[:2] / f"{digest}.npz"
+
+    def _entries(self) -> List[str]:
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            entries.extend(os.path.join(root, name) for name in files if name.endswith(".npz"))
+        return entries
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+        with self._lock:
+            self._size = total
+        return total
+
+    def _account(self, added: int):
+        with self._lock:
+            size = self._size
+        if size is None:
+            size = self._scan_size()
+        else:
+            with self._lock:
+                self._size = size = size + added
+
+        if self.max_bytes and size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is at 90% of its budget"""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+        with self._lock:
+            self._size = total
+
+
+def predict_cached(
+    cache: PredictionCache,
+    model_key: str,
+    images: List[CachedImage],
+    predict_fn: Callable[..., List[Any]],
+    confidence_threshold: float,
+    iou_threshold: float,
+    max_det: Optional[int] = DEFAULT_MAX_DET
+) -> List[DetectionResult]:
+    """
+    Results for a batch of loaded images, running the model only on cache misses
+    Misses are predicted by predict_fn(images, conf, iou, max_det=...) at the
+    cache's raw thresholds and stored; every result is then re-thresholded to
+    the requested confidence and IoU and capped at max_det (None for tiled
+    results, which a direct run does not cap). Thresholds looser than the raw
+    ones raise ValueError (see check_thresholds).
+    """
+    check_thresholds(confidence_threshold, iou_threshold)
+
+    misses = [i for i, item in enumerate(images) if item.result is None]
+    raw: List[Any] = [item.result for item in images]
+
+    if misses:
+        predictions = predict_fn(
+            [images[i].image for i in misses],
+            settings.PREDICTION_CACHE_MIN_CONFIDENCE,
+            settings.PREDICTION_CACHE_RAW_IOU,
+            max_det=settings.PREDICTION_CACHE_RAW_MAX_DET
+        )
+        for i, result in zip(misses, predictions):
+            cache.put(model_key, images[i].digest, result)
+            # Round-trip through the cached columns so hits and misses threshold identically
+            xyxy, scores, classes = extract_detections(result)
+            masks = getattr(result, "masks", None)
+            raw[i] = DetectionResult(
+                np.column_stack([xyxy, scores, classes.astype(np.float32)]),
+                tuple(result.orig_shape[:2]),
+                polygons=[np.asarray(p, dtype=np.float32) for p in masks.xy] if masks is not None else None
+            )
+
+    return [apply_thresholds(result, confidence_threshold, iou_threshold, max_det) for result in raw]
+
+
+# Global prediction cache instance
+prediction_cache = PredictionCache()
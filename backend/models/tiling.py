@@ -0,0 +1,102 @@
+"""
+Tiled (sliced) inference for high-resolution images
+Small objects in large images disappear when the whole frame is downscaled to
+the model input size, so the image is cut into overlapping tiles, the tiles
+are batched through the model and tile detections are merged with NMS.
+"""
+
+from typing import Any, List
+
+import numpy as np
+
+from models.postprocess import DetectionResult, extract_detections, nms
+
+
+def make_tiles(width: int, height: int, tile_size: int, overlap: float = 0.2) -> np.ndarray:
+    """
+    Tile origins covering the image: (K, 4) array of x0, y0, x1, y1
+    The last row/column of tiles is aligned to the image edge
+    """
+    overlap = min(max(overlap, 0.0), 0.9)
+    stride = max(1, int(round(tile_size * (1.0 - overlap))))
+
+    def starts(length: int) -> np.ndarray:
+        if length <= tile_size:
+            return np.array([0])
+        positions = np.arange(0, length - tile_size, stride)
+        return np.unique(np.append(positions, length - tile_size))
+
+    xs, ys = starts(width), starts(height)
+    x0, y0 = np.meshgrid(xs, ys)
+    x0, y0 = x0.ravel(), y0.ravel()
+    return np.stack(
+        [x0, y0, np.minimum(x0 + tile_size, width), np.minimum(y0 + tile_size, height)],
+        axis=1
+    )
+
+
+def predict_tiled(
+    model: Any,
+    image: np.ndarray,
+    tile_size: int,
+    tile_overlap: float = 0.2,
+    confidence_threshold: float = 0.5,
+    iou_threshold: float = 0.45,
+    batch_size: int = 8,
+    include_full_image: bool = True,
+    **predict_kwargs
+) -> DetectionResult:
+    """
+    Run sliced inference on one decoded image
+    Tiles are numpy views of the single decoded image, sent to the model
+    `batch_size` at a time. With include_full_image the downscaled whole
+    frame is predicted too, so large objects spanning tiles are kept intact.
+    """
+    height, width = image.shape[:2]
+    tiles = make_tiles(width, height, tile_size, tile_overlap)
+    if include_full_image and len(tiles) > 1:
+        tiles = np.vstack([tiles, [[0, 0, width, height]]])
+
+    boxes: List[np.ndarray] = []
+    polygons: List[np.ndarray] = []
+    has_masks = False
+
+    for start in range(0, len(tiles), batch_size):
+        windows = tiles[start:start + batch_size]
+        crops = [image[y0:y1, x0:x1] for x0, y0, x1, y1 in windows]
+        results = model.predict(
+            crops,
+            conf=confidence_threshold,
+            iou=iou_threshold,
+            batch=len(crops),
+            verbose=False,
+            **predict_kwargs
+        )
+
+        for (x0, y0, _, _), result in zip(windows, results):
+            xyxy, conf, cls = extract_detections(result)
+            if len(xyxy) == 0:
+                continue
+
+            shift = np.array([x0, y0, x0, y0], dtype=np.float32)
+            boxes.append(np.column_stack([xyxy + shift, conf, cls.astype(np.float32)]))
+
+            masks = getattr(result, "masks", None)
+            tile_polygons = list(masks.xy) if masks is not None else []
+            has_masks = has_masks or masks is not None
+            for i in range(len(xyxy)):
+                polygon = np.asarray(tile_polygons[i], dtype=np.float32) if i < len(tile_polygons) \
+                    else np.zeros((0, 2), dtype=np.float32)
+                polygons.append(polygon + np.array([x0, y0], dtype=np.float32) if polygon.size else polygon)
+
+    if not boxes:
+        return DetectionResult(np.zeros((0, 6), dtype=np.float32), (height, width), names=model.names)
+
+    data = np.vstack(boxes)
+
+    # Cross-tile NMS (class-aware): duplicates from overlapping tiles collapse to one box
+    keep = nms(data[:, :4], data[:, 4], iou_threshold, class_ids=data[:, 5].astype(np.int64))
+    data = data[keep]
+    merged_polygons = [polygons[i] for i in keep] if has_masks else None
+
+    return DetectionResult(data, (height, width), polygons=merged_polygons, names=model.names)
@@ -85,7 +85,7 @@ class UncertainSample(Base):
     __tablename__ = "uncertain_samples"
     
     id = Column(Integer, primary_key=True, index=True)
-    iteration_id = Column(Integer, ForeignKey("training_iterations.id"), nullable=False)
+    iteration_id = Column(Integer, ForeignKey("training_iterations.id"), nullable=False, index=True)
     image_id = Column(String, ForeignKey("images.id"), nullable=False)
     
     # Uncertainty metrics
@@ -0,0 +1,123 @@
+"""
+Model warm-up and readiness
+Loads models into the shared pool ahead of the first request and runs a dummy
+batch through them so graph setup and kernel selection are paid up front.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.config import settings
+from models.model_manager import model_manager
+
+
+class ModelWarmer:
+    """
+    Warms models and tracks their readiness
+
+    A model is "ready" once it has been loaded and has run a dummy batch at its
+    input_size, and it is still resident in the model pool. Readiness states:
+    cold, queued, loading, warming, ready, failed.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or settings.MODEL_WARMUP_BATCH_SIZE
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    def warm_model(self, model_id: str) -> Dict[str, Any]:
+        """Load a model and run a dummy batch through it (blocking)"""
+        model_info = model_manager.get_model_info(model_id)
+        if not model_info:
+            return self._set_state(model_id, status="failed", error="Model not found")
+
+        self._set_state(model_id, status="loading", error=None, started_at=time.time())
+        try:
+            start_time = time.time()
+            with model_manager.lease_model(model_id) as model:
+                load_time = time.time() - start_time
+                self._set_state(model_id, status="warming", load_time=load_time)
+
+                height, width = self._input_shape(model_info.input_size)
+                dummy = [np.zeros((height, width, 3), dtype=np.uint8)] * self.batch_size
+
+                # The first pass pays for graph setup; the second shows steady-state latency
+                latencies = []
+                for _ in range(2):
+                    pass_start = time.time()
+                    model.predict(dummy, imgsz=[height, width], batch=len(dummy), verbose=False)
+                    latencies.append(time.time() - pass_start)
+
+            print(f"Warmed model {model_id} (load {load_time:.2f}s, first batch {latencies[0]:.2f}s)")
+            return self._set_state(
+                model_id,
+                status="ready",
+                warmup_latency=latencies[0],
+                steady_latency=latencies[1],
+                input_size=[height, width],
+                batch_size=len(dummy),
+                ready_at=time.time()
+            )
+
+        except Exception as e:
+            print(f"Failed to warm model {model_id}: {e}")
+            return self._set_state(model_id, status="failed", error=str(e))
+
+    async def warm_models(self, model_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Warm models one after another off the event loop (defaults to settings.MODEL_WARMUP_IDS)"""
+        model_ids = model_ids if model_ids is not None else settings.MODEL_WARMUP_IDS
+        for model_id in model_ids:
+            self._set_state(model_id, status="queued")
+
+        results = {}
+        for model_id in model_ids:
+            results[model_id] = await asyncio.to_thread(self.warm_model, model_id)
+        return results
+
+    def readiness(self, model_id: str) -> Dict[str, Any]:
+        """Readiness of one model"""
+        with self._lock:
+            state = dict(self._states.get(model_id, {"model_id": model_id, "status": "cold"}))
+
+        # A warmed model that the pool has since evicted is cold again
+        if state["status"] == "ready" and model_id not in model_manager.model_pool:
+            state["status"] = "cold"
+        state["ready"] = state["status"] == "ready"
+        return state
+
+    def readiness_report(self) -> Dict[str, Any]:
+        """Readiness of every registered or warmed model"""
+        with self._lock:
+            model_ids = set(self._states)
+        model_ids.update(model_manager.models_info)
+
+        models = {model_id: self.readiness(model_id) for model_id in sorted(model_ids)}
+        expected = settings.MODEL_WARMUP_IDS
+        return {
+            "ready": all(models.get(model_id, {}).get("ready") for model_id in expected),
+            "warmup_models": expected,
+            "models": models
+        }
+
+    def _set_state(self, model_id: str, **fields) -> Dict[str, Any]:
+        with self._lock:
+            state = self._states.setdefault(model_id, {"model_id": model_id})
+            state.update(fields)
+            return dict(state)
+
+    @staticmethod
+    def _input_shape(input_size: Any) -> tuple:
+        """(height, width) from a model's input_size (int or pair)"""
+        if isinstance(input_size, int):
+            return input_size, input_size
+        if input_size and len(input_size) >= 2:
+            return int(input_size[0]), int(input_size[1])
+        return 640, 640
+
+
+# Global model warmer instance
+model_warmer = ModelWarmer()
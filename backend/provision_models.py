@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Download and register the default pre-trained YOLO models
+The server starts from the registry alone but does not download weights at
+request time (unless MODEL_AUTO_DOWNLOAD is set); run this before serving
+the default models.
+
+Usage: python provision_models.py [model_id ...]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.model_manager import model_manager, DEFAULT_MODELS
+
+def provision_models(model_ids=None):
+    """Provision the given default models (all of them if none are given)"""
+    known = {model["id"] for model in DEFAULT_MODELS}
+    unknown = [model_id for model_id in (model_ids or []) if model_id not in known]
+    if unknown:
+        print(f"Unknown default models: {', '.join(unknown)} (available: {', '.join(sorted(known))})")
+        return False
+    
+    requested = model_ids or sorted(known)
+    provisioned = model_manager.provision_default_models(requested)
+    for model_id in requested:
+        status = "ready" if model_id in provisioned else "FAILED"
+        print(f"  {model_id}: {status}")
+    
+    return len(provisioned) == len(requested)
+
+if __name__ == "__main__":
+    print("Provisioning default models...")
+    success = provision_models(sys.argv[1:])
+    if success:
+        print("Provisioning completed successfully!")
+    else:
+        print("Provisioning failed!")
+        sys.exit(1)
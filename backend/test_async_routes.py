@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Async database route test
+Drives the image annotation routes through FastAPI with their AsyncSession
+dependency bound to a temporary SQLite database (aiosqlite), checking that the
+operations layer works through run_sync end to end.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.database import get_async_db
+from database.engine import create_database_engine, create_async_database_engine
+from database.models import Project, Dataset, Image
+from api.routes import annotations
+import models.training  # noqa: F401
+
+
+async def request(app, method: str, path: str, body=None):
+    """Send one HTTP request to the ASGI app; returns (status, decoded JSON body)"""
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "path": path, "raw_path": path.encode(), "root_path": "",
+        "scheme": "http", "query_string": b"", "server": ("test", 80), "client": ("test", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], json.loads(response["body"] or b"null")
+
+
+async def run_annotation_round_trip(url: str):
+    """Save and reload an image's annotations through the async routes"""
+    engine = create_database_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="async"))
+    db.add(Dataset(id="d1", name="async", project_id=1, total_images=1, unlabeled_images=1))
+    db.add(Image(id="i1", filename="1.jpg", original_filename="1.jpg", file_path="/tmp/1.jpg", dataset_id="d1"))
+    db.commit()
+
+    async_engine = create_async_database_engine(url)
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(annotations.router, prefix="/api/v1/images")
+    app.dependency_overrides[get_async_db] = get_test_db
+
+    try:
+        status, body = await request(app, "POST", "/api/v1/images/i1/annotations", {"annotations": [
+            {"class_name": "car", "class_id": 2, "x": 0.1, "y": 0.2, "width": 0.3, "height": 0.4}
+        ]})
+        assert status == 200, f"save returned {status}: {body}"
+        assert body["count"] == 1, body
+
+        status, body = await request(app, "GET", "/api/v1/images/i1/annotations")
+        assert status == 200, f"load returned {status}: {body}"
+        assert len(body) == 1 and body[0]["class_name"] == "car", body
+        assert abs(body[0]["width"] - 0.3) < 1e-6, body
+
+        db.expire_all()
+        image = db.get(Image, "i1")
+        dataset = db.get(Dataset, "d1")
+        assert image.is_labeled, "image not marked labeled"
+        assert dataset.labeled_images == 1 and dataset.unlabeled_images == 0, "dataset counters not updated"
+    finally:
+        db.close()
+        engine.dispose()
+        await async_engine.dispose()
+
+
+def test_annotation_routes_on_aiosqlite():
+    """Annotations saved through the async session are stored and read back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_annotation_round_trip(f"sqlite:///{tmp}/async_routes.db"))
+
+
+if __name__ == "__main__":
+    print("⚡ ASYNC ROUTE TEST")
+    try:
+        test_annotation_routes_on_aiosqlite()
+        print("   ✅ test_annotation_routes_on_aiosqlite")
+    except AssertionError as e:
+        print(f"   ❌ test_annotation_routes_on_aiosqlite: {e}")
+        sys.exit(1)
+    print("\n🎉 All async route tests passed")
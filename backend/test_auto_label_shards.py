@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Auto-label shard queue test
+Checks that jobs are split into id-range shards, that every shard is claimed
+by exactly one worker, and that run_job re-runs shards left unfinished by a
+crashed worker and fails the job once the retries are used up.
+The worker processes are replaced by in-process fakes driving the same queue.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from core.config import settings
+from core.auto_label_workers import AutoLabelWorkerPool
+from core.auto_label_writer import AutoLabelResultWriter
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset, Image, AutoLabelJob
+from database.operations import AutoLabelShardOperations, ImageOperations
+import models.training  # noqa: F401
+
+
+def session_with_images(count=7):
+    """Session on an in-memory database with job "j1" over images img-00..img-NN"""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="shards"))
+    db.add(Dataset(id="d1", name="shards", project_id=1))
+    for i in range(count):
+        name = f"img-{i:02d}"
+        db.add(Image(id=name, filename=name, original_filename=name, file_path=f"/tmp/{name}", dataset_id="d1"))
+    db.add(AutoLabelJob(id="j1", dataset_id="d1", model_id="yolov8n", status="processing", total_images=count))
+    db.commit()
+    return db
+
+
+class FakeWorkerPool(AutoLabelWorkerPool):
+    """
+    Runs "workers" in-process: each attempt claims every pending shard and
+    writes its images, but crashes (leaves the shard processing) after
+    `crashes[attempt]` shards
+    """
+
+    def __init__(self, crashes):
+        super().__init__(num_workers=1)
+        self.crashes = crashes
+        self.attempts = 0
+
+    def _run_workers(self, writer, dataset_id, model_path, confidence_threshold, iou_threshold,
+                     labeled_only, batch_size, num_workers, tile_size, tile_overlap, cache_key, attempt=0):
+        self.attempts += 1
+        db = writer.db
+        completed = 0
+        while True:
+            shard = AutoLabelShardOperations.claim_next_shard(db, writer.job_id, f"w{attempt}")
+            if not shard:
+                return []
+            if self.crashes[attempt] is not None and completed >= self.crashes[attempt]:
+                return [f"w{attempt} exited with code 1"]
+            for chunk in ImageOperations.iter_images_by_dataset(
+                db, dataset_id,
+                after_id=shard.checkpoint_image_id or shard.after_image_id,
+                until_id=shard.last_image_id
+            ):
+                writer.write_batch(
+                    {image.id: [] for image in chunk},
+                    checkpoint_image_id=chunk[-1].id, shard_id=shard.id
+                )
+            AutoLabelShardOperations.complete_shard(db, shard.id)
+            completed += 1
+
+
+def run_job(db, pool, retries):
+    original = (settings.AUTO_LABEL_SHARD_SIZE, settings.AUTO_LABEL_SHARD_RETRIES)
+    settings.AUTO_LABEL_SHARD_SIZE, settings.AUTO_LABEL_SHARD_RETRIES = 3, retries
+    try:
+        writer = AutoLabelResultWriter(db, "j1", "yolov8n", total_images=7)
+        return pool.run_job(writer, "d1", "yolov8n.pt")
+    finally:
+        settings.AUTO_LABEL_SHARD_SIZE, settings.AUTO_LABEL_SHARD_RETRIES = original
+
+
+def test_shards_cover_id_ranges():
+    db = session_with_images()
+    shards = AutoLabelShardOperations.create_shards(db, "j1", "d1", shard_size=3)
+    ranges = [(shard.after_image_id, shard.last_image_id, shard.image_count) for shard in shards]
+    assert ranges == [(None, "img-02", 3), ("img-02", "img-05", 3), ("img-05", "img-06", 1)], ranges
+
+    resumed = AutoLabelShardOperations.create_shards(db, "j2", "d1", shard_size=3, after_id="img-04")
+    assert [(shard.after_image_id, shard.last_image_id) for shard in resumed] == [("img-04", "img-06")]
+    db.close()
+
+
+def test_each_shard_is_claimed_once():
+    db = session_with_images()
+    AutoLabelShardOperations.create_shards(db, "j1", "d1", shard_size=3)
+    claims = []
+    for worker_id in ("w0", "w1", "w0", "w1"):
+        shard = AutoLabelShardOperations.claim_next_shard(db, "j1", worker_id)
+        claims.append((shard.shard_index, shard.worker_id) if shard else None)
+    assert claims == [(0, "w0"), (1, "w1"), (2, "w0"), None], claims
+    db.close()
+
+
+def test_requeue_keeps_checkpoints():
+    """Abandoned shards go back to pending and resume after their checkpoint"""
+    db = session_with_images()
+    AutoLabelShardOperations.create_shards(db, "j1", "d1", shard_size=3)
+    first = AutoLabelShardOperations.claim_next_shard(db, "j1", "w0")
+    second = AutoLabelShardOperations.claim_next_shard(db, "j1", "w1")
+    first.checkpoint_image_id = "img-00"
+    db.commit()
+    AutoLabelShardOperations.complete_shard(db, second.id)
+
+    assert AutoLabelShardOperations.count_unprocessed_images(db, "j1", "d1") == 3, "img-01, img-02 and img-06"
+    assert AutoLabelShardOperations.requeue_unfinished_shards(db, "j1") == 1
+    db.refresh(first)
+    assert (first.status, first.worker_id, first.checkpoint_image_id) == ("pending", None, "img-00")
+    db.close()
+
+
+def test_run_job_retries_unfinished_shards():
+    """A worker crashing mid-job only costs a retry; every image is processed once"""
+    db = session_with_images()
+    pool = FakeWorkerPool(crashes=[1, None])
+    summary = run_job(db, pool, retries=2)
+    assert pool.attempts == 2, pool.attempts
+    assert summary["processed_images"] == 7 and summary["failed_images"] == 0, summary
+    assert {shard.status for shard in AutoLabelShardOperations.get_shards(db, "j1")} == {"completed"}
+    db.close()
+
+
+def test_run_job_fails_when_retries_run_out():
+    """Shards still unfinished after the last retry fail the job instead of being skipped"""
+    db = session_with_images()
+    pool = FakeWorkerPool(crashes=[1, 0])
+    try:
+        run_job(db, pool, retries=1)
+        assert False, "run_job should have raised"
+    except RuntimeError as e:
+        assert str(e).startswith("4 images in 2 shard(s) were not processed after 1 retries"), str(e)
+    assert pool.attempts == 2, pool.attempts
+    statuses = [shard.status for shard in AutoLabelShardOperations.get_shards(db, "j1")]
+    assert statuses == ["completed", "failed", "failed"], statuses
+    db.close()
+
+
+if __name__ == "__main__":
+    print("🧩 AUTO-LABEL SHARD TEST")
+    tests = [
+        test_shards_cover_id_ranges,
+        test_each_shard_is_claimed_once,
+        test_requeue_keeps_checkpoints,
+        test_run_job_retries_unfinished_shards,
+        test_run_job_fails_when_retries_run_out,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All auto-label shard tests passed")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Dataset counter test
+Checks that image and annotation writes move the dataset counters by the
+right deltas, and that reconcile_dataset_stats repairs counters that drifted.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset
+from database.operations import DatasetOperations, ImageOperations, AnnotationOperations
+import models.training  # noqa: F401
+
+
+def session_with_dataset(*dataset_ids):
+    """Session on an in-memory database holding empty datasets"""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="stats"))
+    for dataset_id in dataset_ids or ("d1",):
+        db.add(Dataset(id=dataset_id, name=dataset_id, project_id=1))
+    db.commit()
+    return db
+
+
+def add_image(db, dataset_id="d1", name="img.jpg"):
+    return ImageOperations.create_image(db, name, name, f"/tmp/{name}", dataset_id)
+
+
+def counters(db, dataset_id="d1"):
+    dataset = DatasetOperations.get_dataset(db, dataset_id)
+    db.refresh(dataset)
+    return dataset.total_images, dataset.labeled_images, dataset.unlabeled_images
+
+
+def box(class_name="car"):
+    return {"class_name": class_name, "class_id": 0, "x_min": 1, "y_min": 1, "x_max": 5, "y_max": 5}
+
+
+def test_image_and_annotation_deltas():
+    """Creating images and (un)labeling them moves the counters one step at a time"""
+    db = session_with_dataset()
+    first = add_image(db, name="a.jpg")
+    add_image(db, name="b.jpg")
+    assert counters(db) == (2, 0, 2), counters(db)
+
+    AnnotationOperations.create_annotation(db, first.id, "car", 0, 1, 1, 5, 5)
+    AnnotationOperations.create_annotation(db, first.id, "car", 0, 2, 2, 6, 6)
+    assert counters(db) == (2, 1, 1), "a second annotation must not count the image twice"
+
+    AnnotationOperations.delete_annotations_by_image(db, first.id)
+    assert counters(db) == (2, 0, 2), counters(db)
+
+    ImageOperations.update_image_status(db, first.id, is_labeled=False)
+    assert counters(db) == (2, 0, 2), "an unchanged flag must not move the counters"
+    db.close()
+
+
+def test_bulk_insert_deltas():
+    """Bulk writes adjust each dataset by the images whose labeled flag flipped"""
+    db = session_with_dataset("d1", "d2")
+    a, b = add_image(db, "d1", "a.jpg"), add_image(db, "d1", "b.jpg")
+    c = add_image(db, "d2", "c.jpg")
+
+    AnnotationOperations.bulk_create_annotations(db, {a.id: [box(), box()], b.id: [], c.id: [box()]})
+    assert counters(db, "d1") == (2, 1, 1), counters(db, "d1")
+    assert counters(db, "d2") == (1, 1, 0), counters(db, "d2")
+
+    # Appending to an already labeled image changes nothing
+    AnnotationOperations.bulk_create_annotations(db, {a.id: [box()]})
+    assert counters(db, "d1") == (2, 1, 1), counters(db, "d1")
+
+    # Replacing with no annotations unlabels the image
+    AnnotationOperations.bulk_create_annotations(db, {a.id: [], b.id: [box()]}, replace_existing=True)
+    assert counters(db, "d1") == (2, 1, 1), counters(db, "d1")
+    assert len(AnnotationOperations.get_annotations_by_image(db, a.id)) == 0
+    assert ImageOperations.get_image(db, b.id).is_labeled
+    db.close()
+
+
+def test_reconcile_fixes_drift():
+    """Reconciling rewrites only the datasets whose counters drifted"""
+    db = session_with_dataset("d1", "d2", "empty")
+    image = add_image(db, "d1", "a.jpg")
+    add_image(db, "d1", "b.jpg")
+    add_image(db, "d2", "c.jpg")
+    AnnotationOperations.create_annotation(db, image.id, "car", 0, 1, 1, 5, 5)
+
+    DatasetOperations.update_dataset(db, "d1", total_images=7, labeled_images=0, unlabeled_images=7)
+    DatasetOperations.update_dataset(db, "empty", total_images=3, unlabeled_images=3)
+
+    assert DatasetOperations.reconcile_dataset_stats(db) == 2
+    assert counters(db, "d1") == (2, 1, 1), counters(db, "d1")
+    assert counters(db, "d2") == (1, 0, 1), counters(db, "d2")
+    assert counters(db, "empty") == (0, 0, 0), counters(db, "empty")
+    assert DatasetOperations.reconcile_dataset_stats(db) == 0, "nothing left to correct"
+    db.close()
+
+
+if __name__ == "__main__":
+    print("🔢 DATASET COUNTER TEST")
+    tests = [
+        test_image_and_annotation_deltas,
+        test_bulk_insert_deltas,
+        test_reconcile_fixes_drift,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All dataset counter tests passed")
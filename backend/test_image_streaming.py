@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Image streaming test
+Checks that iter_images_by_dataset visits every image exactly once in id
+order, honours the labeled filter and the after_id/until_id range used to
+resume jobs and split datasets into shards.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset, Image
+from database.operations import ImageOperations
+import models.training  # noqa: F401
+
+
+def session_with_images(count=7):
+    """Session on an in-memory database with images img-00.. (odd ones labeled) and one in another dataset"""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="streaming"))
+    db.add(Dataset(id="d1", name="streaming", project_id=1))
+    db.add(Dataset(id="d2", name="other", project_id=1))
+    for i in reversed(range(count)):
+        name = f"img-{i:02d}"
+        db.add(Image(id=name, filename=name, original_filename=name, file_path=f"/tmp/{name}",
+                     dataset_id="d1", is_labeled=i % 2 == 1))
+    db.add(Image(id="img-03b", filename="x", original_filename="x", file_path="/tmp/x", dataset_id="d2"))
+    db.commit()
+    return db
+
+
+def streamed(db, **kwargs):
+    chunks = list(ImageOperations.iter_images_by_dataset(db, "d1", **kwargs))
+    return [[image.id for image in chunk] for chunk in chunks]
+
+
+def test_visits_every_image_once_in_order():
+    """Chunks follow the primary key, with a short last chunk"""
+    db = session_with_images()
+    chunks = streamed(db, chunk_size=3)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1], chunks
+    assert sum(chunks, []) == [f"img-{i:02d}" for i in range(7)], chunks
+
+    # An exact multiple of the chunk size ends without an empty chunk
+    assert [len(chunk) for chunk in streamed(db, chunk_size=7)] == [7]
+    db.close()
+
+
+def test_labeled_filter():
+    db = session_with_images()
+    assert sum(streamed(db, chunk_size=2, labeled_only=False), []) == ["img-00", "img-02", "img-04", "img-06"]
+    assert sum(streamed(db, chunk_size=2, labeled_only=True), []) == ["img-01", "img-03", "img-05"]
+    db.close()
+
+
+def test_after_and_until_bound_the_range():
+    """after_id is exclusive, until_id inclusive; the counts match the stream"""
+    db = session_with_images()
+    assert sum(streamed(db, chunk_size=2, after_id="img-02"), []) == ["img-03", "img-04", "img-05", "img-06"]
+    assert sum(streamed(db, chunk_size=2, until_id="img-02"), []) == ["img-00", "img-01", "img-02"]
+    assert sum(streamed(db, chunk_size=2, after_id="img-01", until_id="img-04"), []) == \
+        ["img-02", "img-03", "img-04"]
+    assert streamed(db, after_id="img-06") == []
+
+    assert ImageOperations.count_images_by_dataset(db, "d1", after_id="img-02") == 4
+    assert ImageOperations.count_images_by_dataset(db, "d1", labeled_only=False, after_id="img-02") == 2
+    db.close()
+
+
+if __name__ == "__main__":
+    print("🖼️ IMAGE STREAMING TEST")
+    tests = [
+        test_visits_every_image_once_in_order,
+        test_labeled_filter,
+        test_after_and_until_bound_the_range,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All image streaming tests passed")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Inference micro-batching test
+Checks that concurrent predictions with the same options share batches of at
+most max_batch_size, that different options never share a batch, and that a
+cancelled or failing request does not break the callers batched with it.
+ModelManager.predict_batch is replaced by a recording stand-in.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import models.inference_scheduler as scheduler_module
+from models.inference_scheduler import InferenceScheduler
+
+
+class RecordingManager:
+    """predict_batch stand-in: returns "<model>:<image>" per image and records every batch"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def predict_batch(self, model_id, images, confidence, iou_threshold, tile_size, tile_overlap, mask_format):
+        self.batches.append((model_id, confidence, list(images)))
+        time.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return [f"{model_id}:{image}" for image in images]
+
+
+def run_with(manager, coroutine):
+    original = scheduler_module.model_manager
+    scheduler_module.model_manager = manager
+    try:
+        return asyncio.run(coroutine)
+    finally:
+        scheduler_module.model_manager = original
+
+
+def test_concurrent_requests_share_batches():
+    manager = RecordingManager()
+    scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=50, num_threads=1)
+
+    async def scenario():
+        return await asyncio.gather(*(scheduler.predict("m1", i, confidence=0.5) for i in range(6)))
+
+    results = run_with(manager, scenario())
+    assert results == [f"m1:{i}" for i in range(6)], results
+    assert [len(images) for _, _, images in manager.batches] == [4, 2], manager.batches
+    assert scheduler.stats()["active_queues"] == 0, "drained queues are dropped"
+
+
+def test_different_options_never_share_a_batch():
+    manager = RecordingManager()
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=50, num_threads=1)
+
+    async def scenario():
+        return await asyncio.gather(
+            scheduler.predict("m1", "a", confidence=0.5),
+            scheduler.predict("m1", "b", confidence=0.6),
+            scheduler.predict("m2", "c", confidence=0.5),
+            scheduler.predict("m1", "d", confidence=0.5),
+        )
+
+    results = run_with(manager, scenario())
+    assert results == ["m1:a", "m1:b", "m2:c", "m1:d"], results
+    assert sorted((model, conf, images) for model, conf, images in manager.batches) == [
+        ("m1", 0.5, ["a", "d"]), ("m1", 0.6, ["b"]), ("m2", 0.5, ["c"])
+    ], manager.batches
+
+
+def test_cancelled_request_leaves_the_batch_intact():
+    """A caller that disconnects while queued does not fail the others"""
+    manager = RecordingManager()
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=50, num_threads=1)
+
+    async def scenario():
+        tasks = [asyncio.create_task(scheduler.predict("m1", i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[1].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # The scheduler keeps serving after the cancellation
+        results.append(await scheduler.predict("m1", 3))
+        return results
+
+    results = run_with(manager, scenario())
+    assert results[0] == "m1:0" and results[2] == "m1:2" and results[3] == "m1:3", results
+    assert isinstance(results[1], asyncio.CancelledError), results[1]
+
+
+def test_failure_reaches_every_caller():
+    manager = RecordingManager(fail=True)
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=20, num_threads=1)
+
+    async def scenario():
+        return await asyncio.gather(*(scheduler.predict("m1", i) for i in range(3)), return_exceptions=True)
+
+    results = run_with(manager, scenario())
+    assert len(manager.batches) == 1, manager.batches
+    assert all(isinstance(result, RuntimeError) for result in results), results
+
+
+if __name__ == "__main__":
+    print("📦 INFERENCE SCHEDULER TEST")
+    tests = [
+        test_concurrent_requests_share_batches,
+        test_different_options_never_share_a_batch,
+        test_cancelled_request_leaves_the_batch_intact,
+        test_failure_reaches_every_caller,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All inference scheduler tests passed")
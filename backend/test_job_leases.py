@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Auto-label job lease test
+Checks which interrupted jobs the orphan sweep and the resume endpoint may
+take over: stale leases and exited processes of this host, but never a job
+that another live process is still running.
+"""
+
+import os
+import socket
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset, AutoLabelJob
+from database.operations import AutoLabelJobOperations
+from core.job_progress import is_dead_local_owner, PROCESS_ID
+import models.training  # noqa: F401
+
+HOST = socket.gethostname()
+# An earlier server process of this host: same pid, other token (as after a container restart)
+PREVIOUS_PROCESS = f"{HOST}-{os.getpid()}-00000000"
+
+
+def session_with_jobs(*jobs):
+    """Session on an in-memory database holding the given (id, status, owner, seconds since progress) jobs"""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="leases"))
+    db.add(Dataset(id="d1", name="leases", project_id=1))
+    for job_id, status, owner_id, age in jobs:
+        db.add(AutoLabelJob(
+            id=job_id, dataset_id="d1", model_id="yolov8n", status=status, owner_id=owner_id,
+            last_progress_at=datetime.utcnow() - timedelta(seconds=age)
+        ))
+    db.commit()
+    return db
+
+
+def dead_owners(db):
+    return [owner for owner in AutoLabelJobOperations.get_unfinished_job_owners(db) if is_dead_local_owner(owner)]
+
+
+def test_dead_local_owner():
+    """Only exited processes of this host are judged dead"""
+    assert is_dead_local_owner(PREVIOUS_PROCESS)
+    assert not is_dead_local_owner(PROCESS_ID)
+    assert not is_dead_local_owner(f"{HOST}-{os.getppid()}-00000000"), "a running process is not dead"
+    assert not is_dead_local_owner("other-host-1-00000000")
+    assert not is_dead_local_owner("old-proc")
+
+
+def test_sweep_claims_stale_and_dead_owner_jobs():
+    """A restart takes over the previous process's jobs at once and stale jobs of any host"""
+    db = session_with_jobs(
+        ("restarted", "processing", PREVIOUS_PROCESS, 30),
+        ("stale", "processing", "other-host-1-00000000", 3600),
+        ("live", "processing", "other-host-1-00000000", 30),
+        ("mine", "processing", PROCESS_ID, 3600),
+        ("done", "completed", PREVIOUS_PROCESS, 30),
+    )
+    claimed = AutoLabelJobOperations.claim_orphaned_jobs(
+        db, owner_id=PROCESS_ID, lease_seconds=600, dead_owner_ids=dead_owners(db)
+    )
+    assert sorted(claimed) == ["restarted", "stale"], f"claimed {claimed}"
+    job = AutoLabelJobOperations.get_job(db, "restarted")
+    assert job.status == "queued" and job.owner_id == PROCESS_ID
+
+    # The next sweep finds nothing left to claim
+    assert AutoLabelJobOperations.claim_orphaned_jobs(db, owner_id=PROCESS_ID, lease_seconds=600) == []
+    db.close()
+
+
+def test_resume_claims_only_unowned_jobs():
+    """The resume endpoint takes over failed and orphaned jobs, never live or completed ones"""
+    db = session_with_jobs(
+        ("failed", "failed", "other-host-1-00000000", 30),
+        ("restarted", "processing", PREVIOUS_PROCESS, 30),
+        ("live", "processing", "other-host-1-00000000", 30),
+        ("done", "completed", None, 3600),
+    )
+    dead = dead_owners(db)
+    results = {
+        job_id: AutoLabelJobOperations.claim_job_for_resume(db, job_id, PROCESS_ID, 600, dead)
+        for job_id in ("failed", "restarted", "live", "done")
+    }
+    assert results == {"failed": True, "restarted": True, "live": False, "done": False}, results
+    db.close()
+
+
+if __name__ == "__main__":
+    print("🔒 JOB LEASE TEST")
+    tests = [
+        test_dead_local_owner,
+        test_sweep_claims_stale_and_dead_owner_jobs,
+        test_resume_claims_only_unowned_jobs,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All job lease tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Job progress throttling test
+Checks that JobProgressTracker publishes every update but writes the job
+row only on the time/image interval, a status change or an explicit flush.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset, AutoLabelJob
+from database.operations import AutoLabelJobOperations
+from core.job_progress import JobProgressTracker
+import models.training  # noqa: F401
+
+
+def session_with_job():
+    """Session on an in-memory database holding one queued job "j1" """
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Project(id=1, name="progress"))
+    db.add(Dataset(id="d1", name="progress", project_id=1))
+    db.add(AutoLabelJob(id="j1", dataset_id="d1", model_id="yolov8n", status="queued", total_images=100))
+    db.commit()
+    return db
+
+
+def stored(db):
+    job = AutoLabelJobOperations.get_job(db, "j1")
+    db.refresh(job)
+    return job.status, job.processed_images
+
+
+def test_writes_on_status_change_and_image_interval():
+    """Small steps stay in memory until flush_every images have passed"""
+    db = session_with_job()
+    tracker = JobProgressTracker(flush_interval=3600, flush_every=10)
+
+    tracker.update(db, "j1", status="processing", processed_images=0)
+    assert stored(db) == ("processing", 0), "a status change is written at once"
+
+    for processed in range(1, 10):
+        tracker.update(db, "j1", processed_images=processed)
+    assert stored(db) == ("processing", 0), "updates below the interval are coalesced"
+    assert tracker.get("j1")["processed_images"] == 9, "live counters are always current"
+
+    tracker.update(db, "j1", processed_images=10)
+    assert stored(db) == ("processing", 10)
+    db.close()
+
+
+def test_writes_on_time_interval():
+    db = session_with_job()
+    tracker = JobProgressTracker(flush_interval=0.05, flush_every=1000)
+    tracker.update(db, "j1", status="processing", processed_images=0)
+    tracker.update(db, "j1", processed_images=1)
+    assert stored(db) == ("processing", 0)
+
+    time.sleep(0.06)
+    tracker.update(db, "j1", processed_images=2)
+    assert stored(db) == ("processing", 2)
+    db.close()
+
+
+def test_flush_and_final_status():
+    """flush() forces a write; a final status is written and the job is forgotten"""
+    db = session_with_job()
+    tracker = JobProgressTracker(flush_interval=3600, flush_every=1000)
+    tracker.update(db, "j1", status="processing", processed_images=0)
+    tracker.update(db, "j1", processed_images=5)
+    tracker.flush(db, "j1")
+    assert stored(db) == ("processing", 5)
+
+    tracker.update(db, "j1", status="completed", processed_images=6, progress=100.0)
+    assert stored(db) == ("completed", 6)
+    assert tracker.get("j1") is None
+    db.close()
+
+
+def test_subscribers_see_every_update():
+    db = session_with_job()
+    tracker = JobProgressTracker(flush_interval=3600, flush_every=1000)
+    seen = []
+    unsubscribe = tracker.subscribe("j1", lambda job_id, snapshot: seen.append(snapshot["processed_images"]))
+    for processed in range(3):
+        tracker.update(db, "j1", processed_images=processed)
+    unsubscribe()
+    tracker.update(db, "j1", processed_images=3)
+    assert seen == [0, 1, 2], seen
+    db.close()
+
+
+if __name__ == "__main__":
+    print("📈 JOB PROGRESS TEST")
+    tests = [
+        test_writes_on_status_change_and_image_interval,
+        test_writes_on_time_interval,
+        test_flush_and_final_status,
+        test_subscribers_see_every_update,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All job progress tests passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Model pool test
+Checks that pooled models are only handed out pinned, that the LRU budget
+never evicts a model in use, and that inference on one instance stays
+serialized, also after it has been evicted.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from models.model_pool import ModelPool
+
+
+class FakeModel:
+    """Stand-in model that records how many predict calls overlap"""
+
+    def __init__(self, name):
+        self.name = name
+        self.active = 0
+        self.max_active = 0
+
+    def predict(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        self.active -= 1
+
+
+def test_pinned_models_are_not_evicted():
+    """A one-model budget keeps the model in use and loads the next one beside it"""
+    pool = ModelPool(max_bytes=0, max_models=1)
+    pool.acquire("a", lambda: FakeModel("a"))
+    pool.acquire("b", lambda: FakeModel("b"))
+    assert "a" in pool, "pinned model was evicted"
+
+    pool.release("b")
+    pool.release("a")
+    pool.acquire("c", lambda: FakeModel("c"))
+    assert "a" not in pool and "b" not in pool, "unpinned models over budget stayed resident"
+    assert pool.acquire("c", lambda: FakeModel("c2")).name == "c", "pooled model loaded twice"
+    assert not hasattr(pool, "get"), "unpinned access is available"
+
+
+def test_inference_lock_outlives_eviction():
+    """A caller still holding an evicted model keeps using the same lock"""
+    pool = ModelPool(max_bytes=0, max_models=1)
+    model = pool.acquire("a", lambda: FakeModel("a"))
+    lock = pool.inference_lock(model)
+    pool.release("a")
+    assert pool.evict("a"), "unpinned model could not be evicted"
+    assert pool.inference_lock(model) is lock, "evicted instance lost its lock"
+    assert pool.inference_lock(FakeModel("private")).__class__.__name__ == "nullcontext"
+
+
+def test_inference_is_serialized():
+    """Threads sharing one pooled model never run it concurrently"""
+    pool = ModelPool(max_bytes=0, max_models=2)
+
+    def run():
+        for _ in range(5):
+            with pool.lease("a", lambda: FakeModel("a")) as model:
+                model.predict()
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    model = pool.acquire("a", lambda: FakeModel("unused"))
+    assert model.max_active == 1, f"{model.max_active} concurrent predict calls"
+    assert pool.stats()["misses"] == 1, "model loaded more than once"
+
+
+if __name__ == "__main__":
+    print("🧠 MODEL POOL TEST")
+    tests = [
+        test_pinned_models_are_not_evicted,
+        test_inference_lock_outlives_eviction,
+        test_inference_is_serialized,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All model pool tests passed")
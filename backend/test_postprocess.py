@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Mask encoding test
+Checks that rle and bitmask masks are mapped from the letterboxed model input
+grid back to original image coordinates.
+"""
+
+import base64
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from models.postprocess import encode_masks, DetectionResult, MASK_ENCODE_CHUNK
+
+# 400x200 image letterboxed onto a 320x320 grid: gain 0.8, 80 rows of padding top and bottom
+ORIG_SHAPE = (200, 400)
+
+
+def letterboxed_result():
+    """Result with one mask covering image rows 50-100 and columns 100-200"""
+    grid = np.zeros((1, 320, 320), dtype=np.float32)
+    grid[0, 80 + 40:80 + 80, 80:160] = 1.0
+    expected = np.zeros(ORIG_SHAPE, dtype=bool)
+    expected[50:100, 100:200] = True
+    return SimpleNamespace(masks=SimpleNamespace(data=grid), orig_shape=ORIG_SHAPE), expected
+
+
+def iou(a, b):
+    return np.logical_and(a, b).sum() / np.logical_or(a, b).sum()
+
+
+def decode_bitmask(entry):
+    height, width = entry["size"]
+    bits = np.unpackbits(np.frombuffer(base64.b64decode(entry["bits"]), dtype=np.uint8))
+    return bits[:height * width].reshape(height, width).astype(bool)
+
+
+def decode_rle(entry):
+    height, width = entry["size"]
+    flat = np.zeros(height * width, dtype=bool)
+    position, value = 0, False
+    for count in entry["counts"]:
+        flat[position:position + count] = value
+        position += count
+        value = not value
+    return flat.reshape(width, height).T
+
+
+def test_bitmask_in_image_coordinates():
+    result, expected = letterboxed_result()
+    entry = encode_masks(result, "bitmask")[0]
+    assert entry["size"] == list(ORIG_SHAPE), f"size {entry['size']}"
+    overlap = iou(decode_bitmask(entry), expected)
+    assert overlap > 0.95, f"IoU with the expected region is {overlap:.3f}"
+
+
+def test_rle_in_image_coordinates():
+    result, expected = letterboxed_result()
+    entry = encode_masks(result, "rle")[0]
+    assert entry["size"] == list(ORIG_SHAPE), f"size {entry['size']}"
+    overlap = iou(decode_rle(entry), expected)
+    assert overlap > 0.95, f"IoU with the expected region is {overlap:.3f}"
+
+
+def test_mask_stack_in_chunks():
+    """A stack larger than one chunk encodes every mask at its own coordinates"""
+    count = MASK_ENCODE_CHUNK + 3
+    grid = np.zeros((count, 320, 320), dtype=np.float32)
+    expected = np.zeros((count,) + ORIG_SHAPE, dtype=bool)
+    for i in range(1, count):
+        grid[i, 120:160, 80 + i:160 + i] = 1.0
+        expected[i] = decode_bitmask(encode_masks(SimpleNamespace(
+            masks=SimpleNamespace(data=grid[i:i + 1]), orig_shape=ORIG_SHAPE
+        ), "bitmask")[0])
+
+    result = SimpleNamespace(masks=SimpleNamespace(data=grid), orig_shape=ORIG_SHAPE)
+    rle = encode_masks(result, "rle")
+    assert len(rle) == count, f"{len(rle)} masks encoded"
+    assert not decode_rle(rle[0]).any(), "empty mask is not empty"
+    for i in range(1, count):
+        assert np.array_equal(decode_rle(rle[i]), expected[i]), f"mask {i} differs from its single-mask encoding"
+
+
+def test_polygon_only_results_are_rasterized():
+    """Tiled and cached results carry polygons only; rle/bitmask still encode them"""
+    square = np.array([[100, 50], [199, 50], [199, 99], [100, 99]], dtype=np.float32)
+    result = DetectionResult(
+        np.array([[100, 50, 200, 100, 0.9, 0]], dtype=np.float32), ORIG_SHAPE, polygons=[square]
+    )
+    _, expected = letterboxed_result()
+    for mask_format, decode in (("rle", decode_rle), ("bitmask", decode_bitmask)):
+        masks = encode_masks(result, mask_format)
+        assert masks is not None and len(masks) == 1, f"{mask_format}: no mask encoded"
+        overlap = iou(decode(masks[0]), expected)
+        assert overlap > 0.95, f"{mask_format}: IoU with the polygon region is {overlap:.3f}"
+
+
+if __name__ == "__main__":
+    print("🎭 MASK ENCODING TEST")
+    tests = [
+        test_bitmask_in_image_coordinates,
+        test_rle_in_image_coordinates,
+        test_mask_stack_in_chunks,
+        test_polygon_only_results_are_rasterized,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All mask encoding tests passed")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Prediction cache test
+Checks that cache hits re-threshold the stored raw detections exactly like
+misses, that the model only runs on misses, and that thresholds looser than
+the cached raw ones are rejected.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cv2
+import numpy as np
+
+from core.config import settings
+from models.postprocess import DetectionResult
+from models.prediction_cache import PredictionCache, apply_thresholds, check_thresholds, predict_cached
+
+# x1, y1, x2, y2, conf, cls: two near-duplicate class-0 boxes, one class-1 box on top, one weak box
+RAW = np.array([
+    [10, 10, 50, 50, 0.9, 0],
+    [12, 12, 50, 50, 0.8, 0],
+    [10, 10, 50, 50, 0.7, 1],
+    [60, 60, 90, 90, 0.05, 0],
+], dtype=np.float32)
+
+
+def raw_result():
+    polygons = [np.array([[x1, y1], [x2, y1], [x2, y2]], dtype=np.float32) for x1, y1, x2, y2, _, _ in RAW]
+    return DetectionResult(RAW.copy(), (100, 100), polygons=polygons)
+
+
+class CountingModel:
+    """predict_fn stand-in returning RAW for every image and recording its calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, images, conf, iou, max_det=None):
+        self.calls.append((len(images), conf, iou, max_det))
+        return [raw_result() for _ in images]
+
+
+def test_check_thresholds_rejects_looser_values():
+    check_thresholds(settings.PREDICTION_CACHE_MIN_CONFIDENCE, settings.PREDICTION_CACHE_RAW_IOU)
+    for conf, iou in ((settings.PREDICTION_CACHE_MIN_CONFIDENCE / 2, 0.45), (0.5, 0.99)):
+        try:
+            check_thresholds(conf, iou)
+            assert False, f"conf={conf} iou={iou} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_apply_thresholds():
+    """Confidence filter, class-aware NMS and max_det, with polygons kept aligned"""
+    result = apply_thresholds(raw_result(), 0.5, 0.45)
+    assert np.allclose(result.boxes.data[:, 4], [0.9, 0.7]), result.boxes.data
+    assert [polygon[0].tolist() for polygon in result.masks.xy] == [[10, 10], [10, 10]]
+
+    assert len(apply_thresholds(raw_result(), 0.01, 0.95)) == 4, "raw thresholds keep everything"
+    assert len(apply_thresholds(raw_result(), 0.01, 0.95, max_det=1)) == 1
+
+
+def test_hits_match_misses_and_skip_the_model():
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = Path(tmp) / "image.png"
+        cv2.imwrite(str(image_path), np.full((100, 100, 3), 127, dtype=np.uint8))
+        cache = PredictionCache(cache_dir=Path(tmp) / "cache", max_bytes=10 * 1024 * 1024)
+        load = cache.loader("m1/abc")
+        model = CountingModel()
+
+        first = predict_cached(cache, "m1/abc", [load(str(image_path))], model, 0.5, 0.45)
+        assert model.calls == [(1, settings.PREDICTION_CACHE_MIN_CONFIDENCE, settings.PREDICTION_CACHE_RAW_IOU,
+                                settings.PREDICTION_CACHE_RAW_MAX_DET)], model.calls
+
+        item = load(str(image_path))
+        assert item.image is None and item.result is not None, "a cached image is not decoded"
+        second = predict_cached(cache, "m1/abc", [item], model, 0.5, 0.45)
+        assert len(model.calls) == 1, "a hit must not run the model"
+        assert np.array_equal(first[0].boxes.data, second[0].boxes.data)
+        assert all(np.array_equal(a, b) for a, b in zip(first[0].masks.xy, second[0].masks.xy))
+
+        # Stricter thresholds come from the same entry
+        strict = predict_cached(cache, "m1/abc", [load(str(image_path))], model, 0.85, 0.45)
+        assert len(model.calls) == 1 and len(strict[0]) == 1
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1), stats
+
+
+def test_loose_thresholds_raise_before_predicting():
+    model = CountingModel()
+    try:
+        predict_cached(PredictionCache(cache_dir=tempfile.gettempdir()), "m1/abc", [], model, 0.001, 0.45)
+        assert False, "should have raised"
+    except ValueError:
+        pass
+    assert model.calls == []
+
+
+if __name__ == "__main__":
+    print("🗄️ PREDICTION CACHE TEST")
+    tests = [
+        test_check_thresholds_rejects_looser_values,
+        test_apply_thresholds,
+        test_hits_match_misses_and_skip_the_model,
+        test_loose_thresholds_raise_before_predicting,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All prediction cache tests passed")
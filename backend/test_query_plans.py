@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Query plan test for hot database queries
+Runs the real operations against an in-memory SQLite database, captures the
+SQL they issue and fails if EXPLAIN QUERY PLAN shows a full table scan of a
+large table (images, annotations, auto_label_jobs, uncertain_samples).
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.engine import create_database_engine
+from database.models import Project, Dataset, Image, Annotation, AutoLabelJob
+from database.operations import (
+    DatasetOperations, ImageOperations, AnnotationOperations,
+    AutoLabelJobOperations, AutoLabelShardOperations
+)
+from models.training import TrainingSession, TrainingIteration, UncertainSample
+
+HOT_TABLES = ("images", "annotations", "auto_label_jobs", "uncertain_samples")
+
+
+def hot_queries(db):
+    """(name, callable) pairs exercising the query shapes that must use an index"""
+    return [
+        ("update_dataset_stats", lambda: DatasetOperations.update_dataset_stats(db, "d1")),
+        ("iter_images_by_dataset", lambda: list(ImageOperations.iter_images_by_dataset(db, "d1", chunk_size=2))),
+        ("iter_images_by_dataset(labeled_only)", lambda: list(
+            ImageOperations.iter_images_by_dataset(db, "d1", chunk_size=2, labeled_only=False)
+        )),
+        ("count_images_by_dataset", lambda: ImageOperations.count_images_by_dataset(db, "d1", labeled_only=True)),
+        ("count_images_by_split", lambda: ImageOperations.count_images_by_split(db, "d1")),
+        ("sample_image_paths", lambda: ImageOperations.sample_image_paths(db, dataset_id="d1")),
+        ("get_annotations_by_dataset", lambda: ImageOperations.get_annotations_by_dataset(db, "d1")),
+        ("get_annotations_by_image", lambda: AnnotationOperations.get_annotations_by_image(db, "i1")),
+        ("delete_annotations_by_image", lambda: AnnotationOperations.delete_annotations_by_image(db, "i2")),
+        ("claim_orphaned_jobs", lambda: AutoLabelJobOperations.claim_orphaned_jobs(db)),
+        ("create_shards", lambda: AutoLabelShardOperations.create_shards(db, "j1", "d1", shard_size=2)),
+        ("uncertain_samples_by_session", lambda: db.query(UncertainSample).join(TrainingIteration).filter(
+            TrainingIteration.session_id == 1
+        ).all()),
+    ]
+
+
+def seed(db):
+    """A few rows per table, enough for every query to return something"""
+    db.add(Project(id=1, name="plans"))
+    db.add(Dataset(id="d1", name="plans", project_id=1))
+    for i in range(1, 5):
+        db.add(Image(
+            id=f"i{i}", filename=f"{i}.jpg", original_filename=f"{i}.jpg", file_path=f"/tmp/{i}.jpg",
+            dataset_id="d1", is_labeled=i % 2 == 0, split_type="train"
+        ))
+        db.add(Annotation(
+            image_id=f"i{i}", class_name="object", class_id=0,
+            x_min=0.1, y_min=0.1, x_max=0.5, y_max=0.5
+        ))
+    db.add(AutoLabelJob(id="j1", dataset_id="d1", model_id="yolov8n", status="pending"))
+    db.add(TrainingSession(id=1, name="plans", dataset_id="d1"))
+    db.add(TrainingIteration(id=1, session_id=1, iteration_number=1))
+    db.add(UncertainSample(iteration_id=1, image_id="i1", uncertainty_score=0.5))
+    db.commit()
+
+
+def full_scans(connection, statement, parameters):
+    """Plan lines of a statement that scan a hot table instead of searching an index"""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = [row[-1] for row in rows]
+    return [
+        detail for detail in details
+        if any(detail.startswith(f"SCAN {table}") for table in HOT_TABLES)
+    ]
+
+
+def test_hot_queries_use_indexes():
+    """Every hot query searches an index on the large tables"""
+    engine = create_database_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+
+    failures = []
+    for name, run in hot_queries(db):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")) and not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            run()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                scans = full_scans(connection, statement, parameters)
+                if scans:
+                    failures.append((name, statement, scans))
+        print(f"   {'❌' if any(f[0] == name for f in failures) else '✅'} {name}")
+
+    db.close()
+    for name, statement, scans in failures:
+        print(f"\n{name}: {', '.join(scans)}\n{statement}")
+    assert not failures, f"{len(failures)} hot queries fall back to a table scan"
+
+
+if __name__ == "__main__":
+    print("🔍 QUERY PLAN TEST")
+    try:
+        test_hot_queries_use_indexes()
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    print("\n🎉 All hot queries use indexes")
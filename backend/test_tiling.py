@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tiled inference test
+Checks the tile grid, that tiles reach the model in batches of batch_size,
+and that detections seen by several overlapping tiles merge back into one
+box (and polygon) in image coordinates.
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cv2
+import numpy as np
+
+from models.postprocess import DetectionResult, nms
+from models.tiling import make_tiles, predict_tiled
+
+
+class BlobModel:
+    """Stand-in model: detects every white blob of a crop as class 0 with its box as polygon"""
+
+    names = {0: "blob", 1: "other"}
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, crops, conf=0.5, iou=0.45, batch=1, verbose=False, **kwargs):
+        self.batches.append(len(crops))
+        results = []
+        for crop in crops:
+            count, _, stats, _ = cv2.connectedComponentsWithStats((crop > 0).astype(np.uint8))
+            rows, polygons = [], []
+            for x, y, w, h, _ in stats[1:count]:
+                rows.append([x, y, x + w, y + h, 0.9, 0])
+                polygons.append(np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32))
+            results.append(DetectionResult(np.array(rows, dtype=np.float32), crop.shape[:2], polygons=polygons))
+        return results
+
+
+def blob_image():
+    """1000x600 image: blob A inside the overlap of four tiles, blob B inside a single tile"""
+    image = np.zeros((600, 1000), dtype=np.uint8)
+    image[220:280, 320:380] = 255
+    image[50:90, 900:950] = 255
+    return image
+
+
+def test_tile_grid_reaches_every_edge():
+    tiles = make_tiles(1000, 600, 400, overlap=0.25)
+    assert tiles.tolist() == [
+        [0, 0, 400, 400], [300, 0, 700, 400], [600, 0, 1000, 400],
+        [0, 200, 400, 600], [300, 200, 700, 600], [600, 200, 1000, 600],
+    ], tiles.tolist()
+    assert make_tiles(300, 200, 400).tolist() == [[0, 0, 300, 200]], "a small image is a single tile"
+
+
+def test_tiles_are_batched():
+    """Six tiles plus the full frame go through the model batch_size at a time"""
+    model = BlobModel()
+    predict_tiled(model, blob_image(), 400, 0.25, batch_size=4)
+    assert model.batches == [4, 3], model.batches
+
+    model = BlobModel()
+    predict_tiled(model, blob_image(), 400, 0.25, batch_size=8, include_full_image=False)
+    assert model.batches == [6], model.batches
+
+
+def test_overlapping_detections_merge():
+    """Duplicates from overlapping tiles collapse to one box per object, in image coordinates"""
+    result = predict_tiled(BlobModel(), blob_image(), 400, 0.25, batch_size=4)
+    boxes = sorted(result.boxes.data[:, :4].tolist())
+    assert boxes == [[320, 220, 380, 280], [900, 50, 950, 90]], boxes
+    assert result.orig_shape == (600, 1000)
+
+    polygons = sorted(polygon.min(axis=0).tolist() for polygon in result.masks.xy)
+    assert polygons == [[320, 220], [900, 50]], polygons
+
+
+def test_empty_image_has_no_detections():
+    result = predict_tiled(BlobModel(), np.zeros((600, 1000), dtype=np.uint8), 400)
+    assert len(result) == 0 and result.orig_shape == (600, 1000)
+
+
+def test_nms_is_class_aware():
+    """Overlapping boxes of different classes both survive the merge"""
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [0, 0, 10, 10]], dtype=np.float32)
+    scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+    keep = nms(boxes, scores, 0.5, class_ids=np.array([0, 0, 1]))
+    assert sorted(np.asarray(keep).tolist()) == [0, 2], keep
+
+
+if __name__ == "__main__":
+    print("🧱 TILED INFERENCE TEST")
+    tests = [
+        test_tile_grid_reaches_every_edge,
+        test_tiles_are_batched,
+        test_overlapping_detections_merge,
+        test_empty_image_has_no_detections,
+        test_nms_is_class_aware,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 All tiled inference tests passed")